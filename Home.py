@@ -4,6 +4,7 @@ import time
 
 from backend.stats_queries import get_summary_stats
 from backend.news_api import get_naver_news
+from backend.warmup import start_background_warmup
 
 # --- 페이지 기본 설정 ---
 st.set_page_config(
@@ -12,6 +13,15 @@ st.set_page_config(
     layout="wide"
 )
 
+# --- [신규] 캐시 워밍업 (프로세스당 한 번, 백그라운드) ---
+# .streamlit/secrets.toml 의 [app] warmup_on_start = false 로 끌 수 있습니다.
+try:
+    if st.secrets.get('app', {}).get('warmup_on_start', True):
+        start_background_warmup()
+except Exception as e:
+    # secrets.toml 이 없으면 DB 도 쓸 수 없으므로 워밍업 생략 (그 밖의 오류도 페이지는 계속 표시)
+    print(f"[워밍업] 시작하지 못했습니다: {type(e).__name__}: {e}")
+
 # --- [★ 1. 헤더 함수 정의] ---
 def display_custom_header():
     """
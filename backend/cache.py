@@ -0,0 +1,271 @@
+# 파일 이름: backend/cache.py
+# [신규] 프로세스 간 공유 가능한 조회 결과 캐시 (st.cache_data 대체)
+#
+# - 키 = (함수 이름, data_version, 인자) → 로더가 Recall_Summary.data_version 을 올리면
+#   TTL 을 기다리지 않고 이전 버전의 캐시가 한 번에 무효화됩니다.
+# - 저장소(backend)
+#     memory : 프로세스 내 LRU (기본값)
+#     disk   : 디렉터리에 pickle 파일로 저장 → 같은 디스크(볼륨)를 쓰는 여러 Streamlit 레플리카가 공유
+# - 값은 pickle 바이트로 저장하므로 호출부가 결과를 수정해도 캐시에 영향이 없습니다. (st.cache_data 와 동일)
+#
+# 설정: .streamlit/secrets.toml
+#   [cache]
+#   backend = "disk"            # "memory"(기본) 또는 "disk"
+#   max_entries = 512           # memory LRU 최대 항목 수
+#   disk_dir = ".cache/lemon"   # disk 저장 위치
+#
+#   from . import cache
+#   @cache.cached()
+#   def get_all_brands(): ...
+import functools
+import hashlib
+import os
+import pickle
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+from . import db_manager
+from . import materialized
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_DISK_DIR = os.path.join('.cache', 'lemon_scanner')
+VERSION_CHECK_INTERVAL = 30  # data_version 확인 주기 (초)
+UNVERSIONED_TTL = 600        # data_version 을 알 수 없을 때(요약 행 없음/DB 오류)의 만료 시간 (초)
+
+_version_lock = threading.Lock()
+_data_version = None
+_last_version_check = 0.0
+
+
+# --- data_version ---
+def _fetch_data_version():
+    """Recall_Summary.data_version 을 조회합니다. (요약 행이 없거나 DB 오류면 None)"""
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return None
+        cursor = conn.cursor()
+        try:
+            return materialized.fetch_data_version(cursor)
+        except Exception as e:
+            print(f"[캐시] data_version 조회 오류: {e}")
+            return None
+        finally:
+            cursor.close()
+
+
+def get_data_version(max_age=VERSION_CHECK_INTERVAL):
+    """
+    현재 data_version 을 반환합니다. DB 는 max_age 초에 한 번만 확인합니다. (모르면 None)
+    스냅샷/키워드 인덱스도 이 값으로 재로딩 여부를 판단합니다.
+    [수정] 조회에 실패하면(None) 마지막으로 알던 버전을 유지합니다. (일시적인 DB 오류로 캐시를 비우지 않음)
+    """
+    global _data_version, _last_version_check
+    if time.monotonic() - _last_version_check < max_age:
+        return _data_version
+    with _version_lock:
+        if time.monotonic() - _last_version_check < max_age:
+            return _data_version
+        version = _fetch_data_version()
+        if version is not None:
+            if version != _data_version and _data_version is not None:
+                print(f"[캐시] data_version 변경 감지: {_data_version} -> {version}")
+                get_backend().drop_versions_except(version)
+            _data_version = version
+        elif _data_version is not None:
+            print(f"[캐시] data_version 을 확인하지 못해 마지막 버전({_data_version})을 유지합니다.")
+        _last_version_check = time.monotonic()
+    return _data_version
+
+
+# --- 저장소 ---
+class MemoryBackend:
+    """프로세스 내 LRU. 항목: key -> (version, 만료 시각 또는 None, pickle 바이트)"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, version, payload, expires_at=None):
+        with self._lock:
+            self._entries[key] = (version, expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def drop_versions_except(self, version):
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[0] != version]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskBackend:
+    """
+    disk_dir/v{data_version}/{key}.pkl 에 저장. 여러 프로세스가 같은 디렉터리를 공유할 수 있도록
+    임시 파일에 쓴 뒤 os.replace 로 교체합니다. 파일 내용: pickle((만료 시각 또는 None, 값 바이트))
+    """
+
+    def __init__(self, directory=DEFAULT_DISK_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _version_dir(self, version):
+        return os.path.join(self.directory, f"v{version}")
+
+    def _path(self, key, version):
+        return os.path.join(self._version_dir(version), f"{key}.pkl")
+
+    def get(self, key, version=None):
+        try:
+            with open(self._path(key, version), 'rb') as f:
+                expires_at, payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        if expires_at is not None and expires_at < time.time():
+            return None
+        return payload
+
+    def set(self, key, version, payload, expires_at=None):
+        path = self._path(key, version)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump((expires_at, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"[캐시] 디스크 저장 오류: {e}")
+
+    def drop_versions_except(self, version):
+        keep = f"v{version}"
+        for name in os.listdir(self.directory):
+            if name != keep and name.startswith('v'):
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def _read_cache_settings():
+    try:
+        return dict(st.secrets.get('cache', {}))
+    except Exception:
+        return {}
+
+
+def get_backend():
+    """secrets.toml 의 [cache] 설정으로 저장소를 (최초 1회) 만들어 반환합니다."""
+    global _backend
+    if _backend is not None:
+        return _backend
+    with _backend_lock:
+        if _backend is None:
+            settings = _read_cache_settings()
+            if settings.get('backend', 'memory') == 'disk':
+                _backend = DiskBackend(settings.get('disk_dir', DEFAULT_DISK_DIR))
+            else:
+                _backend = MemoryBackend(int(settings.get('max_entries', DEFAULT_MAX_ENTRIES)))
+    return _backend
+
+
+def set_backend(backend):
+    """저장소를 직접 지정합니다. (예: 워밍업 스크립트에서 DiskBackend 사용)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def make_key(name, version, args, kwargs):
+    raw = pickle.dumps((name, version, args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _bump(counter):
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def cached(ttl=None):
+    """
+    조회 함수 결과를 data_version 단위로 캐시하는 데코레이터.
+    - ttl: (선택) 버전과 별개로 둘 만료 시간(초). data_version 을 모르면 UNVERSIONED_TTL 을 사용합니다.
+    - [수정] 호출 중에 조회 오류(db_manager.note_query_error)가 있었으면 결과(빈 값)를 캐시하지 않습니다.
+      (data_version 에는 TTL 이 없어, 캐시하면 다음 적재 때까지 빈 화면이 남음)
+    원본 함수는 __wrapped__ 로 접근할 수 있습니다. (sql/check_query_plans.py 등)
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            version = get_data_version()
+            backend = get_backend()
+            key = make_key(name, version, args, kwargs)
+            payload = backend.get(key, version)
+            if payload is not None:
+                _bump('hits')
+                return pickle.loads(payload)
+
+            _bump('misses')
+            errors_before = db_manager.get_query_error_count()
+            result = func(*args, **kwargs)
+            if db_manager.get_query_error_count() != errors_before:
+                print(f"[캐시] {name} 조회 중 오류가 있어 결과를 캐시하지 않습니다.")
+                return result
+            entry_ttl = ttl if version is not None else min(ttl or UNVERSIONED_TTL, UNVERSIONED_TTL)
+            expires_at = time.time() + entry_ttl if entry_ttl else None
+            try:
+                backend.set(key, version, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), expires_at)
+            except (pickle.PicklingError, TypeError) as e:
+                print(f"[캐시] {name} 결과를 저장할 수 없습니다: {e}")
+            return result
+
+        wrapper.cache_name = name
+        return wrapper
+    return decorator
+
+
+def invalidate():
+    """모든 캐시를 즉시 비웁니다. (data_version 도 다음 호출 때 다시 확인)"""
+    global _last_version_check
+    get_backend().clear()
+    _last_version_check = 0.0
+
+
+def get_cache_stats():
+    """캐시 적중/미스 카운터와 현재 data_version 을 dict 로 반환합니다."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['data_version'] = _data_version
+    stats['backend'] = type(get_backend()).__name__
+    return stats
@@ -1,30 +1,208 @@
 # 파일 이름: backend/db_manager.py
+import threading
+import time
+from contextlib import contextmanager
+
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
 import streamlit as st # [신규] st.secrets를 읽기 위해 임포트
 
 # [수정] 하드코딩된 DB_CONFIG 딕셔너리 삭제
 # DB_CONFIG = { ... } <-- 이 부분을 삭제합니다.
 
+# --- [신규] 커넥션 풀 설정 ---
+# secrets.toml 의 [db_credentials] 섹션에서 pool_size / pool_wait_timeout 으로 덮어쓸 수 있습니다.
+POOL_NAME = "lemon_scanner_pool"
+DEFAULT_POOL_SIZE = 5
+DEFAULT_POOL_WAIT_TIMEOUT = 5.0  # 풀이 비었을 때 최대 대기 시간 (초)
+POOL_RETRY_INTERVAL = 0.05       # 풀이 비었을 때 재시도 간격 (초)
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_wait_timeout = DEFAULT_POOL_WAIT_TIMEOUT
+
+# 풀 사용량 카운터 (get_pool_stats()로 조회)
+_pool_stats = {
+    'checkouts': 0,      # 풀에서 커넥션을 꺼낸 횟수
+    'waits': 0,          # 빈 풀 때문에 대기해야 했던 횟수
+    'exhausted': 0,      # 대기 시간 안에 커넥션을 얻지 못한 횟수
+    'ping_failures': 0,  # pre-ping(재연결 포함)에 실패한 횟수
+}
+_stats_lock = threading.Lock()
+
+# [신규] 스레드별 조회 오류 횟수 (cache.cached 가 호출 전후로 비교해, 오류가 난 결과는 캐시하지 않음)
+#        + 조회 스레드(query_executor)에서 모아 둔 화면 오류 메시지
+_thread_state = threading.local()
+
+
+def _report_error(message):
+    """
+    [신규] 화면에 오류를 표시합니다. st.error 는 스크립트 스레드(ScriptRunContext)에서만 표시되므로,
+    조회 스레드(begin_error_capture 이후)에서는 메시지를 모아 두었다가 메인 스레드가 표시합니다. (query_executor.result)
+    """
+    pending = getattr(_thread_state, 'pending_errors', None)
+    if pending is not None:
+        print(message)
+        pending.append(message)
+    else:
+        st.error(message)
+
+
+def begin_error_capture():
+    """[신규] 현재 스레드의 화면 오류 메시지를 st.error 대신 모아 두기 시작합니다."""
+    _thread_state.pending_errors = []
+
+
+def end_error_capture():
+    """[신규] begin_error_capture 이후 모아 둔 화면 오류 메시지를 반환하고 모으기를 끝냅니다."""
+    pending = getattr(_thread_state, 'pending_errors', None) or []
+    _thread_state.pending_errors = None
+    return pending
+
+
+def _read_db_credentials():
+    """st.secrets의 [db_credentials] 섹션을 dict로 반환합니다."""
+    creds = st.secrets['db_credentials']
+    return {
+        'host': creds['host'],
+        'user': creds['user'],
+        'password': creds['password'],
+        'database': creds['database'],
+    }
+
+
 def create_connection():
     """
     st.secrets에서 DB 정보를 읽어와 연결합니다.
+    (풀을 거치지 않는 단발성 연결. 조회 쿼리는 get_connection()을 사용하세요.)
     """
     conn = None
     try:
         # [수정] st.secrets에서 직접 DB 정보 가져오기
-        conn = mysql.connector.connect(
-            host=st.secrets['db_credentials']['host'],
-            user=st.secrets['db_credentials']['user'],
-            password=st.secrets['db_credentials']['password'],
-            database=st.secrets['db_credentials']['database']
-        )
+        conn = mysql.connector.connect(**_read_db_credentials())
         return conn
     except Error as e:
         print(f"데이터베이스 연결 오류: {e}")
     except KeyError:
-        st.error("DB 접속 정보 오류: .streamlit/secrets.toml 파일에 [db_credentials] 섹션을 확인하세요.")
+        _report_error("DB 접속 정보 오류: .streamlit/secrets.toml 파일에 [db_credentials] 섹션을 확인하세요.")
         return None
     except Exception as e:
-        st.error(f"알 수 없는 DB 연결 오류: {e}")
-        return None
\ No newline at end of file
+        _report_error(f"알 수 없는 DB 연결 오류: {e}")
+        return None
+
+
+def _bump(counter):
+    with _stats_lock:
+        _pool_stats[counter] += 1
+
+
+def _get_pool():
+    """프로세스 전역 커넥션 풀을 (최초 1회) 생성해 반환합니다."""
+    global _pool, _pool_wait_timeout
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is not None:
+            return _pool
+        try:
+            creds = st.secrets['db_credentials']
+            pool_size = int(creds.get('pool_size', DEFAULT_POOL_SIZE))
+            _pool_wait_timeout = float(creds.get('pool_wait_timeout', DEFAULT_POOL_WAIT_TIMEOUT))
+            _pool = pooling.MySQLConnectionPool(
+                pool_name=POOL_NAME,
+                pool_size=pool_size,
+                pool_reset_session=True,
+                **_read_db_credentials()
+            )
+            print(f"[DB] 커넥션 풀 생성 완료 (pool_size={pool_size})")
+        except KeyError:
+            _report_error("DB 접속 정보 오류: .streamlit/secrets.toml 파일에 [db_credentials] 섹션을 확인하세요.")
+        except Error as e:
+            print(f"커넥션 풀 생성 오류: {e}")
+        except Exception as e:
+            _report_error(f"알 수 없는 DB 연결 오류: {e}")
+    return _pool
+
+
+def _checkout(pool):
+    """풀에서 커넥션을 꺼냅니다. 풀이 비어 있으면 pool_wait_timeout 까지 기다립니다."""
+    deadline = time.monotonic() + _pool_wait_timeout
+    waited = False
+    while True:
+        try:
+            return pool.get_connection()
+        except PoolError:
+            if not waited:
+                _bump('waits')
+                waited = True
+            if time.monotonic() >= deadline:
+                _bump('exhausted')
+                print(f"[DB] 커넥션 풀 고갈: {_pool_wait_timeout}초 안에 커넥션을 얻지 못했습니다.")
+                return None
+            time.sleep(POOL_RETRY_INTERVAL)
+        except Error as e:
+            print(f"데이터베이스 연결 오류: {e}")
+            return None
+
+
+@contextmanager
+def get_connection():
+    """
+    [신규] 풀에서 커넥션을 빌려오는 컨텍스트 매니저.
+    with 블록이 끝나면 커넥션은 닫히지 않고 풀로 반환됩니다.
+    연결할 수 없으면 None을 넘겨주므로 호출부에서 None 체크를 해야 합니다.
+
+        with db_manager.get_connection() as conn:
+            if conn is None: return []
+            ...
+    """
+    pool = _get_pool()
+    conn = _checkout(pool) if pool is not None else None
+
+    if conn is not None:
+        _bump('checkouts')
+        # pre-ping: 유휴 중 끊긴 커넥션이면 재연결을 시도
+        try:
+            conn.ping(reconnect=True, attempts=1, delay=0)
+        except Error as e:
+            _bump('ping_failures')
+            print(f"[DB] 커넥션 상태 확인 실패: {e}")
+            try:
+                conn.close()
+            except Error:
+                pass
+            conn = None
+
+    if conn is None:
+        note_query_error()
+
+    try:
+        yield conn
+    finally:
+        if conn is not None:
+            try:
+                conn.close() # PooledMySQLConnection.close() -> 풀로 반환
+            except Error as e:
+                print(f"[DB] 커넥션 반환 오류: {e}")
+
+
+def note_query_error():
+    """
+    [신규] 현재 스레드에서 조회 오류가 났음을 기록합니다.
+    조회 함수는 오류 시 빈 결과를 반환하므로, except 블록에서 이 함수를 불러 빈 결과가 캐시되지 않게 합니다.
+    """
+    _thread_state.errors = get_query_error_count() + 1
+
+
+def get_query_error_count():
+    """현재 스레드에서 지금까지 기록된 조회 오류 횟수"""
+    return getattr(_thread_state, 'errors', 0)
+
+
+def get_pool_stats():
+    """커넥션 풀 사용량 카운터를 dict로 반환합니다."""
+    with _stats_lock:
+        stats = dict(_pool_stats)
+    stats['pool_size'] = _pool.pool_size if _pool is not None else 0
+    return stats
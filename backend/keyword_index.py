@@ -0,0 +1,225 @@
+# 파일 이름: backend/keyword_index.py
+# [신규] 리콜별 키워드 비트셋 인덱스 + AND/OR/NOT 키워드 식 검색
+#
+# Recall_Keyword_Junction 을 리콜 한 건당 uint64 워드(키워드 64개당 1워드) 비트마스크로 바꿔 두고,
+# '화재 AND 배터리', '(엔진 OR 변속기) NOT 소프트웨어' 같은 식을 전체 리콜에 대해
+# 비트 연산 한 번으로 평가합니다. (SQL 로 하면 키워드 개수만큼 Junction 셀프 조인이 필요)
+#
+# 식 문법: 키워드, AND(&), OR(|), NOT(!), 괄호. 연산자 없이 나열하면 AND 입니다.
+#          우선순위는 NOT > AND > OR  (예: "화재 배터리 NOT 리콜" == "화재 AND 배터리 AND NOT 리콜")
+import re
+import threading
+
+import numpy as np
+
+from . import cache
+from . import db_manager
+from . import materialized
+
+_TOKEN_PATTERN = re.compile(r'\(|\)|&&?|\|\|?|!|[^\s()&|!]+')
+_OPERATORS = {'AND': 'AND', '&': 'AND', '&&': 'AND',
+              'OR': 'OR', '|': 'OR', '||': 'OR',
+              'NOT': 'NOT', '!': 'NOT'}
+
+_index = None
+_index_lock = threading.Lock()
+
+
+# --- 키워드 식 파서 ---
+def _tokenize(expression):
+    return [_OPERATORS.get(token.upper(), token) for token in _TOKEN_PATTERN.findall(expression)]
+
+
+def parse_keyword_expression(expression):
+    """
+    키워드 식 문자열을 트리로 변환합니다. 잘못된 식이면 ValueError.
+    트리 노드: ('kw', 키워드) / ('not', 노드) / ('and', [노드...]) / ('or', [노드...])
+    """
+    tokens = _tokenize(expression or '')
+    if not tokens:
+        raise ValueError("키워드 식이 비어 있습니다.")
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or():
+        nodes = [parse_and()]
+        while peek() == 'OR':
+            take()
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def parse_and():
+        nodes = [parse_not()]
+        while peek() is not None and peek() not in ('OR', ')'):
+            if peek() == 'AND':
+                take()
+            nodes.append(parse_not())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def parse_not():
+        if peek() == 'NOT':
+            take()
+            return ('not', parse_not())
+        return parse_atom()
+
+    def parse_atom():
+        token = peek()
+        if token is None:
+            raise ValueError(f"키워드 식이 완결되지 않았습니다: {expression}")
+        if token == '(':
+            take()
+            node = parse_or()
+            if peek() != ')':
+                raise ValueError(f"괄호가 닫히지 않았습니다: {expression}")
+            take()
+            return node
+        if token in ('AND', 'OR', ')'):
+            raise ValueError(f"'{token}' 위치가 올바르지 않습니다: {expression}")
+        return ('kw', take())
+
+    tree = parse_or()
+    if position != len(tokens):
+        raise ValueError(f"'{tokens[position]}' 위치가 올바르지 않습니다: {expression}")
+    return tree
+
+
+def build_keyword_expression(all_of=(), any_of=(), none_of=()):
+    """
+    화면의 선택값(모두 포함 / 하나 이상 포함 / 제외)을 키워드 식 문자열로 만듭니다.
+    선택이 하나도 없으면 None.
+        build_keyword_expression(['화재'], ['엔진', '배터리'], ['리콜']) -> "화재 AND (엔진 OR 배터리) AND NOT 리콜"
+    """
+    parts = list(all_of)
+    if any_of:
+        parts.append(f"({' OR '.join(any_of)})" if len(any_of) > 1 else any_of[0])
+    parts.extend(f"NOT {keyword}" for keyword in none_of)
+    return " AND ".join(parts) if parts else None
+
+
+class KeywordBitsetIndex:
+    """
+    recall_id 별 키워드 비트마스크. 행 순서는 recall_ids 오름차순입니다.
+    (backend/snapshot.py 의 RecallSnapshot 도 같은 행 순서로 이 인덱스를 사용합니다.)
+    """
+
+    def __init__(self, recall_ids, keyword_rows, junction_rows, data_version=None):
+        self.data_version = data_version
+        self.recall_ids = np.sort(np.asarray(recall_ids, dtype=np.int64))
+        self.keyword_ids = np.array([row[0] for row in keyword_rows], dtype=np.int64)
+        self.keyword_texts = [row[1] for row in keyword_rows]
+        self.bit_by_text = {text: bit for bit, text in enumerate(self.keyword_texts)}
+
+        n_words = max(1, -(-len(self.keyword_texts) // 64))
+        self.bits = np.zeros((len(self.recall_ids), n_words), dtype=np.uint64)
+        if len(junction_rows) and len(self.keyword_ids) and len(self.recall_ids):
+            pairs = np.asarray(junction_rows, dtype=np.int64).reshape(-1, 2)
+            rows = np.searchsorted(self.recall_ids, pairs[:, 0])
+            rows[rows == len(self.recall_ids)] = 0
+            keyword_order = np.argsort(self.keyword_ids)
+            slots = np.searchsorted(self.keyword_ids, pairs[:, 1], sorter=keyword_order)
+            slots[slots == len(self.keyword_ids)] = 0
+            bits = keyword_order[slots]
+            valid = (self.recall_ids[rows] == pairs[:, 0]) & (self.keyword_ids[bits] == pairs[:, 1])
+            rows, bits = rows[valid], bits[valid].astype(np.uint64)
+            np.bitwise_or.at(self.bits, (rows, (bits // np.uint64(64)).astype(np.int64)),
+                             np.uint64(1) << (bits % np.uint64(64)))
+
+    def __len__(self):
+        return len(self.recall_ids)
+
+    def _query_words(self, keywords):
+        """키워드 목록을 한 행짜리 비트마스크(워드 배열)로 만듭니다."""
+        query = np.zeros(self.bits.shape[1], dtype=np.uint64)
+        for keyword in keywords:
+            bit = self.bit_by_text.get(keyword)
+            if bit is None:
+                raise ValueError(f"알 수 없는 키워드입니다: {keyword}")
+            query[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        return query
+
+    def keyword_mask(self, keyword):
+        """키워드 하나를 가진 리콜의 불리언 마스크 (없는 키워드면 모두 False)"""
+        if keyword not in self.bit_by_text:
+            return np.zeros(len(self.recall_ids), dtype=bool)
+        return (self.bits & self._query_words([keyword])).any(axis=1)
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == 'kw':
+            return (self.bits & self._query_words([node[1]])).any(axis=1)
+        if kind == 'not':
+            return ~self._evaluate(node[1])
+        children = node[1]
+        # 키워드만으로 이루어진 AND/OR 는 한 번의 비트 연산으로 처리
+        leaves = [child[1] for child in children if child[0] == 'kw']
+        others = [child for child in children if child[0] != 'kw']
+        if kind == 'and':
+            mask = np.ones(len(self.recall_ids), dtype=bool)
+            if leaves:
+                query = self._query_words(leaves)
+                mask = ((self.bits & query) == query).all(axis=1)
+            for child in others:
+                mask &= self._evaluate(child)
+        else:
+            mask = np.zeros(len(self.recall_ids), dtype=bool)
+            if leaves:
+                mask = (self.bits & self._query_words(leaves)).any(axis=1)
+            for child in others:
+                mask |= self._evaluate(child)
+        return mask
+
+    def evaluate(self, expression):
+        """키워드 식(문자열 또는 parse_keyword_expression 결과)에 맞는 리콜의 불리언 마스크"""
+        tree = parse_keyword_expression(expression) if isinstance(expression, str) else expression
+        return self._evaluate(tree)
+
+    def matching_ids(self, expression):
+        """키워드 식에 맞는 recall_id 배열 (오름차순)"""
+        return self.recall_ids[self.evaluate(expression)]
+
+    @classmethod
+    def from_connection(cls, conn):
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT recall_id FROM Recall ORDER BY recall_id")
+            recall_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT keyword_id, keyword_text FROM Keyword ORDER BY keyword_id")
+            keyword_rows = cursor.fetchall()
+            cursor.execute("SELECT recall_id, keyword_id FROM Recall_Keyword_Junction")
+            junction_rows = cursor.fetchall()
+            data_version = materialized.fetch_data_version(cursor)
+        finally:
+            cursor.close()
+        return cls(recall_ids, keyword_rows, junction_rows, data_version)
+
+
+def get_keyword_index():
+    """
+    현재 키워드 비트셋 인덱스를 반환합니다. (처음 호출 시 로딩, data_version 이 바뀌면 다시 로딩)
+    로딩에 실패하면 None.
+    """
+    global _index
+    version = cache.get_data_version()
+    if _index is not None and (version is None or version == _index.data_version):
+        return _index
+
+    with _index_lock:
+        if _index is not None and (version is None or version == _index.data_version):
+            return _index
+        try:
+            with db_manager.get_connection() as conn:
+                if conn is None:
+                    return _index
+                _index = KeywordBitsetIndex.from_connection(conn)
+            print(f"[키워드 인덱스] 리콜 {len(_index)}건, 키워드 {len(_index.keyword_texts)}개 로딩 완료")
+        except Exception as e:
+            print(f"[키워드 인덱스] 로딩 오류: {e}")
+            db_manager.note_query_error()
+    return _index
@@ -0,0 +1,208 @@
+# 파일 이름: backend/keyword_tagger.py
+# [신규] 리콜 사유 → 키워드 태깅 엔진
+# (sql/load_data_from_excel.py 에서도 임포트하므로 streamlit 에 의존하지 않습니다.)
+#
+# 기존 로더는 행마다 25개 키워드를 `keyword in reason` 으로 하나씩 검사했습니다. (행 수 x 키워드 수)
+# 여기서는 전체 사유를 하나의 코드포인트 배열로 이어 붙인 뒤, 키워드 '길이'별로
+# 키워드가 시작될 수 있는 위치의 n-gram 값을 NumPy 로 한 번에 계산하고 키워드 값 집합과 대조합니다.
+# 비용은 (전체 글자 수 x 서로 다른 키워드 길이 수) 에 비례하므로,
+# 키워드/동의어가 수백 개로 늘어나도 키워드 개수에 비례해 늘지 않습니다.
+import time
+
+import numpy as np
+import pandas as pd
+
+_EXACT_MAX_LEN = 3           # 3글자 이하는 21비트 x 3 = 63비트로 정확히 인코딩 (충돌 없음)
+_HASH_BASE = np.uint64(1_000_003)
+
+
+def _ngram_values(codes, length, starts=None):
+    """
+    codes 의 각 시작 위치(starts, 생략 시 모든 위치)에서 길이 length 인 n-gram 값을 uint64 배열로 계산합니다.
+    3글자 이하는 글자들을 비트로 이어 붙인 정확한 값, 4글자 이상은 2^64 모듈러 다항식 해시입니다.
+    """
+    count = len(codes) - length + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+    if starts is None:
+        starts = np.arange(count, dtype=np.int64)
+    else:
+        starts = starts[starts < count]
+    values = np.zeros(len(starts), dtype=np.uint64)
+    with np.errstate(over='ignore'):  # 다항식 해시는 오버플로(모듈러 연산)가 의도된 동작
+        for offset in range(length):
+            window = codes[starts + offset]
+            if length <= _EXACT_MAX_LEN:
+                values = (values << np.uint64(21)) | window
+            else:
+                values = values * _HASH_BASE + window
+    return values, starts
+
+
+def _to_codes(text):
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+
+
+class KeywordTagger:
+    """
+    키워드(및 동의어) 문자열 → keyword_id 매핑을 받아, 리콜 사유에 포함된 키워드를 찾습니다.
+    결과는 기존 `keyword_text in reason_text` 검사와 동일합니다. (부분 문자열, 대소문자 구분)
+
+        tagger = KeywordTagger({'엔진': 1, '화재': 3}, synonyms={'화재': ['발화']})
+        tags_df = tagger.tag(df['리콜사유'])   # -> columns: row, keyword_id
+    """
+
+    SEPARATOR = '\x00'  # 여러 사유를 하나로 이어 붙일 때 쓰는 구분자 (키워드에 나올 수 없음)
+
+    def __init__(self, keyword_map, synonyms=None):
+        # 검색 문자열 → keyword_id (동의어는 대표 키워드의 id 로 매핑)
+        self.term_to_id = {text: kw_id for text, kw_id in keyword_map.items() if text}
+        for keyword_text, synonym_list in (synonyms or {}).items():
+            kw_id = keyword_map.get(keyword_text)
+            if kw_id is None:
+                continue
+            for synonym in synonym_list:
+                if synonym:
+                    self.term_to_id.setdefault(synonym, kw_id)
+
+        # 키워드 첫 글자 여부 조회표 → 어떤 키워드도 시작할 수 없는 위치는 미리 건너뜀
+        self._first_char = np.zeros(0x110000, dtype=bool)
+        for term in self.term_to_id:
+            self._first_char[ord(term[0])] = True
+
+        # 길이별로 (정렬된 n-gram 값, 해당 keyword_id, 원문) 테이블을 만들어 둠
+        self._tables = {}
+        by_length = {}
+        for term in self.term_to_id:
+            by_length.setdefault(len(term), []).append(term)
+        for length, terms in by_length.items():
+            values = np.concatenate([_ngram_values(_to_codes(term), length)[0] for term in terms])
+            order = np.argsort(values, kind='stable')
+            self._tables[length] = (
+                values[order],
+                np.array([self.term_to_id[term] for term in terms], dtype=np.int64)[order],
+                [terms[i] for i in order],
+            )
+
+    def find(self, text):
+        """문자열 하나에 포함된 keyword_id 목록을 반환합니다. (정렬됨)"""
+        if not isinstance(text, str):
+            return []
+        return self.tag([text])['keyword_id'].tolist()
+
+    def tag(self, texts):
+        """
+        문자열 시퀀스 전체를 한 번에 태깅해 (row, keyword_id) 롱 포맷 DataFrame 을 반환합니다.
+        row 는 입력 시퀀스의 위치(0부터)이며, 같은 (row, keyword_id) 는 한 번만 나옵니다.
+        """
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        if not self._tables or not texts:
+            return pd.DataFrame({'row': pd.Series(dtype='int64'), 'keyword_id': pd.Series(dtype='int64')})
+
+        joined = self.SEPARATOR.join(texts)
+        codes = _to_codes(joined)
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        row_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        candidates = np.flatnonzero(self._first_char[codes])
+
+        hit_positions = []
+        hit_ids = []
+        for length, (table_values, table_ids, table_terms) in self._tables.items():
+            values, starts = _ngram_values(codes, length, candidates)
+            slots = np.searchsorted(table_values, values)
+            slots[slots == len(table_values)] = 0
+            found = table_values[slots] == values
+            matched, slots = starts[found], slots[found]
+            if length > _EXACT_MAX_LEN and len(matched):
+                # 해시 충돌 대비: 실제 문자열이 같은지 확인
+                same = np.fromiter(
+                    (joined[pos:pos + length] == table_terms[slot] for pos, slot in zip(matched, slots)),
+                    dtype=bool, count=len(matched)
+                )
+                matched, slots = matched[same], slots[same]
+            hit_positions.append(matched)
+            hit_ids.append(table_ids[slots])
+
+        positions = np.concatenate(hit_positions)
+        tags_df = pd.DataFrame({
+            'row': np.searchsorted(row_starts, positions, side='right') - 1,
+            'keyword_id': np.concatenate(hit_ids),
+        }).astype('int64')
+        return tags_df.drop_duplicates().sort_values(['row', 'keyword_id'], ignore_index=True)
+
+
+# --- 벤치마크 (python -m backend.keyword_tagger [CSV 경로]) ---
+DEFAULT_BENCH_CSV = 'data/한국교통안전공단_자동차 리콜대수 및 시정률_20221231.csv'
+
+
+def _legacy_tag(texts, keyword_map):
+    """기존 로더의 이중 루프 방식 (비교 기준)"""
+    rows = []
+    for row_no, reason_text in enumerate(texts):
+        if not isinstance(reason_text, str):
+            continue
+        for keyword_text, kw_id in keyword_map.items():
+            if keyword_text in reason_text:
+                rows.append((row_no, kw_id))
+    tags_df = pd.DataFrame(rows, columns=['row', 'keyword_id']).drop_duplicates()
+    return tags_df.sort_values(['row', 'keyword_id'], ignore_index=True).astype('int64')
+
+
+def _time_it(func, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def benchmark(csv_path=DEFAULT_BENCH_CSV, extra_keywords=500):
+    """기존 이중 루프와 KeywordTagger 를 같은 데이터로 비교하고 결과가 같은지 확인합니다."""
+    import os
+    import sys
+    sql_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sql')
+    if sql_dir not in sys.path:
+        sys.path.insert(0, sql_dir)
+    from load_data_from_excel import KEYWORDS_DATA
+
+    try:
+        df = pd.read_csv(csv_path, encoding='cp949')
+    except UnicodeDecodeError:
+        df = pd.read_csv(csv_path, encoding='utf-8')
+    texts = df['리콜사유'].tolist()
+    print(f"벤치마크 데이터: {csv_path} ({len(texts)}건)")
+
+    base_map = {text: kw_id for kw_id, (text, _) in enumerate(KEYWORDS_DATA, start=1)}
+
+    # 키워드 수를 늘린 경우 (1): 실제 사유에서 뽑은 어절들을 가상의 키워드로 추가 → 일치 건수도 함께 늘어남
+    words = pd.Series(' '.join(texts[:2000]).split()).str.strip('.,()[]"\'')
+    words = words[words.str.len().between(2, 6)].drop_duplicates()
+    frequent_map = dict(base_map)
+    for word in words.head(extra_keywords):
+        frequent_map.setdefault(word, len(frequent_map) + 1)
+
+    # 키워드 수를 늘린 경우 (2): 거의 일치하지 않는 동의어/키워드 → 순수하게 키워드 수 증가의 영향만 측정
+    rng = np.random.default_rng(0)
+    rare_map = dict(base_map)
+    while len(rare_map) < len(base_map) + extra_keywords:
+        word = ''.join(chr(0xAC00 + int(c)) for c in rng.integers(0, 11172, size=3))
+        rare_map.setdefault(word, len(rare_map) + 1)
+
+    for label, keyword_map in [('기본 키워드', base_map), ('확장(빈출) 키워드', frequent_map),
+                               ('확장(희귀) 키워드', rare_map)]:
+        legacy_time, legacy_df = _time_it(lambda: _legacy_tag(texts, keyword_map))
+        tagger = KeywordTagger(keyword_map)
+        tagger_time, tagger_df = _time_it(lambda: tagger.tag(texts))
+        same = legacy_df.equals(tagger_df)
+        print(f"[{label} {len(keyword_map)}개] 기존 루프 {legacy_time * 1000:.1f}ms / "
+              f"KeywordTagger {tagger_time * 1000:.1f}ms "
+              f"(x{legacy_time / tagger_time:.1f}), 태그 {len(tagger_df)}건, 결과 일치: {same}")
+
+
+if __name__ == "__main__":
+    import sys
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BENCH_CSV)
@@ -0,0 +1,104 @@
+# 파일 이름: backend/korean_terms.py
+# [신규] 리콜 사유용 경량 한국어 토크나이저 + 불용어
+# (sql/load_data_from_excel.py 에서도 임포트하므로 streamlit 에 의존하지 않습니다.)
+#
+# WordCloud 기본 토큰화는 공백/정규식 기준이라 '퓨즈가', '퓨즈의', '퓨즈' 가 서로 다른 단어로 집계됩니다.
+# 형태소 분석기 없이, 어절 끝의 용언 어미(하여/되어/된 ...)와 조사(이/가/을/를/의 ...)를
+# 한 번씩 떼어 내고 불용어를 제거한 뒤 단어 빈도를 셉니다.
+#
+#   tokenize("퓨즈가 끊어져 재시동이 되지않아")  -> ['퓨즈', '끊어져', '재시동']
+#   tokenize("2020년 3월 5일부터 제어회로가")    -> ['제어회로']   (날짜/수량 조각 제외, 명사 끝 '로' 보존)
+import re
+from collections import Counter
+from functools import lru_cache
+
+MIN_TERM_LENGTH = 2   # 한 글자 단어(중, 시, 등)는 제외
+MAX_TERM_LENGTH = 50  # Model_Term_Freq.term 컬럼 길이
+
+_TOKEN_PATTERN = re.compile(r'[가-힣]+|[A-Za-z][A-Za-z0-9]*')
+
+# 용언 어미 (긴 것부터 검사)
+VERB_ENDINGS = sorted([
+    '하였습니다', '되었습니다', '하였으며', '되었으며', '하였음', '되었음', '하였을', '되었을',
+    '되어야', '하여야', '되어', '하여', '하는', '되는', '하지', '되지', '하고', '되고', '하며', '되며',
+    '하면', '되면', '해야', '해서', '하게', '되게', '시키는', '시킬', '시켜', '할', '될', '한', '된', '함', '됨',
+], key=len, reverse=True)
+
+# 조사 (긴 것부터 검사)
+PARTICLES = sorted([
+    '에서는', '으로는', '에서의', '에서', '에게', '으로', '까지', '부터', '보다', '처럼', '이나', '에는', '에도',
+    '와의', '과의', '이', '가', '을', '를', '은', '는', '의', '에', '로', '와', '과', '도', '만',
+], key=len, reverse=True)
+
+# 어미/조사처럼 끝나지만 그 자체가 명사인 단어 (떼지 않음)
+NO_STRIP_TERMS = {'디스플레이', '릴레이', '트레이', '스프레이', '레이더', '브레이크'}
+
+# [수정] 한 글자 조사(로/도/과/이 ...)로 끝나지만 명사의 일부인 어말 (이 끝말로 끝나면 조사를 떼지 않음)
+#   제어회로 -> 제어회, 가속도 -> 가속, 품질조사결과 -> 품질조사결, 등받이 -> 등받 방지
+NOUN_ENDINGS = (
+    '회로', '경로', '통로', '도로', '대로', '스로',
+    '속도', '온도', '밀도', '강도', '빈도', '정도', '각도', '습도', '농도', '감도', '점도', '한도', '극도', '염도',
+    '결과', '효과', '초과',
+    '레이', '웨이', '받이', '걸이', '린이',
+)
+
+# 리콜 사유에 거의 항상 등장해 워드 클라우드를 가리는 일반 표현
+STOPWORDS = {
+    '가능성', '발생', '안전운행', '지장', '차량', '경우', '있음', '있는', '있어', '우려', '발견', '상태', '해당',
+    '리콜', '인해', '인한', '위해', '위한', '또는', '모델', '일부', '확인', '가능', '저하', '되지않아', '않아',
+    '않을', '않는', '없음', '주행', '운전자', '사고', '문제', '현상', '부분', '관련', '따라', '통해', '대한',
+    '있습니다', '되었습니다', '되었', '하였', '하는', '되는', '있고', '있으며', '것을', '것으로', '인하여', '이러',
+    '당사', '특정', '사례', '상황', '년식', '결과', '제대로', '그대로', '안으로', '등으로', '때문에', '때문', '곳에서는',
+}
+
+# [수정] 숫자 + 날짜/수량 단위 (+ 조사) 조각. 토큰화 전에 지워 '일부터', '일까지', '대에서' 같은 단어가 남지 않게 합니다.
+_NUMERIC_UNIT_PATTERN = re.compile(
+    r'\d+(?:[.,]\d+)*\s*'
+    r'(?:개월|년식|년|월|일자|일|시간|시|분|초|주|차|회|호|개|대|조|항|세대|센티미터|밀리미터|퍼센트)'
+    r'(?:' + '|'.join(PARTICLES) + r')?(?![가-힣])'
+)
+
+
+def _strip_suffix(token, suffixes):
+    """
+    가장 긴 일치 접미사 하나만 떼어 냅니다.
+    [수정] 가장 긴 접미사를 떼면 어간이 너무 짧을 때 더 짧은 접미사로 다시 시도하지 않습니다.
+    (안으로 -> '으로' 를 못 떼면 '로' 를 떼어 '안으' 가 되던 문제)
+    """
+    if token in NO_STRIP_TERMS:
+        return token
+    for suffix in suffixes:
+        if token.endswith(suffix):
+            if len(token) - len(suffix) >= MIN_TERM_LENGTH:
+                return token[:-len(suffix)]
+            return token
+    return token
+
+
+@lru_cache(maxsize=65536)
+def normalize_token(token):
+    """어절 하나에서 용언 어미 → 조사 순으로 한 번씩 떼어 낸 어간을 반환합니다. (NOUN_ENDINGS 로 끝나면 조사는 유지)"""
+    stem = _strip_suffix(token, VERB_ENDINGS)
+    if stem.endswith(NOUN_ENDINGS):
+        return stem
+    return _strip_suffix(stem, PARTICLES)
+
+
+def tokenize(text):
+    """리콜 사유 한 건을 단어 목록으로 바꿉니다. (한글 어절은 어미/조사 제거, 영문은 그대로)"""
+    if not isinstance(text, str):
+        return []
+    terms = []
+    for token in _TOKEN_PATTERN.findall(_NUMERIC_UNIT_PATTERN.sub(' ', text)):
+        term = normalize_token(token) if '가' <= token[0] <= '힣' else token
+        if MIN_TERM_LENGTH <= len(term) <= MAX_TERM_LENGTH and term not in STOPWORDS:
+            terms.append(term)
+    return terms
+
+
+def count_terms(texts):
+    """여러 사유의 단어 빈도 Counter"""
+    counts = Counter()
+    for text in texts:
+        counts.update(tokenize(text))
+    return counts
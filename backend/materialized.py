@@ -0,0 +1,134 @@
+# 파일 이름: backend/materialized.py
+# [신규] 로더가 데이터 적재 후 갱신하는 '미리 계산된(materialized)' 테이블 관리
+# (sql/load_data_from_excel.py 에서도 임포트하므로 streamlit 에 의존하지 않습니다.)
+from . import korean_terms
+
+SUMMARY_ID = 1  # Recall_Summary 는 항상 한 행(summary_id = 1)만 가집니다.
+
+# 요약 통계 5종(총 리콜/브랜드/차종 수, 최다 리콜 브랜드, 기간)을 한 번에 계산하는 쿼리
+SUMMARY_SELECT_QUERY = """
+SELECT
+    (SELECT COUNT(recall_id) FROM Recall) AS total_recalls,
+    (SELECT COUNT(brand_id) FROM Brand) AS total_brands,
+    (SELECT COUNT(model_id) FROM Model) AS total_models,
+    top_brand.brand_name AS top_brand_name,
+    COALESCE(top_brand.recall_count, 0) AS top_brand_count,
+    (SELECT MIN(recall_date) FROM Recall WHERE recall_date IS NOT NULL) AS min_recall_date,
+    (SELECT MAX(recall_date) FROM Recall WHERE recall_date IS NOT NULL) AS max_recall_date
+FROM (SELECT 1 AS one) AS dummy
+LEFT JOIN (
+    SELECT b.brand_name, COUNT(r.recall_id) AS recall_count
+    FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+    GROUP BY b.brand_name ORDER BY recall_count DESC LIMIT 1
+) AS top_brand ON 1 = 1
+"""
+
+# 요약 테이블 단건 조회 (기본키 조회)
+SUMMARY_LOOKUP_QUERY = """
+SELECT total_recalls, total_brands, total_models, top_brand_name, top_brand_count,
+       min_recall_date, max_recall_date, data_version, refreshed_at
+FROM Recall_Summary WHERE summary_id = %s
+"""
+
+SUMMARY_REFRESH_QUERY = f"""
+INSERT INTO Recall_Summary (
+    summary_id, total_recalls, total_brands, total_models, top_brand_name, top_brand_count,
+    min_recall_date, max_recall_date, data_version, refreshed_at
+)
+SELECT %s, s.total_recalls, s.total_brands, s.total_models, s.top_brand_name, s.top_brand_count,
+       s.min_recall_date, s.max_recall_date, 1, NOW()
+FROM ({SUMMARY_SELECT_QUERY}) AS s
+ON DUPLICATE KEY UPDATE
+    total_recalls = VALUES(total_recalls),
+    total_brands = VALUES(total_brands),
+    total_models = VALUES(total_models),
+    top_brand_name = VALUES(top_brand_name),
+    top_brand_count = VALUES(top_brand_count),
+    min_recall_date = VALUES(min_recall_date),
+    max_recall_date = VALUES(max_recall_date),
+    data_version = data_version + 1,
+    refreshed_at = NOW()
+"""
+
+
+def refresh_summary(cursor):
+    """Recall_Summary 를 현재 데이터 기준으로 다시 계산합니다. (커밋은 호출부에서)"""
+    cursor.execute(SUMMARY_REFRESH_QUERY, (SUMMARY_ID,))
+    print(" -> 'Recall_Summary' 요약 테이블 갱신 완료.")
+
+
+# --- [신규] 브랜드/차종/연도/키워드 집계 큐브 (Recall_Cube) ---
+# 키: (brand_id, model_id, recall_year, keyword_id)
+#   recall_year = 0 : 리콜개시일이 없는 리콜
+#   keyword_id  = 0 : 키워드와 무관한 '전체 리콜' 행 (키워드 행들의 합과 다름: 리콜 1건이 여러 키워드를 가질 수 있음)
+# 평균 시정률은 SUM(rate_sum) / SUM(rate_count) 로 계산합니다. (AVG 처럼 NULL 제외)
+CUBE_ALL_KEYWORDS = 0
+
+CUBE_DELETE_QUERY = "DELETE FROM Recall_Cube"
+
+CUBE_INSERT_ALL_QUERY = """
+INSERT INTO Recall_Cube (
+    brand_id, model_id, recall_year, keyword_id,
+    recall_count, recall_units, correction_units, rate_sum, rate_count
+)
+SELECT m.brand_id, r.model_id, COALESCE(YEAR(r.recall_date), 0), %s,
+       COUNT(*), COALESCE(SUM(r.recall_count), 0), COALESCE(SUM(r.correction_count), 0),
+       COALESCE(SUM(r.correction_rate), 0), COUNT(r.correction_rate)
+FROM Recall r JOIN Model m ON r.model_id = m.model_id
+GROUP BY m.brand_id, r.model_id, COALESCE(YEAR(r.recall_date), 0)
+"""
+
+CUBE_INSERT_KEYWORD_QUERY = """
+INSERT INTO Recall_Cube (
+    brand_id, model_id, recall_year, keyword_id,
+    recall_count, recall_units, correction_units, rate_sum, rate_count
+)
+SELECT m.brand_id, r.model_id, COALESCE(YEAR(r.recall_date), 0), rkj.keyword_id,
+       COUNT(*), COALESCE(SUM(r.recall_count), 0), COALESCE(SUM(r.correction_count), 0),
+       COALESCE(SUM(r.correction_rate), 0), COUNT(r.correction_rate)
+FROM Recall r
+JOIN Model m ON r.model_id = m.model_id
+JOIN Recall_Keyword_Junction rkj ON r.recall_id = rkj.recall_id
+GROUP BY m.brand_id, r.model_id, COALESCE(YEAR(r.recall_date), 0), rkj.keyword_id
+"""
+
+
+def refresh_cube(cursor):
+    """Recall_Cube 를 현재 데이터 기준으로 다시 만듭니다. (커밋은 호출부에서, 같은 트랜잭션 안에서 교체)"""
+    cursor.execute(CUBE_DELETE_QUERY)
+    cursor.execute(CUBE_INSERT_ALL_QUERY, (CUBE_ALL_KEYWORDS,))
+    group_count = cursor.rowcount
+    cursor.execute(CUBE_INSERT_KEYWORD_QUERY)
+    print(f" -> 'Recall_Cube' 집계 큐브 갱신 완료. (전체 {group_count}개 + 키워드 {cursor.rowcount}개 그룹)")
+
+
+# --- [신규] 차종별 리콜 사유 단어 빈도 (Model_Term_Freq) ---
+TERM_FREQ_DELETE_QUERY = "DELETE FROM Model_Term_Freq"
+TERM_FREQ_SOURCE_QUERY = "SELECT model_id, reason FROM Recall WHERE reason IS NOT NULL"
+TERM_FREQ_INSERT_QUERY = "INSERT INTO Model_Term_Freq (model_id, term, term_count) VALUES (%s, %s, %s)"
+TERM_FREQ_BATCH_SIZE = 5000
+
+
+def refresh_term_freq(cursor):
+    """Model_Term_Freq 를 현재 리콜 사유 기준으로 다시 만듭니다. (커밋은 호출부에서, 같은 트랜잭션 안에서 교체)"""
+    cursor.execute(TERM_FREQ_SOURCE_QUERY)
+    reasons_by_model = {}
+    for model_id, reason in cursor.fetchall():
+        reasons_by_model.setdefault(model_id, []).append(reason)
+
+    rows = [(model_id, term, count)
+            for model_id, reasons in reasons_by_model.items()
+            for term, count in korean_terms.count_terms(reasons).items()]
+    cursor.execute(TERM_FREQ_DELETE_QUERY)
+    for start in range(0, len(rows), TERM_FREQ_BATCH_SIZE):
+        cursor.executemany(TERM_FREQ_INSERT_QUERY, rows[start:start + TERM_FREQ_BATCH_SIZE])
+    print(f" -> 'Model_Term_Freq' 단어 빈도 갱신 완료. (차종 {len(reasons_by_model)}개, {len(rows)}행)")
+
+
+def fetch_data_version(cursor):
+    """Recall_Summary 의 data_version (요약 행이 없으면 None). 캐시/스냅샷의 데이터 버전 확인용."""
+    cursor.execute("SELECT data_version FROM Recall_Summary WHERE summary_id = %s", (SUMMARY_ID,))
+    row = cursor.fetchone()
+    if isinstance(row, dict):
+        return row.get('data_version')
+    return row[0] if row else None
@@ -0,0 +1,122 @@
+# 파일 이름: backend/name_normalizer.py
+# [신규] 제작자/차명 이름 정규화 (별칭 테이블 + 고유값 단위 정제)
+# (data/python process_data.py, sql/load_data_from_excel.py 에서도 임포트하므로 streamlit 에 의존하지 않습니다.)
+#
+# 기존 clean_manufacturer_name 은 if 문 체인이라 브랜드를 추가하려면 코드를 고쳐야 했고,
+# Series.apply 로 약 1만 행마다 파이썬 함수를 호출했습니다. 여기서는
+#   1) 브랜드 통합 규칙을 MANUFACTURER_ALIASES 테이블(부분 문자열 → 대표 이름)로 두고
+#   2) 컬럼의 '고유값'만 한 번씩 정제한 뒤 factorize 코드로 전체 행에 되돌려 놓습니다. (원본 CSV 9,856행 중 제작자 67개, 차명 3,709개)
+#
+# 벤치마크 (원본 CSV 기준 Series.apply 와 비교):
+#   (프로젝트 루트에서) python -m backend.name_normalizer
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+BENCHMARK_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'data', '한국교통안전공단_자동차 리콜대수 및 시정률_20221231.csv')
+
+# 제작자 별칭: 소문자로 바꾼 제작자 이름에 pattern 이 들어 있으면 대표 이름으로 통합 (위에서부터 처음 일치하는 규칙)
+MANUFACTURER_ALIASES = [
+    ('현대', '현대'),
+    ('기아', '기아'),
+    ('한국지엠', 'GM'),
+    ('지엠코리아', 'GM'),
+    ('르노코리아', '르노'),
+    ('르노삼성', '르노'),
+    ('쌍용', '쌍용(KG모빌리티)'),
+    ('메르세데스', '벤츠'),
+    ('벤츠', '벤츠'),
+    ('비엠더블유', 'BMW'),
+    ('bmw', 'BMW'),
+    ('폭스바겐', '폭스바겐'),
+    ('아우디', '아우디'),
+    ('포르쉐', '포르쉐'),
+]
+# 별칭에 없는 제작자에서 지울 회사 형태 표기 (괄호 안 내용은 먼저 제거)
+COMPANY_SUFFIXES = ['주식회사', '(유)', '(주)']
+
+# 차명 별칭: 정제한 차명 → 대표 차명 (정확히 일치할 때만, 필요 시 추가)
+MODEL_ALIASES = {}
+
+_PARENTHESES = re.compile(r'\(.*\)')
+_PARENTHESES_SHORTEST = re.compile(r'\(.*?\)')
+
+
+def normalize_manufacturer(name):
+    """제작자 이름 하나를 정규화합니다. (예: '현대자동차(주)' -> '현대', '(주)에프엠케이' -> '에프엠케이')"""
+    name = str(name)
+    name_lower = name.lower()
+    for pattern, canonical in MANUFACTURER_ALIASES:
+        if pattern in name_lower:
+            return canonical
+    name = _PARENTHESES.sub('', name).strip()
+    for suffix in COMPANY_SUFFIXES:
+        name = name.replace(suffix, '')
+    return name.strip()
+
+
+def normalize_model(name):
+    """차명 하나를 정규화합니다. (괄호 및 괄호 안 내용 제거, 연속 공백 정리, MODEL_ALIASES 적용)"""
+    name = ' '.join(_PARENTHESES.sub('', str(name)).split())
+    return MODEL_ALIASES.get(name, name)
+
+
+def strip_parentheses(name):
+    """괄호 부분만 지웁니다. (예: '현대자동차(주)' -> '현대자동차', Excel 적재 경로의 브랜드 이름 규칙)"""
+    return _PARENTHESES_SHORTEST.sub('', str(name)).strip()
+
+
+def _map_codes(series, codes, cleaned):
+    cleaned = np.append(np.asarray(cleaned, dtype=object), None)  # 코드 -1(결측) → 마지막 None
+    return pd.Series(cleaned[codes], index=series.index, name=series.name)
+
+
+def normalize_series(series, func):
+    """
+    series 의 고유값마다 func 를 한 번만 호출하고, factorize 코드로 전체 행에 결과를 되돌려 놓습니다.
+    결측값은 그대로 결측값으로 둡니다.
+    """
+    codes, uniques = pd.factorize(series)
+    return _map_codes(series, codes, [func(value) for value in uniques])
+
+
+def normalize_manufacturers(series):
+    return normalize_series(series, normalize_manufacturer)
+
+
+def normalize_models(series):
+    return normalize_series(series, normalize_model)
+
+
+def benchmark(csv_path=BENCHMARK_CSV, repeat=5):
+    """원본 CSV 의 제작자/차명 컬럼으로 Series.apply 와 고유값 정제의 소요 시간을 비교해 출력합니다."""
+    try:
+        df = pd.read_csv(csv_path, encoding='cp949', usecols=['제작자', '차명'])
+    except UnicodeDecodeError:
+        df = pd.read_csv(csv_path, encoding='utf-8', usecols=['제작자', '차명'])
+    print(f"행 {len(df)}건, 제작자 고유값 {df['제작자'].nunique()}개, 차명 고유값 {df['차명'].nunique()}개 (반복 {repeat}회)")
+
+    def timed(label, run):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = run()
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"   {label:<28} {elapsed * 1000:8.2f}ms")
+        return result, elapsed
+
+    for column, func, vectorized in [('제작자', normalize_manufacturer, normalize_manufacturers),
+                                     ('차명', normalize_model, normalize_models)]:
+        print(f" - {column}")
+        by_row, row_time = timed("Series.apply (행마다)", lambda: df[column].apply(func))
+        by_unique, unique_time = timed("고유값 정제 + factorize", lambda: vectorized(df[column]))
+        valid = df[column].notna()
+        same = (by_row[valid].astype(object) == by_unique[valid]).all()
+        print(f"   -> {row_time / unique_time:.1f}배 빠름, 결과 일치: {same}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,61 @@
+# 파일 이름: backend/query_executor.py
+# [신규] 서로 독립적인 조회를 동시에 실행하는 스레드 풀
+#
+# 페이지가 조회 함수를 하나씩 차례로 부르면 렌더링 시간은 각 조회 시간의 '합'이 됩니다.
+# 여기서 future 로 먼저 모두 제출해 두고 필요한 곳에서 결과를 꺼내면,
+# 각 조회가 커넥션 풀의 서로 다른 커넥션을 쓰므로 가장 느린 조회 시간에 가까워집니다.
+#
+#   from backend import query_executor
+#   stats_future = query_executor.submit(get_recall_comparison, brand, model)
+#   png_future = query_executor.submit(get_model_wordcloud_png, brand, model)
+#   (stats, keywords_df), png = query_executor.gather(stats_future, png_future)
+#
+# 조회 함수들은 오류를 스스로 처리해 빈 결과를 돌려주므로, gather 는 예외를 그대로 전달합니다.
+# [수정] 조회 스레드에는 ScriptRunContext 가 없어 st.error 가 표시되지 않으므로, 스레드에서 난 화면 오류
+#        (db_manager._report_error)는 Future 에 모아 두었다가 result()/gather() 가 메인 스레드에서 st.error 로 표시합니다.
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from . import db_manager
+
+# 커넥션 풀(기본 5) 중 하나는 워밍업/다른 세션 몫으로 남겨 둠
+DEFAULT_WORKERS = max(1, db_manager.DEFAULT_POOL_SIZE - 1)
+
+_executor = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix="query")
+atexit.register(_executor.shutdown, wait=False)
+
+
+def _run_capturing_errors(errors, func, args, kwargs):
+    db_manager.begin_error_capture()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        errors.extend(db_manager.end_error_capture())
+
+
+def submit(func, *args, **kwargs):
+    """func(*args, **kwargs) 를 조회 스레드 풀에 제출하고 Future 를 반환합니다. (결과는 result(future) 로 꺼냄)"""
+    errors = []
+    future = _executor.submit(_run_capturing_errors, errors, func, args, kwargs)
+    future.query_errors = errors
+    return future
+
+
+def result(future, timeout=None):
+    """[신규] Future 의 결과를 반환하고, 조회 스레드에서 모아 둔 오류 메시지를 (메인 스레드에서) st.error 로 표시합니다."""
+    value = future.result(timeout=timeout)
+    for message in getattr(future, 'query_errors', ()):
+        st.error(message)
+    return value
+
+
+def gather(*futures, timeout=None):
+    """Future 들의 결과를 제출 순서대로 리스트로 반환합니다. (timeout: Future 하나당 최대 대기 시간(초))"""
+    return [result(future, timeout=timeout) for future in futures]
+
+
+def run_parallel(calls, timeout=None):
+    """[(func, args), ...] 를 동시에 실행하고 결과를 같은 순서의 리스트로 반환합니다."""
+    return gather(*[submit(func, *args) for func, args in calls], timeout=timeout)
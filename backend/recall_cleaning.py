@@ -0,0 +1,88 @@
+# 파일 이름: backend/recall_cleaning.py
+# [신규] 한국교통안전공단 리콜 원본 데이터 필터링/정제 규칙 (공용)
+# data/python process_data.py(브랜드별 요약 Excel)와 sql/load_data_from_excel.py(DB 적재)가 함께 사용하므로
+# streamlit 에 의존하지 않습니다. 모든 함수는 DataFrame '청크' 단위로 동작해 스트리밍 적재에도 그대로 쓸 수 있습니다.
+import pandas as pd
+
+from . import name_normalizer
+
+# --- 1. 필터링 키워드 (승용차가 아닌 것들) ---
+MANUFACTURER_EXCLUDE_KEYWORDS = [
+    '버스', '모터스', '이륜차', '오토바이', '스즈키', '할리데이비슨', '혼다코리아',
+    '대동공업', '엘에스엠트론', '트랙터', '농기계', 'KR모터스', '가와사키', '두카티',
+    '브이스트롬', '인디언', '바이크', '모터사이클', '야마하', '다임러트럭', '만트럭',
+    '볼보트럭', '스카니아', '특장', '중공업', '상용차', '선롱버스', '자일대우'
+]
+MODEL_NAME_EXCLUDE_KEYWORDS = [
+    '버스', '트럭', '트랙터', '이륜차', '스쿠터', '오토바이', '굴삭기', '지게차',
+    'LPGi', '카고', '덤프', '트레일러', '특수', '모터싸이클', '화물', 'CITY'
+]
+
+DATE_COLUMNS = ['생산기간(부터)', '생산기간(까지)', '리콜개시일']
+TEXT_COLUMNS = ['제작자', '차명', '리콜사유']
+RATE_COLUMN = '시정률(퍼센트)'
+RATE_COLUMN_ALIASES = ['시정율(퍼센트)', '시정율']
+
+
+# --- 2. 정제(통합) 함수 ---
+# [수정] if 문 체인 → backend/name_normalizer.py 의 별칭 테이블 (기존 이름은 호환용으로 유지)
+clean_manufacturer_name = name_normalizer.normalize_manufacturer
+clean_model_name = name_normalizer.normalize_model
+
+
+# --- 3. DataFrame(청크) 단위 처리 ---
+def filter_passenger_cars(df):
+    """제작자/차명에 제외 키워드가 들어간 행(버스, 트럭, 이륜차 등)을 뺀 복사본을 반환합니다."""
+    mask_mfg = df['제작자'].str.contains('|'.join(MANUFACTURER_EXCLUDE_KEYWORDS), case=False, na=False)
+    mask_model = df['차명'].str.contains('|'.join(MODEL_NAME_EXCLUDE_KEYWORDS), case=False, na=False)
+    return df[~mask_mfg & ~mask_model].copy()
+
+
+def clean_names(df):
+    """제작자/차명 컬럼을 정규화합니다. (고유값마다 한 번만 정제, 제자리 수정)"""
+    df['제작자'] = name_normalizer.normalize_manufacturers(df['제작자'])
+    df['차명'] = name_normalizer.normalize_models(df['차명'])
+    return df
+
+
+def normalize_db_names(df):
+    """
+    [신규] DB 적재용 제작자 이름 규칙: 괄호 부분만 제거합니다. (예: '현대자동차(주)' -> '현대자동차', 기존 DB 의 Brand 이름)
+    Excel/CSV 적재 모두 이 함수를 거친 뒤 content_hash 를 계산하므로, 같은 리콜은 어느 원본에서 읽어도 같은 해시가 됩니다.
+    (clean_names 의 브랜드 통합 규칙은 data/python process_data.py 의 요약 Excel 용)
+    """
+    df['제작자'] = name_normalizer.normalize_series(df['제작자'], name_normalizer.strip_parentheses)
+    return df
+
+
+def normalize_recall_columns(df):
+    """
+    DB 적재용 컬럼 형식 통일: 날짜 3종 → datetime (YYYYMMDD 숫자만 추출), 시정율 → '시정률(퍼센트)',
+    리콜대수/시정대수 → int, 시정률 → float, 결측값 → None, 리콜사유 없는 행 제거.
+    제작자/차명/리콜사유는 문자열로 통일합니다. (Excel 이 숫자로 읽는 차명 예: 520 → '520')
+    """
+    df.columns = df.columns.str.strip()
+    for col in TEXT_COLUMNS:
+        df[col] = df[col].map(lambda value: value if isinstance(value, str) or pd.isna(value) else str(value))
+    for col in DATE_COLUMNS:
+        df[col] = pd.to_datetime(df[col].astype(str).str.replace(r'[^\d]', '', regex=True),
+                                 format='%Y%m%d', errors='coerce')
+
+    for alias in RATE_COLUMN_ALIASES:
+        if RATE_COLUMN not in df.columns and alias in df.columns:
+            df = df.rename(columns={alias: RATE_COLUMN})
+    if RATE_COLUMN not in df.columns:
+        print("[정보] '시정률(퍼센트)' 컬럼이 없어 새로 생성합니다.")
+        df[RATE_COLUMN] = 0.0 # 기본값 0
+
+    df['리콜대수'] = pd.to_numeric(df['리콜대수'], errors='coerce').fillna(0).astype(int)
+    df['시정대수'] = pd.to_numeric(df['시정대수'], errors='coerce').fillna(0).astype(int)
+    df[RATE_COLUMN] = pd.to_numeric(df[RATE_COLUMN], errors='coerce').fillna(0).astype(float)
+
+    df = df.where(pd.notnull(df), None)
+    return df.dropna(subset=['리콜사유'])
+
+
+def clean_raw_chunk(df):
+    """원본 CSV 청크 → 승용차 필터링 → DB 적재용 형식 → DB 적재용 제작자 이름 (Excel 적재와 같은 규칙)"""
+    return normalize_db_names(normalize_recall_columns(filter_passenger_cars(df)))
@@ -1,268 +1,797 @@
 # 파일 이름: backend/search_queries.py
 import pandas as pd
-import streamlit as st
 import decimal
+import base64
+import json
+import re
+from datetime import date
 from . import db_manager # 같은 폴더의 db_manager를 임포트
+from . import cache # [신규] data_version 단위 결과 캐시 (st.cache_data 대체)
+from . import snapshot # [신규] 인메모리 스냅샷 (secrets 의 [app] use_snapshot 으로 사용)
+from . import keyword_index # [신규] 키워드 비트셋 인덱스 (AND/OR/NOT 키워드 식)
+from .stats_queries import safe_int_from_value
+
+# --- [수정] 브랜드 → 차종 카탈로그를 한 번에 조회 (선택 상자 변경마다 DB 를 읽지 않음) ---
+@cache.cached()
+def get_catalog():
+    """
+    전체 브랜드 → 차종 목록을 한 번의 쿼리로 조회합니다.
+    반환값: {브랜드명: [(model_id, 차종명), ...]}  (브랜드명, 차종명 순으로 정렬, 차종이 없는 브랜드는 빈 목록)
+    """
+    query = """
+    SELECT b.brand_name, m.model_id, m.model_name
+    FROM Brand b LEFT JOIN Model m ON m.brand_id = b.brand_id
+    ORDER BY b.brand_name, m.model_name;
+    """
+    with db_manager.get_connection() as conn:
+        if conn is None: return {}
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            catalog = {}
+            for brand_name, model_id, model_name in cursor.fetchall():
+                models = catalog.setdefault(brand_name, [])
+                if model_id is not None:
+                    models.append((model_id, model_name))
+            return catalog
+        except Exception as e:
+            print(f"get_catalog 오류: {e}")
+            db_manager.note_query_error()
+            return {}
+        finally:
+            if cursor: cursor.close()
 
-@st.cache_data(ttl=3600)
 def get_all_brands():
-    query = "SELECT brand_name FROM Brand ORDER BY brand_name;"
-    conn = db_manager.create_connection()
-    if conn is None: return []
-    try:
-        df = pd.read_sql(query, conn)
-        return df['brand_name'].tolist()
-    except Exception as e:
-        print(f"get_all_brands 오류: {e}")
-        return []
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
+    return list(get_catalog().keys())
 
-@st.cache_data(ttl=3600)
 def get_models_by_brand(brand_name):
-    query = """
-    SELECT m.model_name FROM Model m
-    JOIN Brand b ON m.brand_id = b.brand_id
-    WHERE b.brand_name = %s ORDER BY m.model_name;
-    """
-    conn = db_manager.create_connection()
-    if conn is None: return []
-    try:
-        df = pd.read_sql(query, conn, params=(brand_name,))
-        return df['model_name'].tolist()
-    except Exception as e:
-        print(f"get_models_by_brand 오류: {e}")
-        return []
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
+    return [model_name for _, model_name in get_catalog().get(brand_name, [])]
+
+def get_model_id(brand_name, model_name):
+    """(브랜드명, 차종명) 의 model_id. 없으면 None."""
+    for model_id, name in get_catalog().get(brand_name, []):
+        if name == model_name:
+            return model_id
+    return None
+# --- [수정 끝] ---
 
-@st.cache_data(ttl=3600)
+@cache.cached()
 def get_all_keywords_with_desc():
     query = "SELECT keyword_text, keyword_desc FROM Keyword ORDER BY keyword_text;"
-    conn = db_manager.create_connection()
-    if conn is None: return {}
-    
-    keyword_dict = {}
-    cursor = None
-    try:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        
-        if rows:
-            for row in rows:
-                if isinstance(row, dict): 
-                    key = row.get('keyword_text')
-                    desc = row.get('keyword_desc')
-                    if key: 
-                        keyword_dict[key] = desc
-                        
-        return keyword_dict
-        
-    except Exception as e:
-        print(f"get_all_keywords_with_desc 오류: {e}")
-        return {}
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
-
-# --- [수정된 함수] ---
-def search_recalls(brand, model, year, keyword):
-    conn = db_manager.create_connection()
-    if conn is None: return pd.DataFrame() 
-    cursor = None
-    try:
-        query = """
-        SELECT 
-            r.recall_id AS '리콜ID', -- [★ 수정] 클릭 이벤트를 위해 recall_id 추가
-            b.brand_name AS '브랜드', 
-            m.model_name AS '차종', 
-            r.recall_date AS '리콜개시일',
-            r.prod_from AS '생산시작', 
-            r.prod_to AS '생산종료', 
-            r.reason AS '리콜사유',
-            r.recall_count AS '리콜대수', 
-            r.correction_count AS '시정대수', 
-            r.correction_rate AS '시정률(%)' 
-        FROM Recall AS r
-        JOIN Model AS m ON r.model_id = m.model_id
-        JOIN Brand AS b ON m.brand_id = b.brand_id
-        LEFT JOIN Recall_Keyword_Junction AS rkj ON r.recall_id = rkj.recall_id
-        LEFT JOIN Keyword AS k ON rkj.keyword_id = k.keyword_id
-        """
-        where_clauses = []
-        params = []
-        if brand and brand != "전체":
-            where_clauses.append("b.brand_name = %s")
-            params.append(brand)
-        if model and model != "전체":
-            where_clauses.append("m.model_name = %s")
-            params.append(model)
-        if year and year != "전체":
-            where_clauses.append("YEAR(r.recall_date) = %s")
-            params.append(str(year))
-        if keyword and keyword != "전체":
-            where_clauses.append("k.keyword_text = %s")
-            params.append(keyword)
-
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
-        query += " GROUP BY r.recall_id ORDER BY r.recall_date DESC LIMIT 200;"
-        
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query, tuple(params))
-        results_list = cursor.fetchall()
-
-        if not results_list:
+    with db_manager.get_connection() as conn:
+        if conn is None: return {}
+
+        keyword_dict = {}
+        cursor = None
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query)
+            rows = cursor.fetchall()
+
+            if rows:
+                for row in rows:
+                    if isinstance(row, dict): 
+                        key = row.get('keyword_text')
+                        desc = row.get('keyword_desc')
+                        if key: 
+                            keyword_dict[key] = desc
+
+            return keyword_dict
+
+        except Exception as e:
+            print(f"get_all_keywords_with_desc 오류: {e}")
+            db_manager.note_query_error()
+            return {}
+        finally:
+            if cursor: cursor.close()
+
+# --- [수정] 상세 검색 쿼리 빌더 ---
+SEARCH_SELECT = """
+SELECT 
+    r.recall_id AS '리콜ID', -- [★ 수정] 클릭 이벤트를 위해 recall_id 추가
+    b.brand_name AS '브랜드', 
+    m.model_name AS '차종', 
+    r.recall_date AS '리콜개시일',
+    r.prod_from AS '생산시작', 
+    r.prod_to AS '생산종료', 
+    r.reason AS '리콜사유',
+    r.recall_count AS '리콜대수', 
+    r.correction_count AS '시정대수', 
+    r.correction_rate AS '시정률(%)',
+    (
+        SELECT GROUP_CONCAT(k.keyword_text ORDER BY k.keyword_text SEPARATOR ', ')
+        FROM Recall_Keyword_Junction AS rkj
+        JOIN Keyword AS k ON rkj.keyword_id = k.keyword_id
+        WHERE rkj.recall_id = r.recall_id
+    ) AS '키워드'
+FROM Recall AS r
+JOIN Model AS m ON r.model_id = m.model_id
+JOIN Brand AS b ON m.brand_id = b.brand_id
+"""
+
+# 키워드 필터: 조인으로 행을 불렸다가 GROUP BY 로 다시 합치는 대신 EXISTS(semi-join) 사용
+KEYWORD_EXISTS_CLAUSE = """EXISTS (
+    SELECT 1 FROM Recall_Keyword_Junction AS rkj
+    JOIN Keyword AS k ON rkj.keyword_id = k.keyword_id
+    WHERE rkj.recall_id = r.recall_id AND k.keyword_text = %s
+)"""
+
+
+def build_search_filters(brand, model, year, keyword, keyword_expr=None, reason_query=None):
+    """
+    상세 검색 조건을 (WHERE 조건 목록, 파라미터 목록) 으로 변환합니다. ("전체" 는 조건 없음)
+    keyword_expr / reason_query 가 잘못되었으면 ValueError.
+    """
+    where_clauses = []
+    params = []
+    if brand and brand != "전체":
+        where_clauses.append("b.brand_name = %s")
+        params.append(brand)
+    if model and model != "전체":
+        where_clauses.append("m.model_name = %s")
+        params.append(model)
+    if year and year != "전체":
+        # [수정] YEAR(r.recall_date) = %s 는 인덱스를 못 타므로 날짜 범위 조건으로 변경
+        where_clauses.append("r.recall_date >= %s AND r.recall_date < %s")
+        params.extend([date(int(year), 1, 1), date(int(year) + 1, 1, 1)])
+    if keyword and keyword != "전체":
+        where_clauses.append(KEYWORD_EXISTS_CLAUSE)
+        params.append(keyword)
+    if keyword_expr:
+        expr_clause, expr_params = build_keyword_expr_filter(keyword_expr)
+        where_clauses.append(expr_clause)
+        params.extend(expr_params)
+    if reason_query:
+        where_clauses.append(REASON_MATCH_CLAUSE)
+        params.append(build_fulltext_query(reason_query))
+    return where_clauses, params
+
+
+# [수정] 키워드 식 결과를 IN 목록으로 넘길 최대 건수. 넘으면 식을 EXISTS / NOT EXISTS 조건으로 SQL 에 그대로 넘김
+#        (자리표시자 수천 개짜리 쿼리는 파싱/전송 비용이 크고 max_allowed_packet 에 걸릴 수 있음)
+MAX_KEYWORD_EXPR_IDS = 1000
+
+
+def build_keyword_expr_filter(keyword_expr):
+    """
+    [신규] AND/OR/NOT 키워드 식을 키워드 비트셋 인덱스로 평가해 recall_id IN (...) 조건으로 변환합니다.
+    (Junction 셀프 조인 대신 메모리 비트 연산 → 일치하는 recall_id 목록)
+    [수정] 일치 건수가 MAX_KEYWORD_EXPR_IDS 를 넘거나 인덱스를 불러오지 못하면
+    식을 EXISTS / NOT EXISTS 조건으로 바꿔 SQL 에서 평가합니다. (build_keyword_expr_sql)
+    잘못된 식이면 ValueError.
+    """
+    tree = keyword_index.parse_keyword_expression(keyword_expr)
+    index = keyword_index.get_keyword_index()
+    if index is None:
+        return build_keyword_expr_sql(tree)
+    recall_ids = index.matching_ids(tree).tolist()
+    if not recall_ids:
+        return "1 = 0", []
+    if len(recall_ids) > MAX_KEYWORD_EXPR_IDS:
+        return build_keyword_expr_sql(tree)
+    return "r.recall_id IN (" + ", ".join(["%s"] * len(recall_ids)) + ")", recall_ids
+
+
+def build_keyword_expr_sql(tree):
+    """
+    [신규] 키워드 식 트리(keyword_index.parse_keyword_expression)를 SQL 조건으로 바꿉니다.
+    키워드 하나 = KEYWORD_EXISTS_CLAUSE, NOT / AND / OR 는 그대로 SQL 연산자로 옮깁니다.
+    반환값: (조건 문자열, 파라미터 목록)
+    """
+    kind = tree[0]
+    if kind == 'kw':
+        return KEYWORD_EXISTS_CLAUSE, [tree[1]]
+    if kind == 'not':
+        clause, params = build_keyword_expr_sql(tree[1])
+        return f"NOT ({clause})", params
+    clauses, params = [], []
+    for child in tree[1]:
+        clause, child_params = build_keyword_expr_sql(child)
+        clauses.append(f"({clause})")
+        params.extend(child_params)
+    return f" {kind.upper()} ".join(clauses), params
+
+
+def search_recalls(brand, model, year, keyword, keyword_expr=None):
+    """
+    상세 검색 결과(최신순, 최대 200건)를 반환합니다.
+    각 행의 키워드 목록은 '키워드' 컬럼(쉼표 구분)으로 함께 내려오므로 행별 추가 조회가 필요 없습니다.
+    - keyword_expr: '화재 AND 배터리', '(엔진 OR 변속기) NOT 소프트웨어' 같은 키워드 식 (backend/keyword_index.py)
+    """
+    snap = snapshot.get_snapshot()
+    if snap is not None:
+        try:
+            return snap.search_recalls(brand, model, year, keyword, keyword_expr)
+        except ValueError as e:
+            print(f"search_recalls 키워드 식 오류: {e}")
             return pd.DataFrame()
-        return pd.DataFrame(results_list)
-    except Exception as e:
-        print(f"백엔드 쿼리 오류 (search_recalls): {e}")
-        return pd.DataFrame()
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected(): conn.close()
+    with db_manager.get_connection() as conn:
+        if conn is None: return pd.DataFrame() 
+        cursor = None
+        try:
+            where_clauses, params = build_search_filters(brand, model, year, keyword, keyword_expr)
+            query = SEARCH_SELECT
+            if where_clauses:
+                query += " WHERE " + " AND ".join(where_clauses)
+            query += " ORDER BY r.recall_date DESC, r.recall_id DESC LIMIT 200;"
+
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, tuple(params))
+            results_list = cursor.fetchall()
+
+            if not results_list:
+                return pd.DataFrame()
+            return pd.DataFrame(results_list)
+        except Exception as e:
+            print(f"백엔드 쿼리 오류 (search_recalls): {e}")
+            db_manager.note_query_error()
+            return pd.DataFrame()
+        finally:
+            if cursor: cursor.close()
 # --- [수정 끝] ---
 
+# --- [신규] 키셋(커서) 페이지네이션 ---
+SEARCH_PAGE_SIZE = 50
 
-def get_recall_comparison(brand, model):
-    if not brand or not model or brand == "전체" or model == "전체":
-        return None, pd.DataFrame() 
-    conn = db_manager.create_connection()
-    if conn is None:
-        return None, pd.DataFrame()
-    
-    stats = {'total_recalls': 0, 'avg_correction_rate': 0}
-    keywords_df = pd.DataFrame()
-    cursor = None
-    
+
+def encode_search_cursor(recall_date, recall_id):
+    """마지막 행의 (리콜개시일, 리콜ID) 를 URL-safe 문자열 커서로 인코딩합니다."""
+    payload = {'d': recall_date.isoformat() if recall_date else None, 'i': int(recall_id)}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+
+
+def decode_search_cursor(cursor_token):
+    """encode_search_cursor 의 역변환. 잘못된 커서면 ValueError."""
     try:
-        cursor = conn.cursor(dictionary=True)
-        stats_query = """
-        SELECT COUNT(DISTINCT r.recall_id) as total_recalls, AVG(r.correction_rate) as avg_correction_rate
-        FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
-        WHERE b.brand_name = %s AND m.model_name = %s;
-        """
-        cursor.execute(stats_query, (brand, model))
-        stats_result = cursor.fetchone()
-        
-        if isinstance(stats_result, dict):
-            total_recalls_count = 0
-            value = stats_result.get('total_recalls')
-            if isinstance(value, (int, float, decimal.Decimal, str)):
-                try:
-                    total_recalls_count = int(float(value)) 
-                except (ValueError, TypeError):
-                    total_recalls_count = 0
-            
-            if total_recalls_count > 0:
-                final_avg_rate = 0
-                avg_rate = stats_result.get('avg_correction_rate') 
-                if isinstance(avg_rate, (decimal.Decimal, float, int)):
-                    final_avg_rate = round(float(avg_rate), 2)
-                
-                stats = {'total_recalls': total_recalls_count, 'avg_correction_rate': final_avg_rate}
-
-        keywords_query = """
-        SELECT k.keyword_text, k.keyword_desc, COUNT(k.keyword_text) as keyword_count
-        FROM Recall r
-        JOIN Model m ON r.model_id = m.model_id
-        JOIN Brand b ON m.brand_id = b.brand_id
-        JOIN Recall_Keyword_Junction rkj ON r.recall_id = rkj.recall_id
-        JOIN Keyword k ON rkj.keyword_id = k.keyword_id
-        WHERE b.brand_name = %s AND m.model_name = %s
-        GROUP BY k.keyword_text, k.keyword_desc ORDER BY keyword_count DESC LIMIT 10;
-        """
-        cursor.execute(keywords_query, (brand, model))
-        keywords_list = cursor.fetchall()
-        if keywords_list:
-            keywords_df = pd.DataFrame(keywords_list)
-            
+        payload = json.loads(base64.urlsafe_b64decode(cursor_token.encode('ascii')))
+        last_date = date.fromisoformat(payload['d']) if payload['d'] else None
+        return last_date, int(payload['i'])
     except Exception as e:
-        print(f"백엔드 쿼리 오류 (get_recall_comparison): {e}")
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected(): conn.close()
+        raise ValueError(f"잘못된 검색 커서입니다: {cursor_token}") from e
+
+
+def _seek_clause(cursor_token):
+    """(recall_date DESC, recall_id DESC) 정렬에서 커서 다음 행부터 읽는 조건. (NULL 날짜는 맨 뒤)"""
+    last_date, last_id = decode_search_cursor(cursor_token)
+    if last_date is None:
+        return "(r.recall_date IS NULL AND r.recall_id < %s)", [last_id]
+    clause = ("(r.recall_date < %s OR (r.recall_date = %s AND r.recall_id < %s)"
+              " OR r.recall_date IS NULL)")
+    return clause, [last_date, last_date, last_id]
+
+
+def search_recalls_page(brand, model, year, keyword, cursor_token=None, page_size=SEARCH_PAGE_SIZE,
+                        with_total=False, keyword_expr=None, reason_query=None):
+    """
+    상세 검색 결과를 한 페이지씩 반환합니다. (OFFSET 없이 (리콜개시일, 리콜ID) 기준으로 이어 읽기)
+    반환값: (결과 DataFrame, 다음 페이지 커서 또는 None, 전체 건수 또는 None)
+    - cursor_token: 이전 호출이 돌려준 다음 페이지 커서 (첫 페이지는 None)
+    - with_total=True 이면 같은 조건의 전체 건수도 COUNT 로 함께 조회합니다.
+    - keyword_expr: AND/OR/NOT 키워드 식 (search_recalls 참고)
+    - reason_query: 리콜 사유 자유 텍스트 검색어 (build_fulltext_query 참고, 정렬은 최신순 그대로)
+    """
+    # 자유 텍스트 검색은 DB 의 FULLTEXT 인덱스를 사용하므로 스냅샷을 거치지 않음
+    snap = snapshot.get_snapshot() if not reason_query else None
+    if snap is not None:
+        try:
+            after = decode_search_cursor(cursor_token) if cursor_token else None
+            df, last_key, total_count = snap.search_recalls_page(brand, model, year, keyword, after, page_size,
+                                                                 with_total, keyword_expr)
+        except ValueError as e:
+            print(f"search_recalls_page 검색 조건 오류: {e}")
+            return pd.DataFrame(), None, None
+        next_cursor = encode_search_cursor(*last_key) if last_key else None
+        return df, next_cursor, total_count
+
+    with db_manager.get_connection() as conn:
+        if conn is None: return pd.DataFrame(), None, None
+        cursor = None
+        try:
+            where_clauses, params = build_search_filters(brand, model, year, keyword, keyword_expr, reason_query)
+            cursor = conn.cursor(dictionary=True)
+
+            total_count = None
+            if with_total:
+                # [수정] 조건과 관계없이 항상 JOIN: 결과 쿼리(SEARCH_SELECT)처럼 차종/브랜드가 없는 리콜은 세지 않음
+                count_query = """SELECT COUNT(*) AS total FROM Recall AS r
+                    JOIN Model AS m ON r.model_id = m.model_id
+                    JOIN Brand AS b ON m.brand_id = b.brand_id"""
+                if where_clauses:
+                    count_query += " WHERE " + " AND ".join(where_clauses)
+                cursor.execute(count_query, tuple(params))
+                total_count = int(cursor.fetchone()['total'])
+
+            if cursor_token:
+                seek_clause, seek_params = _seek_clause(cursor_token)
+                where_clauses = where_clauses + [seek_clause]
+                params = params + seek_params
+
+            query = SEARCH_SELECT
+            if where_clauses:
+                query += " WHERE " + " AND ".join(where_clauses)
+            query += " ORDER BY r.recall_date DESC, r.recall_id DESC LIMIT %s;"
+
+            # 한 행 더 읽어서 다음 페이지가 있는지 확인
+            cursor.execute(query, tuple(params) + (page_size + 1,))
+            rows = cursor.fetchall()
+
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                last_row = rows[-1]
+                next_cursor = encode_search_cursor(last_row['리콜개시일'], last_row['리콜ID'])
+
+            return pd.DataFrame(rows), next_cursor, total_count
+        except ValueError as e:
+            print(f"search_recalls_page 검색 조건 오류: {e}")
+            return pd.DataFrame(), None, None
+        except Exception as e:
+            print(f"백엔드 쿼리 오류 (search_recalls_page): {e}")
+            db_manager.note_query_error()
+            return pd.DataFrame(), None, None
+        finally:
+            if cursor: cursor.close()
+# --- [신규 끝] ---
+
+# --- [신규] 리콜 사유 자유 텍스트 검색 (FULLTEXT ngram 인덱스, sql/migrations/V002) ---
+FULLTEXT_MIN_TERM_LENGTH = 2  # ngram_token_size (기본 2). 이보다 짧은 검색어는 인덱스로 찾을 수 없음
+FULLTEXT_SPECIAL_CHARS = '+-<>()~*@"'
+REASON_MATCH_CLAUSE = "MATCH(r.reason) AGAINST (%s IN BOOLEAN MODE)"
+
+
+def build_fulltext_query(text):
+    """
+    사용자가 입력한 검색어를 BOOLEAN MODE 검색식으로 변환합니다.
+    - 띄어쓰기로 구분한 단어는 모두 포함(AND):      브레이크 누유   -> +"브레이크" +"누유"
+    - 큰따옴표로 묶으면 구절(연속된 문자열) 검색:  "연료 펌프"     -> +"연료 펌프"
+    - 앞에 '-' 를 붙이면 제외:                     화재 -배터리    -> +"화재" -"배터리"
+    검색할 단어가 없거나 모두 한 글자이면 ValueError.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', text or ''):
+        negate = not phrase and word.startswith('-')
+        term = phrase if phrase else word.lstrip('-')
+        term = " ".join(''.join(ch for ch in term if ch not in FULLTEXT_SPECIAL_CHARS).split())
+        if len(term.replace(' ', '')) < FULLTEXT_MIN_TERM_LENGTH:
+            continue
+        terms.append(f'{"-" if negate else "+"}"{term}"')
+    if not any(term.startswith('+') for term in terms):
+        raise ValueError(f"검색어는 {FULLTEXT_MIN_TERM_LENGTH}글자 이상 입력하세요: {text}")
+    return " ".join(terms)
+
+
+def search_recalls_ranked(reason_query, brand="전체", model="전체", year="전체", keyword="전체",
+                          keyword_expr=None, limit=200):
+    """
+    리콜 사유 검색 결과를 FULLTEXT 관련도 순(같으면 최신순)으로 최대 limit 건 반환합니다.
+    반환값: (결과 DataFrame, 오류 메시지 또는 None)
+    """
+    with db_manager.get_connection() as conn:
+        if conn is None: return pd.DataFrame(), "데이터베이스에 연결할 수 없습니다."
+        cursor = None
+        try:
+            where_clauses, params = build_search_filters(brand, model, year, keyword, keyword_expr, reason_query)
+            query = SEARCH_SELECT + " WHERE " + " AND ".join(where_clauses)
+            query += f" ORDER BY {REASON_MATCH_CLAUSE} DESC, r.recall_date DESC, r.recall_id DESC LIMIT %s;"
+
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, tuple(params) + (build_fulltext_query(reason_query), limit))
+            return pd.DataFrame(cursor.fetchall()), None
+        except ValueError as e:
+            return pd.DataFrame(), str(e)
+        except Exception as e:
+            print(f"백엔드 쿼리 오류 (search_recalls_ranked): {e}")
+            db_manager.note_query_error()
+            return pd.DataFrame(), "검색 중 오류가 발생했습니다."
+        finally:
+            if cursor: cursor.close()
+# --- [신규 끝] ---
+
+
+# --- [신규] 집계 큐브(Recall_Cube) 조회 쿼리: 리콜 행 대신 (차종, 연도, 키워드) 그룹만 읽음 ---
+CUBE_COMPARISON_STATS_QUERY = """
+SELECT SUM(c.recall_count) AS total_recalls,
+       SUM(c.rate_sum) / NULLIF(SUM(c.rate_count), 0) AS avg_correction_rate
+FROM Recall_Cube c
+JOIN Model m ON c.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+WHERE b.brand_name = %s AND m.model_name = %s AND c.brand_id = b.brand_id AND c.keyword_id = 0;
+"""
+
+CUBE_COMPARISON_KEYWORDS_QUERY = """
+SELECT k.keyword_text, k.keyword_desc, SUM(c.recall_count) AS keyword_count
+FROM Recall_Cube c
+JOIN Model m ON c.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+JOIN Keyword k ON c.keyword_id = k.keyword_id
+WHERE b.brand_name = %s AND m.model_name = %s AND c.brand_id = b.brand_id AND c.keyword_id <> 0
+GROUP BY k.keyword_text, k.keyword_desc ORDER BY keyword_count DESC, k.keyword_text LIMIT 10;
+"""
+
+# [수정] 건수가 같으면 키워드 이름순 (스냅샷 RecallSnapshot.get_recall_comparison 과 같은 순서)
+LIVE_COMPARISON_KEYWORDS_QUERY = """
+SELECT k.keyword_text, k.keyword_desc, COUNT(k.keyword_text) as keyword_count
+FROM Recall r
+JOIN Model m ON r.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+JOIN Recall_Keyword_Junction rkj ON r.recall_id = rkj.recall_id
+JOIN Keyword k ON rkj.keyword_id = k.keyword_id
+WHERE b.brand_name = %s AND m.model_name = %s
+GROUP BY k.keyword_text, k.keyword_desc ORDER BY keyword_count DESC, k.keyword_text LIMIT 10;
+"""
+
+
+@cache.cached() # [수정] 모델 프로필의 첫 조회 → 워밍업(backend/warmup.py)으로 미리 채울 수 있도록 캐시
+def get_recall_comparison(brand, model, live=False):
+    """
+    차종 하나의 리콜 통계(총 건수, 평균 시정률)와 주요 키워드 Top 10 을 반환합니다.
+    기본은 로더가 만들어 둔 Recall_Cube 를 읽고, live=True 이거나 큐브에 해당 차종이 없으면 원본 테이블을 집계합니다.
+    """
+    if not brand or not model or brand == "전체" or model == "전체":
+        return None, pd.DataFrame() 
+    snap = snapshot.get_snapshot()
+    if snap is not None:
+        return snap.get_recall_comparison(brand, model)
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return None, pd.DataFrame()
+
+        stats = {'total_recalls': 0, 'avg_correction_rate': 0}
+        keywords_df = pd.DataFrame()
+        cursor = None
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+            from_cube = False
+            stats_result = None
+            if not live:
+                cursor.execute(CUBE_COMPARISON_STATS_QUERY, (brand, model))
+                stats_result = cursor.fetchone()
+                from_cube = isinstance(stats_result, dict) and stats_result.get('total_recalls') is not None
+
+            if not from_cube:
+                stats_query = """
+                SELECT COUNT(DISTINCT r.recall_id) as total_recalls, AVG(r.correction_rate) as avg_correction_rate
+                FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+                WHERE b.brand_name = %s AND m.model_name = %s;
+                """
+                cursor.execute(stats_query, (brand, model))
+                stats_result = cursor.fetchone()
+
+            if isinstance(stats_result, dict):
+                total_recalls_count = 0
+                value = stats_result.get('total_recalls')
+                if isinstance(value, (int, float, decimal.Decimal, str)):
+                    try:
+                        total_recalls_count = int(float(value)) 
+                    except (ValueError, TypeError):
+                        total_recalls_count = 0
+
+                if total_recalls_count > 0:
+                    final_avg_rate = 0
+                    avg_rate = stats_result.get('avg_correction_rate') 
+                    if isinstance(avg_rate, (decimal.Decimal, float, int)):
+                        final_avg_rate = round(float(avg_rate), 2)
+
+                    stats = {'total_recalls': total_recalls_count, 'avg_correction_rate': final_avg_rate}
+
+            keywords_query = CUBE_COMPARISON_KEYWORDS_QUERY if from_cube else LIVE_COMPARISON_KEYWORDS_QUERY
+            cursor.execute(keywords_query, (brand, model))
+            keywords_list = cursor.fetchall()
+            if keywords_list:
+                keywords_df = pd.DataFrame(keywords_list)
+                keywords_df['keyword_count'] = keywords_df['keyword_count'].astype('int64') # 큐브의 SUM 은 Decimal
+
+        except Exception as e:
+            print(f"백엔드 쿼리 오류 (get_recall_comparison): {e}")
+            db_manager.note_query_error()
+        finally:
+            if cursor: cursor.close()
+
+        return stats, keywords_df
+
+# --- [신규] 여러 차종 일괄 비교: 차종 수와 관계없이 쿼리 2번 (통계 1번 + 차종별 Top 10 키워드 1번) ---
+COMPARE_MAX_MODELS = 5
+COMPARE_TOP_KEYWORDS = 10
+
+# {pairs}: "(%s, %s), (%s, %s), ..." (브랜드, 차종) 쌍 목록
+CUBE_COMPARE_STATS_QUERY = """
+SELECT b.brand_name, m.model_name,
+       SUM(c.recall_count) AS total_recalls,
+       SUM(c.rate_sum) / NULLIF(SUM(c.rate_count), 0) AS avg_correction_rate
+FROM Recall_Cube c
+JOIN Model m ON c.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+WHERE (b.brand_name, m.model_name) IN ({pairs}) AND c.brand_id = b.brand_id AND c.keyword_id = 0
+GROUP BY b.brand_name, m.model_name;
+"""
+
+CUBE_COMPARE_KEYWORDS_QUERY = """
+SELECT brand_name, model_name, keyword_text, keyword_desc, keyword_count
+FROM (
+    SELECT b.brand_name, m.model_name, k.keyword_text, k.keyword_desc,
+           SUM(c.recall_count) AS keyword_count,
+           ROW_NUMBER() OVER (
+               PARTITION BY b.brand_name, m.model_name
+               ORDER BY SUM(c.recall_count) DESC, k.keyword_text
+           ) AS keyword_rank
+    FROM Recall_Cube c
+    JOIN Model m ON c.model_id = m.model_id
+    JOIN Brand b ON m.brand_id = b.brand_id
+    JOIN Keyword k ON c.keyword_id = k.keyword_id
+    WHERE (b.brand_name, m.model_name) IN ({pairs}) AND c.brand_id = b.brand_id AND c.keyword_id <> 0
+    GROUP BY b.brand_name, m.model_name, k.keyword_text, k.keyword_desc
+) AS ranked
+WHERE keyword_rank <= %s
+ORDER BY brand_name, model_name, keyword_rank;
+"""
+
+LIVE_COMPARE_STATS_QUERY = """
+SELECT b.brand_name, m.model_name,
+       COUNT(r.recall_id) AS total_recalls, AVG(r.correction_rate) AS avg_correction_rate
+FROM Recall r
+JOIN Model m ON r.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+WHERE (b.brand_name, m.model_name) IN ({pairs})
+GROUP BY b.brand_name, m.model_name;
+"""
+
+LIVE_COMPARE_KEYWORDS_QUERY = """
+SELECT brand_name, model_name, keyword_text, keyword_desc, keyword_count
+FROM (
+    SELECT b.brand_name, m.model_name, k.keyword_text, k.keyword_desc,
+           COUNT(*) AS keyword_count,
+           ROW_NUMBER() OVER (
+               PARTITION BY b.brand_name, m.model_name
+               ORDER BY COUNT(*) DESC, k.keyword_text
+           ) AS keyword_rank
+    FROM Recall r
+    JOIN Model m ON r.model_id = m.model_id
+    JOIN Brand b ON m.brand_id = b.brand_id
+    JOIN Recall_Keyword_Junction rkj ON r.recall_id = rkj.recall_id
+    JOIN Keyword k ON rkj.keyword_id = k.keyword_id
+    WHERE (b.brand_name, m.model_name) IN ({pairs})
+    GROUP BY b.brand_name, m.model_name, k.keyword_text, k.keyword_desc
+) AS ranked
+WHERE keyword_rank <= %s
+ORDER BY brand_name, model_name, keyword_rank;
+"""
+
+
+def _fetch_comparisons(cursor, pairs, stats_query, keywords_query):
+    """(브랜드, 차종) 쌍 목록의 통계 행과 키워드 행을 가져옵니다."""
+    placeholders = ", ".join(["(%s, %s)"] * len(pairs))
+    pair_params = tuple(value for pair in pairs for value in pair)
+    cursor.execute(stats_query.format(pairs=placeholders), pair_params)
+    stats_rows = cursor.fetchall()
+    cursor.execute(keywords_query.format(pairs=placeholders), pair_params + (COMPARE_TOP_KEYWORDS,))
+    keyword_rows = cursor.fetchall()
+    return stats_rows, keyword_rows
 
-    return stats, keywords_df
 
-@st.cache_data(ttl=3600)
+@cache.cached()
+def compare_models(models, live=False):
+    """
+    여러 차종의 리콜 통계와 주요 키워드 Top 10 을 한 번에 조회합니다.
+    - models: [(브랜드, 차종), ...]  (최대 COMPARE_MAX_MODELS 개, "전체" 가 들어간 쌍은 (None, 빈 DataFrame))
+    반환값: 입력 순서대로 [(stats, keywords_df), ...]  — 각 항목은 get_recall_comparison 의 반환값과 같은 형식
+    """
+    models = [tuple(pair) for pair in models][:COMPARE_MAX_MODELS]
+    results = {pair: (None, pd.DataFrame()) for pair in models}
+    valid_pairs = list(dict.fromkeys(
+        (brand, model) for brand, model in models
+        if brand and model and brand != "전체" and model != "전체"
+    ))
+    if not valid_pairs:
+        return [results[pair] for pair in models]
+
+    snap = snapshot.get_snapshot()
+    if snap is not None:
+        for pair in valid_pairs:
+            results[pair] = snap.get_recall_comparison(*pair)
+        return [results[pair] for pair in models]
+
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return [results[pair] for pair in models]
+        cursor = None
+        try:
+            cursor = conn.cursor(dictionary=True)
+            stats_rows, keyword_rows = [], []
+            if not live:
+                stats_rows, keyword_rows = _fetch_comparisons(
+                    cursor, valid_pairs, CUBE_COMPARE_STATS_QUERY, CUBE_COMPARE_KEYWORDS_QUERY
+                )
+            stats_by_pair = {(row['brand_name'], row['model_name']): row for row in stats_rows}
+
+            # [수정] 큐브에 없는 차종만 원본 테이블에서 집계 (get_recall_comparison 과 같이 차종 단위로 대체)
+            #        live=True 이면 전체, 큐브가 비어 있으면(적재 전) 전체, 일부 차종만 빠졌으면 그 차종만
+            missing_pairs = [pair for pair in valid_pairs if pair not in stats_by_pair]
+            if missing_pairs:
+                live_stats_rows, live_keyword_rows = _fetch_comparisons(
+                    cursor, missing_pairs, LIVE_COMPARE_STATS_QUERY, LIVE_COMPARE_KEYWORDS_QUERY
+                )
+                stats_by_pair.update(((row['brand_name'], row['model_name']), row) for row in live_stats_rows)
+                keyword_rows = list(keyword_rows) + list(live_keyword_rows)
+
+            keywords_df = pd.DataFrame(keyword_rows)
+            for pair in valid_pairs:
+                stats = {'total_recalls': 0, 'avg_correction_rate': 0}
+                row = stats_by_pair.get(pair)
+                total_recalls = safe_int_from_value(row.get('total_recalls')) if row else 0
+                if total_recalls > 0:
+                    avg_rate = row.get('avg_correction_rate')
+                    final_avg_rate = round(float(avg_rate), 2) if avg_rate is not None else 0
+                    stats = {'total_recalls': total_recalls, 'avg_correction_rate': final_avg_rate}
+
+                pair_keywords_df = pd.DataFrame()
+                if not keywords_df.empty:
+                    selected = (keywords_df['brand_name'] == pair[0]) & (keywords_df['model_name'] == pair[1])
+                    pair_keywords_df = keywords_df.loc[
+                        selected, ['keyword_text', 'keyword_desc', 'keyword_count']
+                    ].reset_index(drop=True)
+                    pair_keywords_df['keyword_count'] = pair_keywords_df['keyword_count'].astype('int64')
+                    if pair_keywords_df.empty:
+                        pair_keywords_df = pd.DataFrame()
+                results[pair] = (stats, pair_keywords_df)
+        except Exception as e:
+            print(f"백엔드 쿼리 오류 (compare_models): {e}")
+            db_manager.note_query_error()
+        finally:
+            if cursor: cursor.close()
+
+    return [results[pair] for pair in models]
+
+
+@cache.cached()
 def get_model_profile_data(brand, model):
     if not brand or not model or brand == "전체" or model == "전체":
         return pd.DataFrame(), "" 
-    conn = db_manager.create_connection()
-    if conn is None:
-        return pd.DataFrame(), ""
-    history_df = pd.DataFrame()
-    all_reasons_string = ""
-    cursor = None 
-    try:
-        query = """
-        SELECT 
-            r.recall_date AS '리콜개시일', r.reason AS '리콜사유',
-            r.recall_count AS '리콜대수', r.correction_rate AS '시정률(%)'
-        FROM Recall r
-        JOIN Model m ON r.model_id = m.model_id
-        JOIN Brand b ON m.brand_id = b.brand_id
-        WHERE b.brand_name = %s AND m.model_name = %s
-        ORDER BY r.recall_date DESC;
-        """
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query, (brand, model))
-        rows = cursor.fetchall()
-        
-        if rows:
-            history_df = pd.DataFrame(rows)
-            
-            reason_list = []
-            for row in rows:
-                if isinstance(row, dict):
-                    reason = row.get('리콜사유')
-                    if isinstance(reason, str): 
-                        reason_list.append(reason)
-            
-            all_reasons_string = " ".join(reason_list)
-            
-    except Exception as e:
-        print(f"get_model_profile_data 오류: {e}")
-    finally:
-        if cursor: cursor.close() 
-        if conn and conn.is_connected(): conn.close()
-    return history_df, all_reasons_string
+    snap = snapshot.get_snapshot()
+    if snap is not None:
+        return snap.get_model_profile_data(brand, model)
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return pd.DataFrame(), ""
+        history_df = pd.DataFrame()
+        all_reasons_string = ""
+        cursor = None 
+        try:
+            query = """
+            SELECT 
+                r.recall_date AS '리콜개시일', r.reason AS '리콜사유',
+                r.recall_count AS '리콜대수', r.correction_rate AS '시정률(%)'
+            FROM Recall r
+            JOIN Model m ON r.model_id = m.model_id
+            JOIN Brand b ON m.brand_id = b.brand_id
+            WHERE b.brand_name = %s AND m.model_name = %s
+            ORDER BY r.recall_date DESC;
+            """
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, (brand, model))
+            rows = cursor.fetchall()
+
+            if rows:
+                history_df = pd.DataFrame(rows)
+
+                reason_list = []
+                for row in rows:
+                    if isinstance(row, dict):
+                        reason = row.get('리콜사유')
+                        if isinstance(reason, str): 
+                            reason_list.append(reason)
+
+                all_reasons_string = " ".join(reason_list)
+
+        except Exception as e:
+            print(f"get_model_profile_data 오류: {e}")
+            db_manager.note_query_error()
+        finally:
+            if cursor: cursor.close() 
+        return history_df, all_reasons_string
+
+# --- [신규] 모델 프로필 상세 리콜 이력 (서버 측 연도/키워드 필터 + 페이지) ---
+MODEL_HISTORY_PAGE_SIZE = 100
+MODEL_HISTORY_COLUMNS = ['리콜개시일', '리콜사유', '리콜대수', '시정률(%)']
+
+MODEL_HISTORY_SELECT = """
+SELECT r.recall_date AS '리콜개시일', r.reason AS '리콜사유',
+       r.recall_count AS '리콜대수', r.correction_rate AS '시정률(%)'
+FROM Recall r
+"""
+
+
+def _typed_history_df(rows):
+    """
+    이력 행 목록을 DataFrame 으로 만들고 리콜개시일을 datetime64 로 한 번만 변환합니다.
+    [수정] 컬럼 dtype 을 스냅샷 경로와 같게 고정 (snapshot.HISTORY_DTYPES)
+      - to_datetime 의 단위(s/ns)는 pandas 버전마다 다르고, NULL 이 섞인 정수 컬럼은 페이지마다 int/float/object 로 달라짐
+    """
+    history_df = pd.DataFrame(rows, columns=MODEL_HISTORY_COLUMNS)
+    history_df['리콜개시일'] = pd.to_datetime(history_df['리콜개시일'])
+    return history_df.astype(snapshot.HISTORY_DTYPES)
+
+
+@cache.cached()
+def get_model_history(brand, model, year=None, keyword=None, page=1, page_size=MODEL_HISTORY_PAGE_SIZE):
+    """
+    차종 하나의 리콜 이력을 최신순으로 한 페이지 반환합니다. 반환값: (이력 DataFrame, 조건에 맞는 전체 건수)
+    - year: 리콜 연도 (None 또는 "전체" 는 조건 없음) → 리콜개시일 범위 조건 (idx_recall_model_date)
+    - keyword: 키워드 (None 또는 "전체" 는 조건 없음) → Recall_Keyword_Junction 조회
+    - page: 1부터 시작하는 페이지 번호
+    리콜개시일 컬럼은 datetime64 로 변환된 상태로 반환되므로 화면에서 다시 파싱할 필요가 없습니다.
+    """
+    empty = (_typed_history_df([]), 0)
+    model_id = get_model_id(brand, model)
+    if model_id is None:
+        return empty
+    page = max(1, int(page))
+    snap = snapshot.get_snapshot()
+    if snap is not None:
+        return snap.get_model_history(brand, model, year, keyword, page, page_size)
+
+    where_clauses, params = ["r.model_id = %s"], [model_id]
+    if year and year != "전체":
+        where_clauses.append("r.recall_date >= %s AND r.recall_date < %s")
+        params.extend([date(int(year), 1, 1), date(int(year) + 1, 1, 1)])
+    if keyword and keyword != "전체":
+        where_clauses.append(KEYWORD_EXISTS_CLAUSE)
+        params.append(keyword)
+    where_sql = " WHERE " + " AND ".join(where_clauses)
+
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return empty
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM Recall r" + where_sql, tuple(params))
+            total_count = int(cursor.fetchone()[0])
+            if total_count == 0:
+                return empty
+            query = (MODEL_HISTORY_SELECT + where_sql
+                     + " ORDER BY r.recall_date DESC, r.recall_id DESC LIMIT %s OFFSET %s;")
+            cursor.execute(query, tuple(params) + (page_size, (page - 1) * page_size))
+            return _typed_history_df(cursor.fetchall()), total_count
+        except Exception as e:
+            print(f"get_model_history 오류: {e}")
+            db_manager.note_query_error()
+            return empty
+        finally:
+            if cursor: cursor.close()
+
 
 # --- [★ 신규 함수] ---
-@st.cache_data(ttl=600) # 10분간 캐시
+@cache.cached()
 def get_keywords_for_recall(recall_id):
     """특정 recall_id에 연결된 모든 키워드를 조회합니다."""
     
-    conn = db_manager.create_connection()
-    if conn is None:
-        return []
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return []
 
-    keywords = []
-    cursor = None
-    try:
-        query = """
-        SELECT k.keyword_text 
-        FROM Recall_Keyword_Junction j
-        JOIN Keyword k ON j.keyword_id = k.keyword_id
-        WHERE j.recall_id = %s;
-        """
-        cursor = conn.cursor()
-        cursor.execute(query, (recall_id,))
-        rows = cursor.fetchall()
-        
-        if rows:
-            keywords = [row[0] for row in rows] # (('엔진',), ('화재',)) -> ['엔진', '화재']
+        keywords = []
+        cursor = None
+        try:
+            query = """
+            SELECT k.keyword_text 
+            FROM Recall_Keyword_Junction j
+            JOIN Keyword k ON j.keyword_id = k.keyword_id
+            WHERE j.recall_id = %s;
+            """
+            cursor = conn.cursor()
+            cursor.execute(query, (recall_id,))
+            rows = cursor.fetchall()
 
-    except Exception as e:
-        print(f"get_keywords_for_recall 오류: {e}")
-    finally:
-        if cursor: cursor.close()
-        if conn and conn.is_connected(): conn.close()
-    
-    return keywords
+            if rows:
+                keywords = [row[0] for row in rows] # (('엔진',), ('화재',)) -> ['엔진', '화재']
+
+        except Exception as e:
+            print(f"get_keywords_for_recall 오류: {e}")
+            db_manager.note_query_error()
+        finally:
+            if cursor: cursor.close()
+
+        return keywords
 # --- [신규 함수 끝] ---
\ No newline at end of file
@@ -0,0 +1,344 @@
+# 파일 이름: backend/snapshot.py
+# [신규] 인메모리 컬럼형 리콜 스냅샷 엔진 (선택 기능)
+#
+# 전체 데이터가 약 1만 건이므로 Recall/Model/Brand/Keyword/Junction 을 한 번에 읽어
+# NumPy 배열(정수 코드, datetime64 날짜, 키워드 비트셋)로 들고 있다가
+# search_recalls / get_recall_comparison / get_model_profile_data / get_brand_rankings 를
+# DB 왕복 없이 벡터 마스크로 처리합니다. 반환 형식은 SQL 경로와 같습니다.
+#
+# 켜는 방법: .streamlit/secrets.toml 에
+#   [app]
+#   use_snapshot = true
+# Recall_Summary.data_version 이 바뀌면(로더 재실행) 다음 조회 때 자동으로 다시 읽습니다.
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from . import cache
+from . import db_manager
+from . import materialized
+from .keyword_index import KeywordBitsetIndex
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+# [신규] 모델 이력 컬럼 dtype (search_queries.get_model_history 의 SQL 경로도 같은 dtype 으로 변환)
+#   리콜대수는 NULL 이 섞이거나 모두 NULL 인 페이지도 같은 dtype 이 되도록 nullable Int64
+HISTORY_DTYPES = {'리콜개시일': 'datetime64[ns]', '리콜대수': 'Int64', '시정률(%)': 'float64'}
+
+
+def is_enabled():
+    """secrets.toml 의 [app] use_snapshot 설정을 읽습니다. (기본값: 꺼짐)"""
+    try:
+        return bool(st.secrets.get('app', {}).get('use_snapshot', False))
+    except Exception:
+        return False
+
+
+def _to_int_or_none(value):
+    return None if value is None or (isinstance(value, float) and np.isnan(value)) else int(value)
+
+
+def _to_float_or_none(value):
+    return None if value is None or np.isnan(value) else float(value)
+
+
+class RecallSnapshot:
+    """리콜 데이터 한 벌을 컬럼형 배열로 보관하고, 조회 함수들을 메모리에서 처리합니다."""
+
+    def __init__(self, brand_rows, model_rows, keyword_rows, recall_rows, junction_rows, data_version):
+        self.data_version = data_version
+
+        # --- 브랜드 / 차종 (정수 코드) ---
+        self.brand_names = [name for _, name in brand_rows]
+        brand_code_by_id = {brand_id: code for code, (brand_id, _) in enumerate(brand_rows)}
+        self.brand_code_by_name = {name: code for code, name in enumerate(self.brand_names)}
+
+        # [수정] SQL 경로는 Model/Brand 와 JOIN 하므로, 브랜드/차종이 없는(NULL·고아) 행은 스냅샷에서도 제외
+        model_rows = [row for row in model_rows if row[1] in brand_code_by_id]
+        model_ids = {row[0] for row in model_rows}
+        skipped = len(recall_rows)
+        recall_rows = [row for row in recall_rows if row[1] in model_ids]
+        skipped -= len(recall_rows)
+        if skipped:
+            print(f"[스냅샷] 차종 정보가 없는 리콜 {skipped}건은 제외합니다.")
+
+        self.model_names = [name for _, _, name in model_rows]
+        self.model_brand_code = np.array([brand_code_by_id[b_id] for _, b_id, _ in model_rows], dtype=np.int32)
+        model_code_by_id = {model_id: code for code, (model_id, _, _) in enumerate(model_rows)}
+        self.model_code_by_key = {
+            (self.brand_names[self.model_brand_code[code]], name): code
+            for code, name in enumerate(self.model_names)
+        }
+
+        # --- 키워드 (비트 위치) ---
+        self.keyword_texts = [text for _, text, _ in keyword_rows]
+        self.keyword_descs = [desc for _, _, desc in keyword_rows]
+
+        # --- 리콜 (컬럼형 배열) ---
+        self.recall_id = np.array([row[0] for row in recall_rows], dtype=np.int32)
+        self.model_code = np.array([model_code_by_id[row[1]] for row in recall_rows], dtype=np.int32)
+        self.brand_code = self.model_brand_code[self.model_code]
+        self.recall_date = np.array([row[2] for row in recall_rows], dtype='datetime64[D]')
+        self.prod_from = np.array([row[3] for row in recall_rows], dtype='datetime64[D]')
+        self.prod_to = np.array([row[4] for row in recall_rows], dtype='datetime64[D]')
+        self.reason = np.array([row[5] for row in recall_rows], dtype=object)
+        self.recall_count = np.array([np.nan if row[6] is None else row[6] for row in recall_rows], dtype=float)
+        self.correction_count = np.array([np.nan if row[7] is None else row[7] for row in recall_rows], dtype=float)
+        self.correction_rate = np.array([np.nan if row[8] is None else row[8] for row in recall_rows], dtype=float)
+        self.recall_year = np.where(
+            np.isnat(self.recall_date), -1,
+            self.recall_date.astype('datetime64[Y]').astype(np.int64) + 1970
+        )
+
+        # 최신순 정렬 (recall_date DESC, recall_id DESC, NULL 날짜는 맨 뒤) 을 미리 계산
+        is_null_date = np.isnat(self.recall_date)
+        date_key = np.where(is_null_date, 0, self.recall_date.astype(np.int64))
+        self.latest_order = np.lexsort((-self.recall_id.astype(np.int64), -date_key, is_null_date))
+
+        # --- 리콜별 키워드 비트셋 (행 순서 = recall_id 오름차순 = 위 배열들과 같은 순서) ---
+        self.keyword_index = KeywordBitsetIndex(self.recall_id, keyword_rows, junction_rows, data_version)
+        self.keyword_masks = [self.keyword_index.keyword_mask(text) for text in self.keyword_texts]
+        keyword_lists = [[] for _ in range(len(recall_rows))]
+        for bit in sorted(range(len(self.keyword_texts)), key=lambda bit: self.keyword_texts[bit]):
+            for row in np.flatnonzero(self.keyword_masks[bit]):
+                keyword_lists[row].append(self.keyword_texts[bit])
+        # 검색 결과의 '키워드' 컬럼 (GROUP_CONCAT ... ORDER BY keyword_text SEPARATOR ', ' 와 동일)
+        self.keyword_string = np.array(
+            [', '.join(texts) if texts else None for texts in keyword_lists], dtype=object
+        )
+
+    # --- 로딩 ---
+    @classmethod
+    def from_connection(cls, conn):
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT brand_id, brand_name FROM Brand ORDER BY brand_id")
+            brand_rows = cursor.fetchall()
+            cursor.execute("SELECT model_id, brand_id, model_name FROM Model ORDER BY model_id")
+            model_rows = cursor.fetchall()
+            cursor.execute("SELECT keyword_id, keyword_text, keyword_desc FROM Keyword ORDER BY keyword_id")
+            keyword_rows = cursor.fetchall()
+            cursor.execute("""
+            SELECT recall_id, model_id, recall_date, prod_from, prod_to, reason,
+                   recall_count, correction_count, correction_rate
+            FROM Recall ORDER BY recall_id
+            """)
+            recall_rows = cursor.fetchall()
+            cursor.execute("SELECT recall_id, keyword_id FROM Recall_Keyword_Junction")
+            junction_rows = cursor.fetchall()
+            data_version = materialized.fetch_data_version(cursor)
+        finally:
+            cursor.close()
+        return cls(brand_rows, model_rows, keyword_rows, recall_rows, junction_rows, data_version)
+
+    # --- 공통 마스크 ---
+    def _model_mask(self, brand, model):
+        code = self.model_code_by_key.get((brand, model))
+        if code is None:
+            return np.zeros(len(self.recall_id), dtype=bool)
+        return self.model_code == code
+
+    def filter_mask(self, brand, model, year, keyword, keyword_expr=None):
+        """search_recalls 와 같은 조건("전체" 는 조건 없음)의 불리언 마스크. 잘못된 키워드 식이면 ValueError."""
+        mask = np.ones(len(self.recall_id), dtype=bool)
+        if brand and brand != "전체":
+            code = self.brand_code_by_name.get(brand)
+            mask &= (self.brand_code == code) if code is not None else False
+        if model and model != "전체":
+            model_codes = [c for (b, m), c in self.model_code_by_key.items() if m == model]
+            mask &= np.isin(self.model_code, model_codes)
+        if year and year != "전체":
+            mask &= self.recall_year == int(year)
+        if keyword and keyword != "전체":
+            mask &= self.keyword_index.keyword_mask(keyword)
+        if keyword_expr:
+            mask &= self.keyword_index.evaluate(keyword_expr)
+        return mask
+
+    def _latest_rows(self, mask, limit=None):
+        """마스크에 해당하는 행 번호를 최신순으로 반환합니다."""
+        rows = self.latest_order[mask[self.latest_order]]
+        return rows if limit is None else rows[:limit]
+
+    # --- 조회 함수 (SQL 경로와 같은 반환 형식) ---
+    def search_recalls(self, brand, model, year, keyword, keyword_expr=None, limit=200):
+        rows = self._latest_rows(self.filter_mask(brand, model, year, keyword, keyword_expr), limit)
+        if len(rows) == 0:
+            return pd.DataFrame()
+        return self.search_records(rows)
+
+    def search_recalls_page(self, brand, model, year, keyword, after=None, page_size=50, with_total=False,
+                            keyword_expr=None):
+        """
+        search_queries.search_recalls_page 의 메모리 버전.
+        after: 디코딩된 커서 (마지막 리콜개시일, 마지막 리콜ID) 또는 None
+        반환값: (결과 DataFrame, 다음 페이지가 있으면 마지막 행의 (리콜개시일, 리콜ID), 전체 건수 또는 None)
+        """
+        mask = self.filter_mask(brand, model, year, keyword, keyword_expr)
+        total_count = int(mask.sum()) if with_total else None
+        if after is not None:
+            last_date, last_id = after
+            is_null = np.isnat(self.recall_date)
+            if last_date is None:
+                mask &= is_null & (self.recall_id < last_id)
+            else:
+                last_day = np.datetime64(last_date, 'D')
+                mask &= ((self.recall_date < last_day)
+                         | ((self.recall_date == last_day) & (self.recall_id < last_id))
+                         | is_null)
+        rows = self._latest_rows(mask, page_size + 1)
+
+        last_key = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last_row = rows[-1]
+            last_date = None if np.isnat(self.recall_date[last_row]) else self.recall_date[last_row].astype(object)
+            last_key = (last_date, int(self.recall_id[last_row]))
+        if len(rows) == 0:
+            return pd.DataFrame(), None, total_count
+        return self.search_records(rows), last_key, total_count
+
+    def search_records(self, rows):
+        """행 번호 목록을 상세 검색 결과 DataFrame 으로 만듭니다."""
+        brand_names = self.brand_names
+        model_names = self.model_names
+        recall_dates = self.recall_date[rows].astype(object)
+        prod_froms = self.prod_from[rows].astype(object)
+        prod_tos = self.prod_to[rows].astype(object)
+        records = []
+        for i, row in enumerate(rows):
+            records.append({
+                '리콜ID': int(self.recall_id[row]),
+                '브랜드': brand_names[self.brand_code[row]],
+                '차종': model_names[self.model_code[row]],
+                '리콜개시일': recall_dates[i],
+                '생산시작': prod_froms[i],
+                '생산종료': prod_tos[i],
+                '리콜사유': self.reason[row],
+                '리콜대수': _to_int_or_none(self.recall_count[row]),
+                '시정대수': _to_int_or_none(self.correction_count[row]),
+                '시정률(%)': _to_float_or_none(self.correction_rate[row]),
+                '키워드': self.keyword_string[row],
+            })
+        return pd.DataFrame(records)
+
+    def get_recall_comparison(self, brand, model):
+        stats = {'total_recalls': 0, 'avg_correction_rate': 0}
+        mask = self._model_mask(brand, model)
+        total_recalls = int(mask.sum())
+        if total_recalls > 0:
+            rates = self.correction_rate[mask]
+            rates = rates[~np.isnan(rates)]
+            avg_rate = round(float(rates.mean()), 2) if len(rates) else 0
+            stats = {'total_recalls': total_recalls, 'avg_correction_rate': avg_rate}
+
+        keyword_counts = self.keyword_counts(mask)
+        order = sorted((bit for bit in range(len(self.keyword_texts)) if keyword_counts[bit] > 0),
+                       key=lambda bit: (-keyword_counts[bit], self.keyword_texts[bit]))[:10]
+        if not order:
+            return stats, pd.DataFrame()
+        keywords_df = pd.DataFrame([
+            {'keyword_text': self.keyword_texts[bit], 'keyword_desc': self.keyword_descs[bit],
+             'keyword_count': int(keyword_counts[bit])}
+            for bit in order
+        ])
+        return stats, keywords_df
+
+    def keyword_counts(self, mask):
+        """마스크에 해당하는 리콜들의 키워드별 건수 (키워드 비트 순서의 배열)"""
+        return np.array([int((keyword_mask & mask).sum()) for keyword_mask in self.keyword_masks],
+                        dtype=np.int64)
+
+    def get_model_profile_data(self, brand, model):
+        rows = self._latest_rows(self._model_mask(brand, model))
+        if len(rows) == 0:
+            return pd.DataFrame(), ""
+        recall_dates = self.recall_date[rows].astype(object)
+        history_df = pd.DataFrame([
+            {
+                '리콜개시일': recall_dates[i],
+                '리콜사유': self.reason[row],
+                '리콜대수': _to_int_or_none(self.recall_count[row]),
+                '시정률(%)': _to_float_or_none(self.correction_rate[row]),
+            }
+            for i, row in enumerate(rows)
+        ])
+        reason_list = [reason for reason in self.reason[rows] if isinstance(reason, str)]
+        return history_df, " ".join(reason_list)
+
+    def get_model_history(self, brand, model, year=None, keyword=None, page=1, page_size=100):
+        mask = self._model_mask(brand, model)
+        if year and year != "전체":
+            mask &= self.recall_year == int(year)
+        if keyword and keyword != "전체":
+            mask &= self.keyword_index.keyword_mask(keyword)
+        all_rows = self._latest_rows(mask)
+        rows = all_rows[(page - 1) * page_size:page * page_size]
+        history_df = pd.DataFrame({
+            '리콜개시일': pd.to_datetime(self.recall_date[rows]),
+            '리콜사유': self.reason[rows],
+            '리콜대수': self.recall_count[rows],
+            '시정률(%)': self.correction_rate[rows],
+        }).astype(HISTORY_DTYPES) # [수정] SQL 경로와 같은 dtype (리콜개시일 ns 단위)
+        return history_df, len(all_rows)
+
+    def get_brand_rankings(self):
+        n_brands = len(self.brand_names)
+        recall_counts = np.bincount(self.brand_code, minlength=n_brands)
+        has_rate = ~np.isnan(self.correction_rate)
+        rate_sums = np.bincount(self.brand_code[has_rate], weights=self.correction_rate[has_rate],
+                                minlength=n_brands)
+        rate_counts = np.bincount(self.brand_code[has_rate], minlength=n_brands)
+
+        brands = np.flatnonzero(recall_counts > 0)
+        df_recall_count = pd.DataFrame({
+            '브랜드': [self.brand_names[code] for code in brands],
+            '총 리콜 건수': recall_counts[brands].astype(np.int64),
+        }).sort_values('총 리콜 건수', ascending=False, kind='stable', ignore_index=True)
+        df_recall_count.index = df_recall_count.index + 1
+
+        rated = brands[recall_counts[brands] >= 5]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_rates = rate_sums[rated] / rate_counts[rated]
+        df_correction_rate = pd.DataFrame({
+            '브랜드': [self.brand_names[code] for code in rated],
+            '평균 시정률 (%)': avg_rates,
+            '리콜 건수': recall_counts[rated].astype(np.int64),
+        }).sort_values('평균 시정률 (%)', ascending=False, kind='stable', ignore_index=True)
+        df_correction_rate.index = df_correction_rate.index + 1
+        df_correction_rate['평균 시정률 (%)'] = df_correction_rate['평균 시정률 (%)'].round(2)
+        return df_recall_count, df_correction_rate
+
+
+def get_snapshot():
+    """
+    현재 스냅샷을 반환합니다. (처음 호출 시 로딩, data_version 이 바뀌면 다시 로딩)
+    스냅샷 기능이 꺼져 있거나 로딩에 실패하면 None → 호출부는 SQL 경로를 사용합니다.
+    """
+    global _snapshot
+    if not is_enabled():
+        return None
+
+    version = cache.get_data_version()
+    if _snapshot is not None and (version is None or version == _snapshot.data_version):
+        return _snapshot
+
+    with _snapshot_lock:
+        if _snapshot is not None and (version is None or version == _snapshot.data_version):
+            return _snapshot
+        try:
+            start = time.perf_counter()
+            with db_manager.get_connection() as conn:
+                if conn is None:
+                    return _snapshot
+                _snapshot = RecallSnapshot.from_connection(conn)
+            print(f"[스냅샷] 리콜 {len(_snapshot.recall_id)}건 로딩 완료 "
+                  f"(data_version={_snapshot.data_version}, {time.perf_counter() - start:.2f}초)")
+        except Exception as e:
+            print(f"[스냅샷] 로딩 오류: {e}")
+            db_manager.note_query_error()
+    return _snapshot
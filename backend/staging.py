@@ -0,0 +1,94 @@
+# 파일 이름: backend/staging.py
+# [신규] 정제된 리콜 데이터의 Parquet 스테이징 캐시
+# (sql/load_data_from_excel.py 에서도 임포트하므로 streamlit 에 의존하지 않습니다.)
+#
+# 로더는 실행할 때마다 Excel 을 openpyxl 로 다시 읽고, 날짜 3종 정규식 + to_datetime, 제작자 정제를 반복합니다.
+# 정제 결과를 '원본 파일 해시' 이름의 Parquet 파일로 저장해 두고, 원본이 그대로면 그 파일을 바로 읽습니다.
+# (원본 파일이 바뀌거나 STAGING_VERSION 이 바뀌면 키가 달라져 자동으로 다시 만듭니다.)
+#
+#   df = staging.load_or_build(EXCEL_FILE_PATH, lambda: load_and_clean_data(...), tag="sheets=...")
+#   df = staging.read_latest(EXCEL_FILE_PATH)   # 노트북/분석용: 원본 해시 계산 없이 가장 최근 스테이징 파일
+import glob
+import hashlib
+import os
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGING_DIR = os.path.join(PROJECT_ROOT, 'data', 'staging')
+
+# 정제 규칙(backend/recall_cleaning.py)이나 스테이징 형식을 바꾸면 올려서 기존 파일을 무효화합니다.
+STAGING_VERSION = 1
+
+
+def file_hash(file_path, block_size=1 << 20):
+    """원본 파일 내용의 SHA-1 (block_size 씩 읽음)"""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_stem(source_path):
+    return os.path.splitext(os.path.basename(source_path))[0].replace(' ', '_')
+
+
+def staging_path(source_path, tag=''):
+    """원본 파일 내용 + tag + STAGING_VERSION 으로 정해지는 스테이징 Parquet 경로"""
+    key = hashlib.sha1(f"{file_hash(source_path)}|{tag}|v{STAGING_VERSION}".encode('utf-8')).hexdigest()[:16]
+    return os.path.join(STAGING_DIR, f"{_source_stem(source_path)}.{key}.parquet")
+
+
+def write_staged(df, path):
+    """df 를 path 에 Parquet 으로 저장하고, 같은 원본의 이전 스테이징 파일은 지웁니다."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(temp_path, engine='pyarrow', index=False)
+    os.replace(temp_path, path)
+    stem = os.path.basename(path).rsplit('.', 2)[0]
+    for old_path in glob.glob(os.path.join(os.path.dirname(path), f"{stem}.*.parquet")):
+        if old_path != path:
+            os.remove(old_path)
+
+
+def load_or_build(source_path, build, tag='', rebuild=False):
+    """
+    source_path 의 스테이징 파일이 있으면 읽어 반환하고, 없거나 rebuild=True 이면 build() 로 만들어 저장합니다.
+    build() 가 None 을 반환하면(원본 읽기 실패) 저장하지 않고 None 을 반환합니다.
+    pyarrow 가 없으면 스테이징 없이 build() 결과를 그대로 반환합니다.
+    """
+    path = staging_path(source_path, tag)
+    if not rebuild and os.path.exists(path):
+        start = time.perf_counter()
+        try:
+            df = pd.read_parquet(path, engine='pyarrow')
+            print(f" - 스테이징 파일 사용: {os.path.relpath(path, PROJECT_ROOT)} "
+                  f"({len(df)}건, {(time.perf_counter() - start) * 1000:.0f}ms)")
+            return df
+        except ImportError:
+            print("[정보] pyarrow 가 없어 스테이징 파일을 쓰지 않습니다. (pip install pyarrow)")
+            return build()
+        except Exception as e:
+            print(f"[경고] 스테이징 파일을 읽지 못해 다시 만듭니다: {e}")
+
+    df = build()
+    if df is None:
+        return None
+    try:
+        write_staged(df, path)
+        print(f" - 스테이징 파일 저장: {os.path.relpath(path, PROJECT_ROOT)}")
+    except ImportError:
+        print("[정보] pyarrow 가 없어 스테이징 파일을 쓰지 않습니다. (pip install pyarrow)")
+    except Exception as e:
+        print(f"[경고] 스테이징 파일 저장 실패: {e}")
+    return df
+
+
+def read_latest(source_path):
+    """source_path 로 만든 가장 최근 스테이징 파일을 읽습니다. (없으면 None, 원본과 일치하는지는 확인하지 않음)"""
+    paths = glob.glob(os.path.join(STAGING_DIR, f"{_source_stem(source_path)}.*.parquet"))
+    if not paths:
+        return None
+    return pd.read_parquet(max(paths, key=os.path.getmtime), engine='pyarrow')
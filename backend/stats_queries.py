@@ -1,129 +1,207 @@
 # 파일 이름: backend/stats_queries.py
 import pandas as pd
-import streamlit as st
 from datetime import date, datetime # [수정] datetime 객체도 import
 from . import db_manager # 같은 폴더의 db_manager를 임포트
+from . import cache # [신규] data_version 단위 결과 캐시 (st.cache_data 대체)
+from . import materialized # [신규] 요약 테이블 쿼리
+from . import snapshot # [신규] 인메모리 스냅샷
 import decimal # 타입 검사를 위해 임포트
 
-# --- [수정] Pylance 경고를 해결하기 위해 로직 재구성 ---
-@st.cache_data(ttl=3600)
-def get_summary_stats():
-    """상단 요약 대시보드를 위한 통계 데이터를 가져옵니다."""
+# Pylance를 위한 안전한 int 변환 헬퍼 함수
+def safe_int_from_value(value, default=0):
+    if isinstance(value, (int, float, decimal.Decimal, str)):
+        try:
+            return int(float(value)) 
+        except (ValueError, TypeError):
+            return default 
+    return default
+
+# --- [수정] 요약 테이블(Recall_Summary) 기본키 조회 1회로 변경 ---
+def get_summary_stats(live=False):
+    """
+    상단 요약 대시보드를 위한 통계 데이터를 가져옵니다.
+    기본은 로더가 갱신해 둔 Recall_Summary 한 행을 읽고(캐시), 요약 행이 아직 없으면 원본 테이블에서 다시 계산합니다.
+    [수정] live=True 이면 캐시를 거치지 않고 호출할 때마다 원본 테이블에서 다시 계산합니다.
+    """
+    if live:
+        return _fetch_summary_stats(live=True)
+    return _get_cached_summary_stats()
+
+
+@cache.cached()
+def _get_cached_summary_stats():
+    return _fetch_summary_stats(live=False)
+
+
+def _fetch_summary_stats(live=False):
+    """요약 통계를 DB 에서 조회합니다. (live=True 이면 Recall_Summary 대신 원본 테이블 집계)"""
     stats = {
         'total_recalls': 0, 'total_brands': 0, 'total_models': 0,
         'most_recall_brand': ('N/A', 0), 'data_period': ('N/A', 'N/A')
     }
-    conn = db_manager.create_connection()
-    if conn is None: return stats
-    
-    cursor = None 
-    
-    try:
-        cursor = conn.cursor(dictionary=True)
-        
-        # Pylance를 위한 안전한 int 변환 헬퍼 함수
-        def safe_int_from_value(value, default=0):
-            if isinstance(value, (int, float, decimal.Decimal, str)):
-                try:
-                    return int(float(value)) 
-                except (ValueError, TypeError):
-                    return default 
-            return default
-
-        # 1. 총 리콜 건수
-        cursor.execute("SELECT COUNT(recall_id) as count FROM Recall")
-        result = cursor.fetchone()
-        if isinstance(result, dict): 
-             stats['total_recalls'] = safe_int_from_value(result.get('count'))
-
-        # 2. 총 브랜드 수
-        cursor.execute("SELECT COUNT(brand_id) as count FROM Brand")
-        result = cursor.fetchone()
-        if isinstance(result, dict): 
-            stats['total_brands'] = safe_int_from_value(result.get('count'))
-
-        # 3. 총 차종 수
-        cursor.execute("SELECT COUNT(model_id) as count FROM Model")
-        result = cursor.fetchone()
-        if isinstance(result, dict): 
-            stats['total_models'] = safe_int_from_value(result.get('count'))
-
-        # 4. 최다 리콜 브랜드
-        query = """
-        SELECT b.brand_name, COUNT(r.recall_id) as count 
-        FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
-        GROUP BY b.brand_name ORDER BY count DESC LIMIT 1;
-        """
-        cursor.execute(query)
-        result = cursor.fetchone()
-        if isinstance(result, dict): 
-            brand_name = result.get('brand_name', 'N/A')
-            brand_count = safe_int_from_value(result.get('count'))
-            stats['most_recall_brand'] = (brand_name, brand_count)
-            
-        # 5. 데이터 기준 기간 (MIN/MAX 날짜)
-        cursor.execute("SELECT MIN(recall_date) as min_date, MAX(recall_date) as max_date FROM Recall WHERE recall_date IS NOT NULL")
-        result = cursor.fetchone()
-        
-        # --- [수정된 부분] Pylance 경고 해결 ---
-        if isinstance(result, dict):
-            min_date_val = result.get('min_date')
-            max_date_val = result.get('max_date')
-            
-            # [안전 블록] strftime은 date 또는 datetime 객체에서만 호출
-            if isinstance(min_date_val, (date, datetime)) and isinstance(max_date_val, (date, datetime)):
-                min_date_str = min_date_val.strftime('%Y-%m-%d')
-                max_date_str = max_date_val.strftime('%Y-%m-%d')
-                stats['data_period'] = (min_date_str, max_date_str)
-        # --- [수정 끝] ---
-            
-    except Exception as e:
-        print(f"get_summary_stats 오류: {e}")
-    finally:
-        if cursor: cursor.close() 
-        if conn and conn.is_connected():
-            conn.close()
-    return stats
+    with db_manager.get_connection() as conn:
+        if conn is None: return stats
+
+        cursor = None 
+        try:
+            cursor = conn.cursor(dictionary=True)
+            result = None
+            if not live:
+                cursor.execute(materialized.SUMMARY_LOOKUP_QUERY, (materialized.SUMMARY_ID,))
+                result = cursor.fetchone()
+            if not isinstance(result, dict):
+                cursor.execute(materialized.SUMMARY_SELECT_QUERY)
+                result = cursor.fetchone()
+
+            if isinstance(result, dict):
+                stats['total_recalls'] = safe_int_from_value(result.get('total_recalls'))
+                stats['total_brands'] = safe_int_from_value(result.get('total_brands'))
+                stats['total_models'] = safe_int_from_value(result.get('total_models'))
+
+                brand_name = result.get('top_brand_name')
+                if brand_name:
+                    stats['most_recall_brand'] = (brand_name, safe_int_from_value(result.get('top_brand_count')))
+
+                min_date_val = result.get('min_recall_date')
+                max_date_val = result.get('max_recall_date')
+
+                # [안전 블록] strftime은 date 또는 datetime 객체에서만 호출
+                if isinstance(min_date_val, (date, datetime)) and isinstance(max_date_val, (date, datetime)):
+                    min_date_str = min_date_val.strftime('%Y-%m-%d')
+                    max_date_str = max_date_val.strftime('%Y-%m-%d')
+                    stats['data_period'] = (min_date_str, max_date_str)
+
+        except Exception as e:
+            print(f"get_summary_stats 오류: {e}")
+            db_manager.note_query_error()
+        finally:
+            if cursor: cursor.close() 
+        return stats
 # --- [수정된 함수 끝] ---
 
 
-@st.cache_data(ttl=3600)
-def get_brand_rankings():
-    """브랜드 리포트 페이지를 위한 순위 데이터를 가져옵니다."""
-    conn = db_manager.create_connection()
-    if conn is None:
-        return pd.DataFrame(), pd.DataFrame()
-    df_recall_count = pd.DataFrame()
-    df_correction_rate = pd.DataFrame()
-    try:
-        recall_count_query = """
-        SELECT 
-            b.brand_name AS '브랜드', COUNT(DISTINCT r.recall_id) AS '총 리콜 건수'
-        FROM Recall r
-        JOIN Model m ON r.model_id = m.model_id
-        JOIN Brand b ON m.brand_id = b.brand_id
-        GROUP BY b.brand_name ORDER BY `총 리콜 건수` DESC;
-        """
-        df_recall_count = pd.read_sql(recall_count_query, conn)
-        df_recall_count.index = df_recall_count.index + 1
-
-        correction_rate_query = """
-        SELECT 
-            b.brand_name AS '브랜드', AVG(r.correction_rate) AS '평균 시정률 (%)',
-            COUNT(DISTINCT r.recall_id) AS '리콜 건수'
-        FROM Recall r
-        JOIN Model m ON r.model_id = m.model_id
-        JOIN Brand b ON m.brand_id = b.brand_id
-        GROUP BY b.brand_name HAVING `리콜 건수` >= 5 
-        ORDER BY `평균 시정률 (%)` DESC;
-        """
-        df_correction_rate = pd.read_sql(correction_rate_query, conn)
-        df_correction_rate.index = df_correction_rate.index + 1
-        df_correction_rate['평균 시정률 (%)'] = df_correction_rate['평균 시정률 (%)'].round(2)
-    except Exception as e:
-        print(f"get_brand_rankings 오류: {e}")
-        return pd.DataFrame(), pd.DataFrame() 
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
-    return df_recall_count, df_correction_rate
\ No newline at end of file
+# --- [신규] 집계 큐브(Recall_Cube)의 '전체 리콜' 행(keyword_id = 0)만 브랜드별로 합산 ---
+CUBE_BRAND_RANKING_QUERY = """
+SELECT
+    b.brand_name AS '브랜드', SUM(c.recall_count) AS '총 리콜 건수',
+    SUM(c.rate_sum) / NULLIF(SUM(c.rate_count), 0) AS '평균 시정률 (%)'
+FROM Recall_Cube c
+JOIN Brand b ON c.brand_id = b.brand_id
+WHERE c.keyword_id = 0
+GROUP BY b.brand_name;
+"""
+
+
+def _brand_rankings_from_cube(conn):
+    """Recall_Cube 로 두 순위표를 만듭니다. 큐브가 비어 있으면 None."""
+    df_cube = pd.read_sql(CUBE_BRAND_RANKING_QUERY, conn)
+    if df_cube.empty:
+        return None
+    df_cube['총 리콜 건수'] = df_cube['총 리콜 건수'].astype('int64') # SUM 결과(Decimal) -> 정수
+    df_cube['평균 시정률 (%)'] = df_cube['평균 시정률 (%)'].astype('float64')
+
+    df_recall_count = df_cube[['브랜드', '총 리콜 건수']].sort_values(
+        '총 리콜 건수', ascending=False, kind='stable', ignore_index=True
+    )
+    df_recall_count.index = df_recall_count.index + 1
+
+    df_correction_rate = df_cube[df_cube['총 리콜 건수'] >= 5].rename(columns={'총 리콜 건수': '리콜 건수'})
+    df_correction_rate = df_correction_rate[['브랜드', '평균 시정률 (%)', '리콜 건수']].sort_values(
+        '평균 시정률 (%)', ascending=False, kind='stable', ignore_index=True
+    )
+    df_correction_rate.index = df_correction_rate.index + 1
+    df_correction_rate['평균 시정률 (%)'] = df_correction_rate['평균 시정률 (%)'].round(2)
+    return df_recall_count, df_correction_rate
+
+
+@cache.cached()
+def get_brand_rankings(live=False):
+    """
+    브랜드 리포트 페이지를 위한 순위 데이터를 가져옵니다.
+    기본은 Recall_Cube 를 한 번 읽어 두 순위를 만들고, live=True 이거나 큐브가 비어 있으면 원본 테이블을 집계합니다.
+    """
+    snap = snapshot.get_snapshot()
+    if snap is not None:
+        return snap.get_brand_rankings()
+    with db_manager.get_connection() as conn:
+        if conn is None:
+            return pd.DataFrame(), pd.DataFrame()
+        df_recall_count = pd.DataFrame()
+        df_correction_rate = pd.DataFrame()
+        try:
+            if not live:
+                rankings = _brand_rankings_from_cube(conn)
+                if rankings is not None:
+                    return rankings
+
+            recall_count_query = """
+            SELECT 
+                b.brand_name AS '브랜드', COUNT(DISTINCT r.recall_id) AS '총 리콜 건수'
+            FROM Recall r
+            JOIN Model m ON r.model_id = m.model_id
+            JOIN Brand b ON m.brand_id = b.brand_id
+            GROUP BY b.brand_name ORDER BY `총 리콜 건수` DESC;
+            """
+            df_recall_count = pd.read_sql(recall_count_query, conn)
+            df_recall_count.index = df_recall_count.index + 1
+
+            correction_rate_query = """
+            SELECT 
+                b.brand_name AS '브랜드', AVG(r.correction_rate) AS '평균 시정률 (%)',
+                COUNT(DISTINCT r.recall_id) AS '리콜 건수'
+            FROM Recall r
+            JOIN Model m ON r.model_id = m.model_id
+            JOIN Brand b ON m.brand_id = b.brand_id
+            GROUP BY b.brand_name HAVING `리콜 건수` >= 5 
+            ORDER BY `평균 시정률 (%)` DESC;
+            """
+            df_correction_rate = pd.read_sql(correction_rate_query, conn)
+            df_correction_rate.index = df_correction_rate.index + 1
+            df_correction_rate['평균 시정률 (%)'] = df_correction_rate['평균 시정률 (%)'].round(2)
+        except Exception as e:
+            print(f"get_brand_rankings 오류: {e}")
+            db_manager.note_query_error()
+            return pd.DataFrame(), pd.DataFrame() 
+        return df_recall_count, df_correction_rate
+
+# --- [신규] 리콜이 많은 차종 Top N (워밍업 대상 선정용) ---
+CUBE_TOP_MODELS_QUERY = """
+SELECT b.brand_name, m.model_name, SUM(c.recall_count) AS recall_count
+FROM Recall_Cube c
+JOIN Model m ON c.model_id = m.model_id
+JOIN Brand b ON c.brand_id = b.brand_id
+WHERE c.keyword_id = 0
+GROUP BY b.brand_name, m.model_name
+ORDER BY recall_count DESC, b.brand_name, m.model_name LIMIT %s;
+"""
+
+LIVE_TOP_MODELS_QUERY = """
+SELECT b.brand_name, m.model_name, COUNT(r.recall_id) AS recall_count
+FROM Recall r
+JOIN Model m ON r.model_id = m.model_id
+JOIN Brand b ON m.brand_id = b.brand_id
+GROUP BY b.brand_name, m.model_name
+ORDER BY recall_count DESC, b.brand_name, m.model_name LIMIT %s;
+"""
+
+
+@cache.cached()
+def get_top_models(limit=20):
+    """리콜 건수가 많은 (브랜드, 차종) 목록을 반환합니다. (Recall_Cube 가 비어 있으면 원본 집계)"""
+    with db_manager.get_connection() as conn:
+        if conn is None: return []
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(CUBE_TOP_MODELS_QUERY, (limit,))
+            rows = cursor.fetchall()
+            if not rows:
+                cursor.execute(LIVE_TOP_MODELS_QUERY, (limit,))
+                rows = cursor.fetchall()
+            return [(brand_name, model_name) for brand_name, model_name, _ in rows]
+        except Exception as e:
+            print(f"get_top_models 오류: {e}")
+            db_manager.note_query_error()
+            return []
+        finally:
+            if cursor: cursor.close()
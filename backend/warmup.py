@@ -0,0 +1,102 @@
+# 파일 이름: backend/warmup.py
+# [신규] 캐시 워밍업 (배포 직후 / data_version 변경 직후 첫 방문자의 대기 시간 제거)
+#
+# 1) 앱 시작 시: Home.py 가 start_background_warmup() 을 호출 → 프로세스당 한 번, 백그라운드 스레드에서 실행
+# 2) 명령줄:    (프로젝트 루트에서) python -m backend.warmup --top-models 20 --workers 4
+#    [cache] backend = "disk" 인 경우 레플리카들이 같은 캐시를 공유하므로, 배포 후 한 번 실행해 두면 됩니다.
+#    (memory 백엔드에서는 명령줄 실행 프로세스의 캐시만 채워지므로 1) 의 앱 시작 훅을 사용하세요.)
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import search_queries
+from . import stats_queries
+from . import wordcloud_service
+
+DEFAULT_TOP_MODELS = 20
+DEFAULT_WORKERS = 4  # 커넥션 풀 크기(기본 5)보다 작게
+
+_started = False
+_started_lock = threading.Lock()
+
+
+def _timed_call(name, func, args):
+    """func(*args) 를 실행하고 (이름, 소요 시간(초), 결과 건수 또는 오류) 를 반환합니다."""
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+        size = len(result) if hasattr(result, '__len__') else 1
+        return name, time.perf_counter() - start, f"{size}건"
+    except Exception as e:
+        return name, time.perf_counter() - start, f"오류: {e}"
+
+
+def _run(tasks, workers):
+    if workers <= 1:
+        return [_timed_call(*task) for task in tasks]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup") as executor:
+        return list(executor.map(lambda task: _timed_call(*task), tasks))
+
+
+def warm_caches(top_models=DEFAULT_TOP_MODELS, workers=DEFAULT_WORKERS, verbose=True):
+    """
+    자주 쓰는 조회 함수들의 캐시를 미리 채웁니다.
+      1단계: 브랜드→차종 카탈로그, 키워드 목록, 요약 통계, 브랜드 랭킹, 리콜 Top N 차종
+      2단계: Top N 차종의 모델 프로필(통계/키워드 Top 10, 리콜 이력 첫 페이지), 워드 클라우드
+    반환값: [(이름, 소요 시간(초), 결과 요약), ...]
+    """
+    total_start = time.perf_counter()
+    report = _run([
+        ("get_catalog", search_queries.get_catalog, ()),
+        ("get_all_keywords_with_desc", search_queries.get_all_keywords_with_desc, ()),
+        ("get_summary_stats", stats_queries.get_summary_stats, ()),
+        ("get_brand_rankings", stats_queries.get_brand_rankings, ()),
+        (f"get_top_models({top_models})", stats_queries.get_top_models, (top_models,)),
+    ], workers)
+
+    # 1단계 결과는 캐시에 있으므로 다시 호출해도 DB 를 읽지 않음
+    # (브랜드별 차종 목록은 get_catalog() 캐시에서 바로 꺼내므로 따로 워밍업할 필요가 없음)
+    models = stats_queries.get_top_models(top_models) if top_models > 0 else []
+    # 모델 프로필 화면이 여는 조회: get_recall_comparison → 워드 클라우드 + 리콜 이력 (pages/3_📊_분석_리포트.py)
+    tasks = [(f"get_recall_comparison({brand}, {model})", search_queries.get_recall_comparison, (brand, model))
+             for brand, model in models]
+    tasks += [(f"get_model_history({brand}, {model})", search_queries.get_model_history, (brand, model, "전체", "전체", 1))
+              for brand, model in models]
+    tasks += [(f"get_model_wordcloud_png({brand}, {model})", wordcloud_service.get_model_wordcloud_png, (brand, model))
+              for brand, model in models]
+    report += _run(tasks, workers)
+
+    if verbose:
+        print(f"[워밍업] {len(report)}개 항목 완료 ({time.perf_counter() - total_start:.2f}초, workers={workers})")
+        for name, elapsed, summary in sorted(report, key=lambda item: item[1], reverse=True):
+            print(f"   {elapsed * 1000:8.1f}ms  {name}  ({summary})")
+    return report
+
+
+def start_background_warmup(top_models=DEFAULT_TOP_MODELS, workers=DEFAULT_WORKERS):
+    """프로세스당 한 번만 백그라운드 스레드로 warm_caches() 를 실행합니다. (앱 시작 훅)"""
+    global _started
+    with _started_lock:
+        if _started:
+            return False
+        _started = True
+    threading.Thread(
+        target=warm_caches, kwargs={'top_models': top_models, 'workers': workers},
+        name="cache-warmup", daemon=True
+    ).start()
+    return True
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="레몬 스캐너 조회 캐시 워밍업")
+    parser.add_argument('--top-models', type=int, default=DEFAULT_TOP_MODELS,
+                        help=f"모델 프로필을 미리 계산할 리콜 상위 차종 수 (기본 {DEFAULT_TOP_MODELS}, 0 이면 생략)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"동시에 실행할 조회 수 (기본 {DEFAULT_WORKERS}, 1 이면 순차 실행)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    warm_caches(top_models=args.top_models, workers=args.workers)
@@ -0,0 +1,169 @@
+# 파일 이름: backend/wordcloud_service.py
+# [신규] 모델 프로필 워드 클라우드 서비스
+#
+# 기존에는 모델 프로필 탭이 다시 그려질 때마다(아래 연도/키워드 선택만 바꿔도) 800x400 WordCloud 를 새로 만들고
+# matplotlib Figure 로 그린 뒤 닫지 않았습니다. 여기서는
+#   1) 로더가 미리 계산한 차종별 단어 빈도(Model_Term_Freq, backend/korean_terms.py)를 읽어
+#      WordCloud.generate_from_frequencies 로 그리고 (렌더링 비용 ∝ 서로 다른 단어 수)
+#   2) 렌더링한 PNG 바이트를 (model_id, data_version) 단위로 캐시(backend/cache.py)해
+# 페이지는 캐시된 이미지를 st.image 로 보여주기만 합니다. (matplotlib 사용 안 함)
+#
+# 전체 차종 일괄 생성 (disk 캐시 백엔드에서 유용):
+#   (프로젝트 루트에서) python -m backend.wordcloud_service --workers 4
+import argparse
+import functools
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import cache
+from . import db_manager
+from . import korean_terms
+from . import search_queries
+
+try:
+    from wordcloud import WordCloud
+except ImportError:  # wordcloud 미설치 환경에서도 나머지 기능은 동작
+    WordCloud = None
+
+WORDCLOUD_WIDTH = 800
+WORDCLOUD_HEIGHT = 400
+WORDCLOUD_MAX_WORDS = 200
+
+# 한글 폰트 후보 (앞에서부터 처음 존재하는 파일 사용)
+FONT_CANDIDATES = [
+    "c:/Windows/Fonts/malgun.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+]
+# [수정] 폰트가 없으면 WordCloud 기본 폰트(한글 미지원)로 그려지므로 화면(st.warning)/CLI(print)에서 알림
+FONT_MISSING_MESSAGE = (
+    "한글 폰트를 찾을 수 없어 기본 폰트로 워드 클라우드를 그립니다. 한글 단어가 네모(□)로 보일 수 있습니다. "
+    f"(확인한 경로: {', '.join(FONT_CANDIDATES)})"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def find_font_path():
+    """FONT_CANDIDATES 중 처음 존재하는 폰트 경로. 없으면 None (FONT_MISSING_MESSAGE 참고)"""
+    for path in FONT_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+TERM_FREQ_QUERY = """
+SELECT term, term_count FROM Model_Term_Freq
+WHERE model_id = %s
+ORDER BY term_count DESC
+LIMIT %s
+"""
+
+
+def _fetch_model_reasons(model_id):
+    query = "SELECT reason FROM Recall WHERE model_id = %s AND reason IS NOT NULL;"
+    with db_manager.get_connection() as conn:
+        if conn is None: return []
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, (model_id,))
+            return [row[0] for row in cursor.fetchall() if isinstance(row[0], str)]
+        except Exception as e:
+            print(f"_fetch_model_reasons 오류: {e}")
+            db_manager.note_query_error()
+            return []
+        finally:
+            if cursor: cursor.close()
+
+
+def _fetch_term_frequencies(model_id, limit=WORDCLOUD_MAX_WORDS):
+    """Model_Term_Freq 에서 상위 limit 개 단어 빈도를 읽습니다. (테이블이 없거나 비어 있으면 None)"""
+    with db_manager.get_connection() as conn:
+        if conn is None: return None
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(TERM_FREQ_QUERY, (model_id, limit))
+            rows = cursor.fetchall()
+            return {term: int(count) for term, count in rows} if rows else None
+        except Exception as e:
+            print(f"_fetch_term_frequencies 오류: {e}")
+            db_manager.note_query_error()
+            return None
+        finally:
+            if cursor: cursor.close()
+
+
+@cache.cached()
+def get_term_frequencies(model_id):
+    """
+    차종 하나의 리콜 사유 단어 빈도 {단어: 횟수} (상위 WORDCLOUD_MAX_WORDS 개)
+    Model_Term_Freq 에 없으면(마이그레이션 V004 이전, 적재 전) 사유를 읽어 같은 토크나이저로 직접 계산합니다.
+    """
+    frequencies = _fetch_term_frequencies(model_id)
+    if frequencies is not None:
+        return frequencies
+    counts = korean_terms.count_terms(_fetch_model_reasons(model_id))
+    return dict(counts.most_common(WORDCLOUD_MAX_WORDS))
+
+
+def render_png(frequencies):
+    """단어 빈도로 워드 클라우드를 그려 PNG 바이트로 반환합니다. (그릴 수 없으면 None)"""
+    if not frequencies or WordCloud is None:
+        return None
+    wordcloud = WordCloud(
+        font_path=find_font_path(), width=WORDCLOUD_WIDTH, height=WORDCLOUD_HEIGHT,
+        background_color='white', max_words=WORDCLOUD_MAX_WORDS
+    ).generate_from_frequencies(frequencies)
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@cache.cached()
+def get_wordcloud_png(model_id):
+    """model_id 의 워드 클라우드 PNG 바이트. (data_version 단위로 캐시, 데이터가 없거나 실패하면 None)"""
+    try:
+        return render_png(get_term_frequencies(model_id))
+    except Exception as e:
+        print(f"get_wordcloud_png 오류 (model_id={model_id}): {e}")
+        db_manager.note_query_error()
+        return None
+
+
+def get_model_wordcloud_png(brand, model):
+    """(브랜드, 차종) 으로 워드 클라우드 PNG 바이트를 가져옵니다."""
+    model_id = search_queries.get_model_id(brand, model)
+    if model_id is None:
+        return None
+    return get_wordcloud_png(model_id)
+
+
+def precompute_all(workers=4, verbose=True):
+    """카탈로그의 모든 차종 워드 클라우드를 미리 만들어 캐시에 넣습니다. 반환값: (생성 수, 빈 차종 수)"""
+    model_ids = [model_id for models in search_queries.get_catalog().values() for model_id, _ in models]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="wordcloud") as executor:
+        results = list(executor.map(get_wordcloud_png, model_ids))
+    rendered = sum(1 for png in results if png)
+    if verbose:
+        print(f"[워드 클라우드] 차종 {len(model_ids)}개 중 {rendered}개 생성 "
+              f"({time.perf_counter() - start:.2f}초, 데이터 없음 {len(model_ids) - rendered}개)")
+    return rendered, len(model_ids) - rendered
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="전체 차종 워드 클라우드 일괄 생성")
+    parser.add_argument('--workers', type=int, default=4, help="동시에 생성할 개수 (기본 4)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    if WordCloud is None:
+        print("wordcloud 라이브러리가 설치되어 있지 않습니다. (pip install wordcloud)")
+    else:
+        if find_font_path() is None:
+            print(f"[경고] {FONT_MISSING_MESSAGE}")
+        precompute_all(parse_args().workers)
@@ -2,6 +2,16 @@ import pandas as pd
 import numpy as np
 import re
 import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# [신규] 프로젝트 루트를 import 경로에 추가 (backend 패키지의 공용 정제 규칙 사용)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
 # --- 설정 ---
 # 원본 파일 이름
@@ -10,84 +20,119 @@ ORIGINAL_FILE = '한국교통안전공단_자동차 리콜대수 및 시정률_2
 # 새로 생성될 엑셀 파일 이름
 OUTPUT_FILE = '브랜드별_리콜_요약_데이터.xlsx'
 
-# --- 1. 필터링 키워드 (승용차가 아닌 것들) ---
-# process_data.py와 동일한 필터링 로직
-MANUFACTURER_EXCLUDE_KEYWORDS = [
-    '버스', '모터스', '이륜차', '오토바이', '스즈키', '할리데이비슨', '혼다코리아', 
-    '대동공업', '엘에스엠트론', '트랙터', '농기계', 'KR모터스', '가와사키', '두카티',
-    '브이스트롬', '인디언', '바이크', '모터사이클', '야마하', '다임러트럭', '만트럭',
-    '볼보트럭', '스카니아', '특장', '중공업', '상용차', '선롱버스', '자일대우'
-]
-MODEL_NAME_EXCLUDE_KEYWORDS = [
-    '버스', '트럭', '트랙터', '이륜차', '스쿠터', '오토바이', '굴삭기', '지게차',
-    'LPGi', '카고', '덤프', '트레일러', '특수', '모터싸이클', '화물', 'CITY'
-]
-
-# --- 2. 정제(통합) 함수 ---
-def clean_manufacturer_name(name):
-    """제작자 이름 정제 (예: '현대자동차(주)' -> '현대')"""
-    name_lower = str(name).lower() # 문자열로 변환
-    if '현대' in name_lower: return '현대'
-    if '기아' in name_lower: return '기아'
-    if '한국지엠' in name_lower or '지엠코리아' in name_lower: return 'GM'
-    if '르노코리아' in name_lower or '르노삼성' in name_lower: return '르노'
-    if '쌍용' in name_lower: return '쌍용(KG모빌리티)'
-    if '메르세데스' in name_lower or '벤츠' in name_lower: return '벤츠'
-    if '비엠더블유' in name_lower or 'bmw' in name_lower: return 'BMW'
-    if '폭스바겐' in name_lower: return '폭스바겐'
-    if '아우디' in name_lower: return '아우디'
-    if '포르쉐' in name_lower: return '포르쉐'
-    name = re.sub(r'\(.*\)', '', str(name)).strip()
-    name = name.replace('주식회사', '').replace('(유)', '').replace('(주)', '').strip()
-    return name
-
-def clean_model_name(name):
-    """차명 정제 (예: '쏘나타(DN8)' -> '쏘나타')"""
-    name = str(name)
-    # 괄호 및 괄호 안 내용 제거 (정확한 집계를 위해)
-    name = re.sub(r'\(.*\)', '', name).strip()
-    # 기타 수식어 제거 (필요시)
-    # name = name.split(' ')[0] 
-    return ' '.join(name.split()) # 연속 공백 제거
+# [신규] csv/parquet 형식의 브랜드별 파일이 저장될 폴더, dataset 형식의 파티션 데이터셋 폴더
+OUTPUT_DIR = '브랜드별_리콜_요약_데이터'
+OUTPUT_DATASET_DIR = '브랜드별_리콜_요약_데이터셋'
+OUTPUT_FORMATS = ['excel', 'csv', 'parquet', 'dataset']
+DEFAULT_WORKERS = 4
+
+# --- 1~2. 필터링 키워드 / 정제 함수 ---
+# [수정] DB 로더(sql/load_data_from_excel.py)와 같은 규칙을 쓰도록 backend/recall_cleaning.py 로 이동
+from backend.recall_cleaning import (
+    MANUFACTURER_EXCLUDE_KEYWORDS, MODEL_NAME_EXCLUDE_KEYWORDS,
+    clean_manufacturer_name, clean_model_name, filter_passenger_cars, clean_names
+)
 
 # --- 3. 메인 로직 ---
-def process_and_aggregate():
-    """데이터를 필터링, 정제, '집계'하여 새 Excel 파일로 저장합니다."""
-    
+_stage_timings = []
+
+
+@contextmanager
+def timed_stage(name):
+    """[신규] with 블록의 소요 시간을 단계 이름과 함께 기록합니다. (마지막에 print_stage_timings 로 출력)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stage_timings.append((name, time.perf_counter() - start))
+
+
+def print_stage_timings():
+    total = sum(elapsed for _, elapsed in _stage_timings)
+    print(f"\n[단계별 소요 시간] 합계 {total:.2f}초")
+    for name, elapsed in _stage_timings:
+        print(f"   {elapsed * 1000:9.1f}ms  {name}")
+
+
+def safe_file_name(brand):
+    """시트/파일 이름에 사용 불가능한 문자 제거 (예: / \\ * ? [ ])"""
+    return re.sub(r'[\\/*?\[\]:]', '', brand)
+
+
+def export_excel(partitions):
+    """브랜드마다 시트 하나 (openpyxl 은 한 파일에 순서대로 써야 하므로 직렬)"""
+    with pd.ExcelWriter(OUTPUT_FILE, engine='openpyxl') as writer:
+        for brand, brand_df in partitions:
+            safe_sheet_name = safe_file_name(brand)[:30] # 시트명 30자 제한
+            print(f" -> '{safe_sheet_name}' 시트 저장 중...")
+            brand_df.to_excel(writer, sheet_name=safe_sheet_name, index=False)
+    return OUTPUT_FILE
+
+
+def _write_brand_file(brand, brand_df, output_format):
+    extension = 'csv' if output_format == 'csv' else 'parquet'
+    path = os.path.join(OUTPUT_DIR, f"{safe_file_name(brand)}.{extension}")
+    if output_format == 'csv':
+        brand_df.to_csv(path, index=False, encoding='utf-8-sig') # Excel 에서 바로 열 수 있도록 BOM 포함
+    else:
+        brand_df.to_parquet(path, index=False)
+    return path
+
+
+def export_brand_files(partitions, output_format, workers):
+    """브랜드마다 CSV/Parquet 파일 하나, workers 개의 스레드가 나눠서 저장"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="export") as executor:
+        futures = [executor.submit(_write_brand_file, brand, brand_df, output_format) for brand, brand_df in partitions]
+        paths = [future.result() for future in futures]
+    return f"{OUTPUT_DIR}/ ({len(paths)}개 파일)"
+
+
+def export_dataset(final_df):
+    """제작자=<브랜드>/ 폴더로 나뉜 Parquet 데이터셋 하나 (pyarrow 가 파티션을 병렬로 저장, 다시 실행하면 파티션을 덮어씀)"""
+    final_df.to_parquet(OUTPUT_DATASET_DIR, engine='pyarrow', index=False, partition_cols=['제작자'],
+                        existing_data_behavior='delete_matching')
+    return f"{OUTPUT_DATASET_DIR}/ (제작자 파티션)"
+
+
+def process_and_aggregate(output_format='excel', workers=DEFAULT_WORKERS):
+    """데이터를 필터링, 정제, '집계'하여 브랜드별로 저장합니다. (output_format: excel / csv / parquet / dataset)"""
+    _stage_timings.clear()
     print(f"'{ORIGINAL_FILE}' 파일을 읽는 중입니다...")
     
     # 1. CSV 읽기
     if not os.path.exists(ORIGINAL_FILE):
         print(f"[오류] 원본 파일('{ORIGINAL_FILE}')을 찾을 수 없습니다.")
         return
-    try:
-        df = pd.read_csv(ORIGINAL_FILE, encoding='cp949')
-    except UnicodeDecodeError:
-        df = pd.read_csv(ORIGINAL_FILE, encoding='utf-8')
-    except Exception as e:
-        print(f"파일을 읽는 중 오류 발생: {e}")
-        return
+    with timed_stage("CSV 읽기"):
+        try:
+            df = pd.read_csv(ORIGINAL_FILE, encoding='cp949')
+        except UnicodeDecodeError:
+            df = pd.read_csv(ORIGINAL_FILE, encoding='utf-8')
+        except Exception as e:
+            print(f"파일을 읽는 중 오류 발생: {e}")
+            return
             
     original_row_count = len(df)
     print(f"원본 데이터 {original_row_count}건 로드 완료.")
 
     # 2. [Goal 1] 필터링 (승용차)
-    mask_mfg = df['제작자'].str.contains('|'.join(MANUFACTURER_EXCLUDE_KEYWORDS), case=False, na=False)
-    mask_model = df['차명'].str.contains('|'.join(MODEL_NAME_EXCLUDE_KEYWORDS), case=False, na=False)
-    filtered_df = df[~mask_mfg & ~mask_model].copy()
+    with timed_stage("승용차 필터링"):
+        filtered_df = filter_passenger_cars(df)
     print(f"승용차 데이터 {len(filtered_df)}건 필터링 완료.")
 
     # 3. 데이터 정제 (Grouping 준비)
-    filtered_df['제작자'] = filtered_df['제작자'].apply(clean_manufacturer_name)
-    filtered_df['차명'] = filtered_df['차명'].apply(clean_model_name)
+    with timed_stage("제작자/차명 정제"):
+        clean_names(filtered_df)
     
     # 4. [Goal 2] '리콜연도' 컬럼 생성
-    # '리콜개시일'을 날짜 타입으로 변환 (오류 무시)
-    filtered_df['리콜개시일_dt'] = pd.to_datetime(filtered_df['리콜개시일'], errors='coerce')
-    filtered_df['리콜연도'] = filtered_df['리콜개시일_dt'].dt.year
-    # 연도 변환 실패한 데이터(NaT)는 집계에서 제외
-    filtered_df = filtered_df.dropna(subset=['리콜연도'])
-    filtered_df['리콜연도'] = filtered_df['리콜연도'].astype(int)
+    with timed_stage("리콜연도 생성"):
+        # '리콜개시일'을 날짜 타입으로 변환 (오류 무시)
+        filtered_df['리콜개시일_dt'] = pd.to_datetime(filtered_df['리콜개시일'], errors='coerce')
+        filtered_df['리콜연도'] = filtered_df['리콜개시일_dt'].dt.year
+        # 연도 변환 실패한 데이터(NaT)는 집계에서 제외
+        filtered_df = filtered_df.dropna(subset=['리콜연도'])
+        filtered_df['리콜연도'] = filtered_df['리콜연도'].astype(int)
     print("'리콜연도' 컬럼 생성 완료.")
 
     # 5. [Goal 3, 4, 5] 데이터 집계 (Aggregation)
@@ -105,7 +150,8 @@ def process_and_aggregate():
     }
     
     print("데이터 집계(Grouping) 시작...")
-    aggregated_df = filtered_df.groupby(GROUP_BY_KEYS).agg(AGG_RULES).reset_index()
+    with timed_stage("집계(groupby)"):
+        aggregated_df = filtered_df.groupby(GROUP_BY_KEYS).agg(AGG_RULES).reset_index()
     print("데이터 집계 완료.")
 
     # 6. [Goal 5] '시정율' 새로 계산 (합산된 평균)
@@ -120,42 +166,45 @@ def process_and_aggregate():
     aggregated_df['시정율(퍼센트)'] = aggregated_df['시정율(퍼센트)'].round(2)
     print("'시정율' 컬럼 새로 계산 완료 (합산 기준 평균).")
 
-    # 7. [Goal 6] Excel 파일로 저장 (시트별 브랜드)
-    print(f"'{OUTPUT_FILE}' 엑셀 파일 생성 시작...")
-    
-    # ExcelWriter 객체 생성
-    try:
-        with pd.ExcelWriter(OUTPUT_FILE, engine='openpyxl') as writer:
-            # 정렬 기준 컬럼 (제작자, 차명, 리콜연도 최신순)
-            sort_columns = ['제작자', '차명', '리콜연도']
-            
-            # 최종 데이터 정렬
-            final_df = aggregated_df.sort_values(by=sort_columns, ascending=[True, True, False])
+    # 7. [Goal 6] 브랜드별 저장
+    # [수정] 브랜드마다 final_df[final_df['제작자'] == brand] 로 전체를 훑던 방식 → groupby 로 한 번에 분할
+    with timed_stage("정렬 + 브랜드별 분할"):
+        # 정렬 기준 컬럼 (제작자, 차명, 리콜연도 최신순)
+        sort_columns = ['제작자', '차명', '리콜연도']
+        final_df = aggregated_df.sort_values(by=sort_columns, ascending=[True, True, False])
+        partitions = list(final_df.groupby('제작자', sort=False))
 
-            # 브랜드 목록 추출
-            unique_brands = final_df['제작자'].unique()
-            
-            # 각 브랜드를 별도 시트에 저장
-            for brand in unique_brands:
-                # 시트 이름에 사용 불가능한 문자 제거 (예: / \ * ? [ ])
-                safe_sheet_name = re.sub(r'[\\/*?\[\]:]', '', brand)[:30] # 시트명 30자 제한
-                
-                print(f" -> '{safe_sheet_name}' 시트 저장 중...")
-                brand_df = final_df[final_df['제작자'] == brand].copy()
-                
-                # 브랜드별 시트에서는 '제작자' 컬럼이 불필요하므로 제외 (선택 사항)
-                # brand_df = brand_df.drop(columns=['제작자'])
-                
-                brand_df.to_excel(writer, sheet_name=safe_sheet_name, index=False)
+    print(f"브랜드별 저장 시작 (format={output_format}, 브랜드 {len(partitions)}개)...")
+    try:
+        with timed_stage(f"저장 ({output_format})"):
+            if output_format == 'excel':
+                output = export_excel(partitions)
+            elif output_format == 'dataset':
+                output = export_dataset(final_df)
+            else:
+                output = export_brand_files(partitions, output_format, workers)
         
-        print(f"\n[성공] '{OUTPUT_FILE}' 파일이 성공적으로 생성되었습니다.")
-        print(f"({len(unique_brands)}개의 브랜드 시트가 생성됨)")
+        print(f"\n[성공] '{output}' 이(가) 성공적으로 생성되었습니다.")
+        print(f"({len(partitions)}개의 브랜드로 저장됨)")
         
-    except ImportError:
-        print("\n[오류] 'openpyxl' 라이브러리가 필요합니다.")
-        print("엑셀 파일 저장을 위해 터미널에서 'pip install openpyxl'를 실행해주세요.")
+    except ImportError as e:
+        print(f"\n[오류] 필요한 라이브러리가 없습니다: {e}")
+        print("엑셀 저장은 'pip install openpyxl', Parquet 저장은 'pip install pyarrow' 를 실행해주세요.")
     except Exception as e:
-        print(f"\n[오류] 엑셀 파일 저장 중 오류 발생: {e}")
+        print(f"\n[오류] 파일 저장 중 오류 발생: {e}")
+    finally:
+        print_stage_timings()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="리콜 원본 CSV 를 승용차만 정제/집계해 브랜드별로 저장합니다.")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='excel', dest='output_format',
+                        help=f"excel: '{OUTPUT_FILE}' 시트별 저장 (기본값), csv/parquet: '{OUTPUT_DIR}/' 에 "
+                             f"브랜드별 파일, dataset: '{OUTPUT_DATASET_DIR}/' 에 "
+                             "'제작자' 로 파티션된 Parquet 데이터셋")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"csv/parquet 저장 시 동시에 쓸 파일 수 (기본값: {DEFAULT_WORKERS})")
+    return parser.parse_args()
 
 # --- 4. 스크립트 실행 ---
 if __name__ == "__main__":
@@ -167,4 +216,5 @@ if __name__ == "__main__":
         print("[알림] 'pandas'와 'numpy' 라이브러리가 필요합니다.")
         print("터미널에서 'pip install pandas numpy'를 실행해주세요.")
     else:
-        process_and_aggregate()
\ No newline at end of file
+        args = parse_args()
+        process_and_aggregate(args.output_format, args.workers)
@@ -6,9 +6,12 @@ from backend.search_queries import (
     get_all_keywords_with_desc, 
     get_all_brands, 
     get_models_by_brand, 
-    search_recalls,
-    get_keywords_for_recall
+    search_recalls_page,
+    search_recalls_ranked,
+    build_fulltext_query,
+    SEARCH_PAGE_SIZE
 )
+from backend.keyword_index import build_keyword_expression
 from backend.stats_queries import get_summary_stats
 
 try:
@@ -30,6 +33,55 @@ display_custom_header()
 # --- [1A] (수정) Session State 초기화 ---
 if "search_results" not in st.session_state:
     st.session_state.search_results = pd.DataFrame() 
+if "search_filters" not in st.session_state:
+    st.session_state.search_filters = None   # 마지막으로 검색한 (브랜드, 차종, 연도, 키워드)
+    st.session_state.page_cursors = [None]   # 각 페이지의 시작 커서 (첫 페이지는 None)
+    st.session_state.next_cursor = None
+    st.session_state.total_count = None
+if "search_keyword_expr" not in st.session_state:
+    st.session_state.search_keyword_expr = None  # 마지막으로 검색한 키워드 식 (AND/OR/NOT)
+if "search_reason_query" not in st.session_state:
+    st.session_state.search_reason_query = None  # 마지막으로 검색한 리콜사유 검색어
+    st.session_state.search_ranked = False       # 관련도순 정렬 여부
+
+# --- [1C] (신규) 페이지 단위 조회 ---
+def load_search_page(with_total=False):
+    """현재 페이지 커서로 검색 결과 한 페이지를 불러와 session_state 에 저장합니다."""
+    if "search_results_df" in st.session_state:
+        del st.session_state.search_results_df
+    if st.session_state.search_ranked:
+        # 관련도순은 상위 결과 한 번에 (페이지 이동 없음)
+        results_df, error_message = search_recalls_ranked(
+            st.session_state.search_reason_query,
+            *st.session_state.search_filters,
+            keyword_expr=st.session_state.search_keyword_expr
+        )
+        if error_message:
+            st.warning(error_message)
+        st.session_state.search_results = results_df
+        st.session_state.next_cursor = None
+        st.session_state.total_count = None
+        return
+    results_df, next_cursor, total_count = search_recalls_page(
+        *st.session_state.search_filters,
+        cursor_token=st.session_state.page_cursors[-1],
+        with_total=with_total,
+        keyword_expr=st.session_state.search_keyword_expr,
+        reason_query=st.session_state.search_reason_query
+    )
+    st.session_state.search_results = results_df
+    st.session_state.next_cursor = next_cursor
+    if with_total:
+        st.session_state.total_count = total_count
+
+def go_next_page():
+    st.session_state.page_cursors.append(st.session_state.next_cursor)
+    load_search_page()
+
+def go_prev_page():
+    if len(st.session_state.page_cursors) > 1:
+        st.session_state.page_cursors.pop()
+        load_search_page()
 
 # --- [1B] 키워드 설명 DB에서 로드 ---
 try:
@@ -63,30 +115,60 @@ else:
     model_list = ["전체"] 
 current_year = datetime.date.today().year
 year_list = ["전체"] + list(range(current_year, 2014, -1))
-keyword_list = ["전체"] + list(KEYWORD_DICT_FROM_DB.keys())
+keyword_list = list(KEYWORD_DICT_FROM_DB.keys())
 
 # --- [4] 폼 제출 로직 ---
 with st.sidebar.form(key="search_form"):
     selected_model = st.selectbox("2. 차종 선택", model_list, key="search_model")
     selected_year = st.selectbox("3. 리콜연도 선택 (리콜개시일 기준)", year_list, key="search_year")
-    selected_keyword = st.selectbox(
-        "4. 리콜사유 키워드 선택", keyword_list, key="search_keyword",
-        help="리콜 사유에 포함된 핵심 키워드를 선택합니다." 
+    # [수정] 키워드 여러 개를 AND/OR 로 조합하고, 제외할 키워드(NOT)도 선택
+    selected_keywords = st.multiselect(
+        "4. 리콜사유 키워드 선택", keyword_list, key="search_keywords",
+        help="리콜 사유에 포함된 핵심 키워드를 선택합니다. (여러 개 선택 가능)" 
+    )
+    keyword_mode = st.radio(
+        "키워드 조건", ["모두 포함 (AND)", "하나 이상 포함 (OR)"], key="search_keyword_mode", horizontal=True
+    )
+    excluded_keywords = st.multiselect(
+        "제외할 키워드 (NOT)", keyword_list, key="search_excluded_keywords",
+        help="선택한 키워드가 하나라도 포함된 리콜은 결과에서 제외합니다."
+    )
+    for keyword in selected_keywords:
+        description = KEYWORD_DICT_FROM_DB.get(keyword, "상세 설명이 없습니다.")
+        st.caption(f"ℹ️ **{keyword}**: {description}")
+
+    # [신규] 리콜 사유 자유 텍스트 검색
+    reason_query = st.text_input(
+        "5. 리콜사유 검색어", key="search_reason_text", placeholder='예: 브레이크 누유, "연료 펌프", 화재 -배터리',
+        help='띄어쓰기로 구분한 단어는 모두 포함, 큰따옴표로 묶으면 구절 검색, 앞에 -를 붙이면 제외합니다. (두 글자 이상)'
+    )
+    sort_order = st.radio(
+        "정렬", ["최신순", "관련도순"], key="search_sort_order", horizontal=True,
+        help="관련도순은 검색어가 있을 때만 적용되며, 상위 200건을 한 번에 보여줍니다."
     )
-    if selected_keyword and selected_keyword != "전체":
-        description = KEYWORD_DICT_FROM_DB.get(selected_keyword, "상세 설명이 없습니다.")
-        st.caption(f"ℹ️ **{selected_keyword}**: {description}")
     
     submit_pressed = st.form_submit_button(label="상세 리콜 내역 검색")
 
 if submit_pressed:
-    if "search_results_df" in st.session_state:
-        del st.session_state.search_results_df
+    st.session_state.search_filters = (selected_brand, selected_model, selected_year, "전체")
+    if keyword_mode.startswith("모두"):
+        keyword_expr = build_keyword_expression(all_of=selected_keywords, none_of=excluded_keywords)
+    else:
+        keyword_expr = build_keyword_expression(any_of=selected_keywords, none_of=excluded_keywords)
+    st.session_state.search_keyword_expr = keyword_expr
+    reason_query = reason_query.strip() or None
+    if reason_query:
+        try:
+            build_fulltext_query(reason_query)
+        except ValueError as e:
+            st.sidebar.warning(str(e))
+            reason_query = None
+    st.session_state.search_reason_query = reason_query
+    st.session_state.search_ranked = bool(reason_query) and sort_order == "관련도순"
+    st.session_state.page_cursors = [None]
     
     with st.spinner("데이터베이스에서 리콜 정보를 검색 중입니다..."):
-        st.session_state.search_results = search_recalls(
-            selected_brand, selected_model, selected_year, selected_keyword
-        )
+        load_search_page(with_total=True)
 
 # --- [5] 메인 화면 (결과 표시) ---
 results_df = st.session_state.search_results
@@ -94,7 +176,27 @@ results_df = st.session_state.search_results
 if results_df.empty:
     st.info("왼쪽 사이드바에서 검색 조건을 선택한 후 검색 버튼을 눌러주세요.")
 else:
-    st.success(f"총 {len(results_df)}건의 리콜 정보를 찾았습니다. (최대 200건)")
+    page_no = len(st.session_state.page_cursors)
+    total_count = st.session_state.total_count
+    if total_count is not None:
+        total_pages = max(1, -(-total_count // SEARCH_PAGE_SIZE))
+        st.success(f"총 {total_count:,}건의 리콜 정보를 찾았습니다. ({page_no} / {total_pages} 페이지)")
+    elif st.session_state.search_ranked:
+        st.success(f"관련도 상위 {len(results_df)}건의 리콜 정보를 찾았습니다.")
+    else:
+        st.success(f"{page_no} 페이지: {len(results_df)}건")
+    if st.session_state.search_keyword_expr:
+        st.caption(f"키워드 조건: `{st.session_state.search_keyword_expr}`")
+    if st.session_state.search_reason_query:
+        st.caption(f"리콜사유 검색어: `{st.session_state.search_reason_query}`")
+
+    nav_col1, nav_col2, nav_col3 = st.columns([0.15, 0.7, 0.15])
+    with nav_col1:
+        st.button("◀ 이전", use_container_width=True, key="search_prev_page",
+                  disabled=page_no <= 1, on_click=go_prev_page)
+    with nav_col3:
+        st.button("다음 ▶", use_container_width=True, key="search_next_page",
+                  disabled=st.session_state.next_cursor is None, on_click=go_next_page)
     
     st.dataframe(
         results_df, 
@@ -105,7 +207,8 @@ else:
         selection_mode="single-row", 
         column_config={
             "리콜ID": None, 
-            "리콜사유": st.column_config.TextColumn("리콜사유", width="large")
+            "리콜사유": st.column_config.TextColumn("리콜사유", width="large"),
+            "키워드": st.column_config.TextColumn("키워드", width="medium")
         }
     )
     
@@ -122,6 +225,10 @@ else:
             st.subheader(f"🔍 선택된 리콜 상세") 
             st.markdown(f"**전체 리콜 사유:**")
             st.info(selected_reason) 
+            # [수정] 키워드는 검색 결과에 함께 포함되어 있으므로 추가 조회 없이 표시
+            selected_keywords = selected_row.get('키워드')
+            if selected_keywords:
+                st.markdown(f"**관련 키워드:** {selected_keywords}")
         
         except IndexError:
             pass
@@ -1,18 +1,20 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from wordcloud import WordCloud 
-import matplotlib.pyplot as plt 
-import os 
 import datetime 
 
 from backend.search_queries import (
     get_all_brands, 
     get_models_by_brand, 
     get_recall_comparison, 
-    get_model_profile_data
+    get_model_history,
+    compare_models,
+    COMPARE_MAX_MODELS,
+    MODEL_HISTORY_PAGE_SIZE
 )
 from backend.stats_queries import get_summary_stats, get_brand_rankings
+from backend.wordcloud_service import get_model_wordcloud_png, find_font_path, FONT_MISSING_MESSAGE, WordCloud
+from backend import query_executor
 
 # --- 헤더 함수 임포트 ---
 try:
@@ -36,21 +38,35 @@ st.title("📊 분석 리포트")
 st.info("차량 비교, 브랜드 랭킹, 개별 모델 분석 기능을 제공합니다.")
 st.markdown("---")
 
+# --- [신규] 하단 데이터 기준 기간은 어느 화면에서나 표시하므로 먼저 조회를 시작 ---
+summary_stats_future = query_executor.submit(get_summary_stats)
 
-# --- [2] 탭(Tabs) 생성 ---
-tab_compare, tab_brand, tab_model = st.tabs([
-    "📊 차량 비교", 
-    "🏆 브랜드 리포트", 
-    "🔍 모델 프로필"
-])
+
+# --- [2] 화면 선택 ---
+# [수정] st.tabs 는 rerun 마다 모든 탭의 내용을 실행하므로(선택된 탭을 알 수 없음),
+#        라디오로 고른 화면 하나만 그리고 그 화면에 필요한 조회만 제출합니다.
+VIEW_COMPARE = "📊 차량 비교"
+VIEW_BRAND = "🏆 브랜드 리포트"
+VIEW_MODEL = "🔍 모델 프로필"
+report_view = st.radio(
+    "리포트 선택", [VIEW_COMPARE, VIEW_BRAND, VIEW_MODEL],
+    horizontal=True, key="report_view", label_visibility="collapsed"
+)
+
+
+def reset_history_page():
+    """[신규] 모델 프로필의 차종/연도/키워드가 바뀌면 상세 이력 페이지를 1로 되돌립니다. (선택 상자 on_change)"""
+    # 페이지 입력이 아직 그려지지 않았으면(차종 미선택) 값을 만들지 않음 → number_input 의 value=1 과 충돌 경고 방지
+    if "model_history_page" in st.session_state:
+        st.session_state["model_history_page"] = 1
 
 
 # ==============================================================================
-# --- [ 탭 1: 차량 비교 ] ---
+# --- [ 화면 1: 차량 비교 ] ---
 # ==============================================================================
-with tab_compare:
+if report_view == VIEW_COMPARE:
     st.header("차량 비교")
-    st.info("비교하고 싶은 두 차량을 선택하고 '비교하기' 버튼을 눌러주세요.")
+    st.info(f"비교하고 싶은 차량(2~{COMPARE_MAX_MODELS}대)을 선택하고 '비교하기' 버튼을 눌러주세요.")
 
     # --- 차량 선택 UI ---
     try:
@@ -58,91 +74,71 @@ with tab_compare:
     except Exception as e:
         st.error(f"브랜드 목록 로딩 실패: {e}")
         brand_list_for_compare = ["전체"]
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.subheader("차량 1 (비교 대상)")
-        brand1 = st.selectbox("브랜드 선택", brand_list_for_compare, key="brand1", index=0)
-        if brand1 != "전체":
-            model_list1 = ["전체"] + get_models_by_brand(brand1)
-        else:
-            model_list1 = ["전체"]
-        model1 = st.selectbox("차종 선택", model_list1, key="model1", index=0)
-    with col2:
-        st.subheader("차량 2 (비교 대상)")
-        brand2 = st.selectbox("브랜드 선택", brand_list_for_compare, key="brand2", index=0)
-        if brand2 != "전체":
-            model_list2 = ["전체"] + get_models_by_brand(brand2)
-        else:
-            model_list2 = ["전체"]
-        model2 = st.selectbox("차종 선택", model_list2, key="model2", index=0)
+
+    # [수정] 2대 고정 → 2~5대 선택
+    compare_count = st.selectbox(
+        "비교할 차량 수", list(range(2, COMPARE_MAX_MODELS + 1)), key="compare_count", index=0
+    )
+    car_icons = ["🚗", "🚙", "🚕", "🚓", "🚐"]
+
+    selected_cars = []
+    select_cols = st.columns(compare_count)
+    for i, select_col in enumerate(select_cols, start=1):
+        with select_col:
+            st.subheader(f"차량 {i}")
+            brand_i = st.selectbox("브랜드 선택", brand_list_for_compare, key=f"brand{i}", index=0)
+            if brand_i != "전체":
+                model_list_i = ["전체"] + get_models_by_brand(brand_i)
+            else:
+                model_list_i = ["전체"]
+            model_i = st.selectbox("차종 선택", model_list_i, key=f"model{i}", index=0)
+            selected_cars.append((brand_i, model_i))
 
     st.markdown("---")
 
     # --- 비교 결과 표시 ---
     if st.button("비교하기", use_container_width=True, key="compare_button"):
-        if (brand1 == "전체" or model1 == "전체") or (brand2 == "전체" or model2 == "전체"):
-            st.error("오류: 2대의 차량(브랜드와 차종)을 모두 정확히 선택해야 합니다.")
+        if any(brand == "전체" or model == "전체" for brand, model in selected_cars):
+            st.error(f"오류: {compare_count}대의 차량(브랜드와 차종)을 모두 정확히 선택해야 합니다.")
         else:
-            st.subheader(f"📊 {brand1} {model1}  vs  {brand2} {model2}  비교 결과")
+            st.subheader("📊 " + "  vs  ".join(f"{brand} {model}" for brand, model in selected_cars) + "  비교 결과")
             
-            with st.spinner("두 차량의 리콜 데이터를 분석 중입니다..."):
-                stats1, keywords_df1 = get_recall_comparison(brand1, model1)
-                stats2, keywords_df2 = get_recall_comparison(brand2, model2)
+            with st.spinner(f"{compare_count}대 차량의 리콜 데이터를 분석 중입니다..."):
+                # [수정] 차량 수와 관계없이 한 번의 일괄 조회
+                comparisons = compare_models(selected_cars)
 
-            res_col1, res_col2 = st.columns(2)
-            
-            with res_col1:
-                st.markdown(f"#### 🚗 **{brand1} {model1}**")
-                if stats1 and stats1['total_recalls'] > 0:
-                    metric_cols1 = st.columns(2)
-                    metric_cols1[0].metric("총 리콜 건수", f"{stats1['total_recalls']} 건")
-                    metric_cols1[1].metric("평균 시정률", f"{stats1['avg_correction_rate']} %")
-                    st.markdown("**주요 리콜 키워드 (Top 10)**")
-                    if not keywords_df1.empty:
-                        chart1 = alt.Chart(keywords_df1).mark_bar().encode(
-                            x=alt.X('keyword_text', title='리콜 키워드', sort=None, axis=alt.Axis(labelAngle=-45)),
-                            y=alt.Y('keyword_count', title='키워드 빈도'),
-                            tooltip=[
-                                alt.Tooltip('keyword_text', title='키워드'),
-                                alt.Tooltip('keyword_count', title='빈도수'),
-                                alt.Tooltip('keyword_desc', title='설명')
-                            ]
-                        ).properties(height=350).interactive()
-                        st.altair_chart(chart1, use_container_width=True)
+            res_cols = st.columns(compare_count)
+            for i, (res_col, (brand_i, model_i), (stats_i, keywords_df_i)) in enumerate(
+                zip(res_cols, selected_cars, comparisons)
+            ):
+                with res_col:
+                    st.markdown(f"#### {car_icons[i % len(car_icons)]} **{brand_i} {model_i}**")
+                    if stats_i and stats_i['total_recalls'] > 0:
+                        metric_cols_i = st.columns(2)
+                        metric_cols_i[0].metric("총 리콜 건수", f"{stats_i['total_recalls']} 건")
+                        metric_cols_i[1].metric("평균 시정률", f"{stats_i['avg_correction_rate']} %")
+                        st.markdown("**주요 리콜 키워드 (Top 10)**")
+                        if not keywords_df_i.empty:
+                            chart_i = alt.Chart(keywords_df_i).mark_bar().encode(
+                                x=alt.X('keyword_text', title='리콜 키워드', sort=None, axis=alt.Axis(labelAngle=-45)),
+                                y=alt.Y('keyword_count', title='키워드 빈도'),
+                                tooltip=[
+                                    alt.Tooltip('keyword_text', title='키워드'),
+                                    alt.Tooltip('keyword_count', title='빈도수'),
+                                    alt.Tooltip('keyword_desc', title='설명')
+                                ]
+                            ).properties(height=350).interactive()
+                            st.altair_chart(chart_i, use_container_width=True)
+                        else:
+                            st.info("분석된 키워드 데이터가 없습니다.")
                     else:
-                        st.info("분석된 키워드 데이터가 없습니다.")
-                else:
-                    st.warning("해당 차종의 리콜 데이터가 없습니다.")
-            
-            with res_col2:
-                st.markdown(f"#### 🚙 **{brand2} {model2}**")
-                if stats2 and stats2['total_recalls'] > 0:
-                    metric_cols2 = st.columns(2)
-                    metric_cols2[0].metric("총 리콜 건수", f"{stats2['total_recalls']} 건")
-                    metric_cols2[1].metric("평균 시정률", f"{stats2['avg_correction_rate']} %")
-                    st.markdown("**주요 리콜 키워드 (Top 10)**")
-                    if not keywords_df2.empty:
-                        chart2 = alt.Chart(keywords_df2).mark_bar().encode(
-                            x=alt.X('keyword_text', title='리콜 키워드', sort=None, axis=alt.Axis(labelAngle=-45)),
-                            y=alt.Y('keyword_count', title='키워드 빈도'),
-                            tooltip=[
-                                alt.Tooltip('keyword_text', title='키워드'),
-                                alt.Tooltip('keyword_count', title='빈도수'),
-                                alt.Tooltip('keyword_desc', title='설명')
-                            ]
-                        ).properties(height=350).interactive()
-                        st.altair_chart(chart2, use_container_width=True)
-                    else:
-                        st.info("분석된 키워드 데이터가 없습니다.")
-                else:
-                    st.warning("해당 차종의 리콜 데이터가 없습니다.")
+                        st.warning("해당 차종의 리콜 데이터가 없습니다.")
 
 
 # ==============================================================================
-# --- [ 탭 2: 브랜드 리포트 ] ---
+# --- [ 화면 2: 브랜드 리포트 ] ---
 # ==============================================================================
-with tab_brand:
+elif report_view == VIEW_BRAND:
     st.header("브랜드 리포트")
     st.info("DB에 저장된 전체 브랜드를 대상으로 '리콜 건수'와 '평균 시정률' 순위를 분석합니다.")
     
@@ -188,9 +184,9 @@ with tab_brand:
 
 
 # ==============================================================================
-# --- [ 탭 3: 모델 프로필 ] ---
+# --- [ 화면 3: 모델 프로필 ] ---
 # ==============================================================================
-with tab_model:
+elif report_view == VIEW_MODEL:
     st.header("모델 상세 프로필")
     st.info("관심 있는 차량의 종합 리콜 리포트를 확인해 보세요.")
     
@@ -203,7 +199,7 @@ with tab_model:
         brand_list_profile = ["전체"]
     
     selected_brand_profile = st.selectbox(
-        "1. 브랜드 선택", brand_list_profile, key="profile_brand", index=0
+        "1. 브랜드 선택", brand_list_profile, key="profile_brand", index=0, on_change=reset_history_page
     )
     
     if selected_brand_profile != "전체":
@@ -216,7 +212,7 @@ with tab_model:
         model_list_profile = ["전체"] 
     
     selected_model_profile = st.selectbox(
-        "2. 차종 선택", model_list_profile, key="profile_model", index=0
+        "2. 차종 선택", model_list_profile, key="profile_model", index=0, on_change=reset_history_page
     )
     st.markdown("---") # 구분선 추가
     # --- [★ 수정] 차량 선택 로직 끝 ---
@@ -225,11 +221,21 @@ with tab_model:
     if selected_brand_profile != "전체" and selected_model_profile != "전체":
         st.subheader(f"🚗 {selected_brand_profile} {selected_model_profile} 리포트")
         
+        # [수정] 통계/키워드, 워드 클라우드, 상세 이력(현재 필터 값)을 동시에 조회
+        prefetch_history_args = (
+            selected_brand_profile, selected_model_profile,
+            st.session_state.get("model_year_filter", "전체"),
+            st.session_state.get("model_keyword_filter", "전체"),
+            int(st.session_state.get("model_history_page", 1))
+        )
+        comparison_future = query_executor.submit(get_recall_comparison, selected_brand_profile, selected_model_profile)
+        wordcloud_future = query_executor.submit(get_model_wordcloud_png, selected_brand_profile, selected_model_profile)
+        history_future = query_executor.submit(get_model_history, *prefetch_history_args)
+
         with st.spinner(f"'{selected_model_profile}' 모델의 데이터를 분석 중입니다..."):
-            stats, keywords_df = get_recall_comparison(selected_brand_profile, selected_model_profile)
-            history_df, all_reasons_string = get_model_profile_data(selected_brand_profile, selected_model_profile)
+            stats, keywords_df = query_executor.result(comparison_future)
 
-        if stats is None or history_df.empty:
+        if not stats or stats['total_recalls'] == 0:
             st.warning("해당 모델의 리콜 데이터를 찾을 수 없습니다.")
         else:
             st.markdown("#### 📊 종합 통계")
@@ -241,22 +247,15 @@ with tab_model:
             viz_col1, viz_col2 = st.columns(2)
             with viz_col1:
                 st.markdown("#### ☁️ 리콜 사유 워드 클라우드")
-                if all_reasons_string:
-                    try:
-                        font_path = None
-                        if os.path.exists("c:/Windows/Fonts/malgun.ttf"):
-                            font_path = "c:/Windows/Fonts/malgun.ttf"
-                        wordcloud = WordCloud(
-                            font_path=font_path, width=800, height=400, 
-                            background_color='white'
-                        ).generate(all_reasons_string)
-                        fig, ax = plt.subplots()
-                        ax.imshow(wordcloud, interpolation='bilinear')
-                        ax.axis("off")
-                        st.pyplot(fig)
-                    except Exception as e:
-                        st.error(f"워드 클라우드 생성 오류: {e}")
-                        st.info("한글 폰트(malgun.ttf)를 찾을 수 없거나, wordcloud 라이브러리 문제입니다.")
+                # [수정] 매 rerun 마다 새로 그리던 WordCloud + matplotlib Figure 대신 캐시된 PNG 사용
+                wordcloud_png = query_executor.result(wordcloud_future)
+                if wordcloud_png:
+                    st.image(wordcloud_png, use_container_width=True)
+                    if find_font_path() is None:
+                        st.warning(FONT_MISSING_MESSAGE)
+                elif WordCloud is None:
+                    st.error("워드 클라우드 생성 오류")
+                    st.info("wordcloud 라이브러리가 설치되어 있지 않습니다.")
                 else:
                     st.info("워드 클라우드를 생성할 리콜 사유 데이터가 없습니다.")
 
@@ -280,29 +279,40 @@ with tab_model:
             st.markdown("#### 📋 상세 리콜 이력 검색")
             st.info("특정 연도 또는 키워드로 전체 리콜 이력을 필터링할 수 있습니다.")
 
-            search_col1, search_col2 = st.columns(2)
+            search_col1, search_col2, search_col3 = st.columns(3)
             with search_col1:
                 current_year = datetime.date.today().year
                 year_list = ["전체"] + list(range(current_year, 2014, -1))
-                selected_year = st.selectbox("연도 선택", year_list, key="model_year_filter")
+                selected_year = st.selectbox("연도 선택", year_list, key="model_year_filter",
+                                             on_change=reset_history_page)
             with search_col2:
                 try:
                     keyword_list = ["전체"] + sorted(list(keywords_df['keyword_text'].unique()))
                 except:
                     keyword_list = ["전체"]
-                selected_keyword = st.selectbox("키워드 선택", keyword_list, key="model_keyword_filter")
-            
-            filtered_history_df = history_df.copy()
-            if selected_year != "전체":
-                filtered_history_df = filtered_history_df[
-                    pd.to_datetime(filtered_history_df['리콜개시일']).dt.year == selected_year
-                ]
-            if selected_keyword != "전체":
-                filtered_history_df = filtered_history_df[
-                    filtered_history_df['리콜사유'].str.contains(selected_keyword, na=False)
-                ]
-
-            st.dataframe(filtered_history_df, use_container_width=True, height=400)
+                selected_keyword = st.selectbox("키워드 선택", keyword_list, key="model_keyword_filter",
+                                                on_change=reset_history_page)
+            with search_col3:
+                history_page = st.number_input("페이지", min_value=1, value=1, step=1, key="model_history_page")
+
+            # [수정] history_df.copy() + pd.to_datetime + str.contains 대신 DB 에서 필터링한 한 페이지만 조회
+            history_args = (
+                selected_brand_profile, selected_model_profile, selected_year, selected_keyword, int(history_page)
+            )
+            if history_args == prefetch_history_args:
+                filtered_history_df, history_total = query_executor.result(history_future)
+            else:  # 키워드 목록에 없는 이전 선택값이 초기화된 경우 등
+                filtered_history_df, history_total = get_model_history(*history_args)
+            total_pages = max(1, -(-history_total // MODEL_HISTORY_PAGE_SIZE))
+            if history_page > total_pages:
+                st.warning(f"페이지 범위를 벗어났습니다. (전체 {total_pages} 페이지)")
+            else:
+                st.caption(f"조건에 맞는 리콜 {history_total}건 (페이지 {int(history_page)}/{total_pages})")
+
+            st.dataframe(
+                filtered_history_df, use_container_width=True, height=400,
+                column_config={'리콜개시일': st.column_config.DateColumn('리콜개시일', format="YYYY-MM-DD")}
+            )
     else:
         # --- [★ 수정] 안내 문구 수정 ---
         st.info("☝️ 위에서 분석할 브랜드와 차종을 선택해 주세요.")
@@ -312,7 +322,7 @@ with tab_model:
 # --- [ 공통 하단 ] ---
 # ==============================================================================
 try:
-    summary_stats = get_summary_stats()
+    summary_stats = query_executor.result(summary_stats_future)
     min_date, max_date = summary_stats['data_period']
     st.markdown("---")
     if min_date != 'N/A':
@@ -0,0 +1,192 @@
+# 파일 이름: check_query_plans.py
+# (경로: sql/check_query_plans.py)
+# backend 의 모든 조회 함수를 실제로 실행하면서, 실행되는 쿼리마다 EXPLAIN 을 함께 돌려
+# 큰 테이블(Recall, Recall_Keyword_Junction, Model)을 풀 스캔(type=ALL)하는 쿼리가 있으면 실패합니다.
+#   (프로젝트 루트에서) python sql/check_query_plans.py
+# .streamlit/secrets.toml 의 DB 정보를 사용하며, 실패 시 종료 코드 1 을 반환합니다.
+
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date
+
+# 프로젝트 루트를 import 경로에 추가 (backend 패키지 사용)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from backend import db_manager, keyword_index, search_queries, snapshot, stats_queries, wordcloud_service
+
+# 풀 스캔이 나오면 안 되는 테이블과 backend 쿼리에서 쓰는 별칭 (EXPLAIN 의 table 컬럼에는 별칭이 나옴)
+# (Brand, Keyword 처럼 작은 테이블은 옵티마이저가 ALL 을 고를 수 있으므로 제외)
+LARGE_TABLES = {
+    'recall', 'r',
+    'recall_keyword_junction', 'rkj', 'j',
+    'model', 'm',
+    'recall_cube', 'c',
+    'model_term_freq',
+}
+
+_current_plans = []
+
+
+class _ExplainingCursor:
+    """execute() 전에 같은 쿼리/파라미터로 EXPLAIN 을 실행해 계획을 기록하는 커서 래퍼"""
+
+    def __init__(self, conn, cursor):
+        self._conn = conn
+        self._cursor = cursor
+
+    def execute(self, query, params=None, *args, **kwargs):
+        explain_cursor = self._conn.cursor(dictionary=True)
+        try:
+            explain_cursor.execute("EXPLAIN " + query.strip().rstrip(';'), params)
+            _current_plans.append((query, explain_cursor.fetchall()))
+        finally:
+            explain_cursor.close()
+        return self._cursor.execute(query, params, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class _ExplainingConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return _ExplainingCursor(self._conn, self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+_original_get_connection = db_manager.get_connection
+
+
+@contextmanager
+def _explaining_get_connection():
+    with _original_get_connection() as conn:
+        yield _ExplainingConnection(conn) if conn is not None else None
+
+
+def _unwrap(func):
+    """backend.cache.cached 캐시를 거치지 않도록 원본 함수(__wrapped__)를 꺼냅니다."""
+    return getattr(func, '__wrapped__', func)
+
+
+def _sample_values():
+    """검사에 쓸 실제 브랜드/차종/키워드/리콜ID/차종ID 와 비교용 두 번째 (브랜드, 차종) 을 DB 에서 고릅니다."""
+    with _original_get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+        SELECT b.brand_name, m.model_name, r.recall_id, r.model_id
+        FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+        ORDER BY r.recall_id LIMIT 1
+        """)
+        brand, model, recall_id, model_id = cursor.fetchone()
+        # 차종 비교(compare_models)가 큐브 경로를 타도록 리콜이 있는 다른 실제 차종을 하나 더 고름
+        cursor.execute("""
+        SELECT b.brand_name, m.model_name
+        FROM Model m JOIN Brand b ON m.brand_id = b.brand_id
+        WHERE m.model_id <> %s AND EXISTS (SELECT 1 FROM Recall r WHERE r.model_id = m.model_id)
+        ORDER BY m.model_id LIMIT 1
+        """, (model_id,))
+        other_pair = cursor.fetchone() or (brand, model)
+        cursor.execute("SELECT keyword_text FROM Keyword ORDER BY keyword_id LIMIT 1")
+        keyword = cursor.fetchone()[0]
+        cursor.execute("SELECT YEAR(MAX(recall_date)) FROM Recall")
+        year = cursor.fetchone()[0]
+        cursor.close()
+    return brand, model, year, keyword, recall_id, model_id, tuple(other_pair)
+
+
+def build_scenarios():
+    """(이름, 함수, 인자, 전체 집계라 풀 스캔 허용 여부) 목록"""
+    brand, model, year, keyword, recall_id, model_id, other_pair = _sample_values()
+    sq, stq = search_queries, stats_queries
+    return [
+        ("get_all_keywords_with_desc", sq.get_all_keywords_with_desc, (), False),
+        ("search_recalls(전체)", sq.search_recalls, ("전체", "전체", "전체", "전체"), False),
+        ("search_recalls(브랜드)", sq.search_recalls, (brand, "전체", "전체", "전체"), False),
+        ("search_recalls(브랜드+차종)", sq.search_recalls, (brand, model, "전체", "전체"), False),
+        ("search_recalls(연도)", sq.search_recalls, ("전체", "전체", year, "전체"), False),
+        ("search_recalls(키워드)", sq.search_recalls, ("전체", "전체", "전체", keyword), False),
+        ("search_recalls(전체 조건)", sq.search_recalls, (brand, model, year, keyword), False),
+        ("search_recalls_page(첫 페이지+건수)", sq.search_recalls_page,
+         (brand, "전체", "전체", keyword, None, sq.SEARCH_PAGE_SIZE, True), False),
+        ("search_recalls_page(다음 페이지)", sq.search_recalls_page,
+         ("전체", "전체", "전체", "전체", sq.encode_search_cursor(date.today(), recall_id + 1)), False),
+        ("search_recalls_page(키워드 식, IN 목록)", sq.search_recalls_page,
+         (brand, "전체", "전체", "전체", None, sq.SEARCH_PAGE_SIZE, True, keyword), False),
+        # 전체 리콜이 일치 → MAX_KEYWORD_EXPR_IDS 초과로 EXISTS / NOT EXISTS 조건 경로
+        ("search_recalls_page(키워드 식, EXISTS)", sq.search_recalls_page,
+         (brand, "전체", "전체", "전체", None, sq.SEARCH_PAGE_SIZE, True, f"{keyword} OR NOT {keyword}"), False),
+        ("search_recalls_page(리콜사유 검색어)", sq.search_recalls_page,
+         ("전체", "전체", "전체", "전체", None, sq.SEARCH_PAGE_SIZE, True, None, keyword), False),
+        ("search_recalls_ranked", sq.search_recalls_ranked, (keyword,), False),
+        ("get_recall_comparison", sq.get_recall_comparison, (brand, model), False),
+        ("get_recall_comparison(live)", sq.get_recall_comparison, (brand, model, True), False),
+        ("compare_models", sq.compare_models, ([(brand, model), other_pair],), False),
+        ("compare_models(live)", sq.compare_models, ([(brand, model), other_pair], True), False),
+        ("get_model_profile_data", sq.get_model_profile_data, (brand, model), False),
+        ("get_model_history", sq.get_model_history, (brand, model), False),
+        ("get_model_history(연도+키워드+2페이지)", sq.get_model_history, (brand, model, year, keyword, 2), False),
+        ("get_keywords_for_recall", sq.get_keywords_for_recall, (recall_id,), False),
+        ("wordcloud_service._fetch_model_reasons", wordcloud_service._fetch_model_reasons, (model_id,), False),
+        ("wordcloud_service._fetch_term_frequencies", wordcloud_service._fetch_term_frequencies, (model_id,), False),
+        ("get_summary_stats", stq._fetch_summary_stats, (), False),
+        ("get_top_models", stq.get_top_models, (20,), False),
+        # 아래는 전체 데이터를 집계하는 쿼리라 풀 스캔이 정상입니다.
+        ("get_summary_stats(live)", stq._fetch_summary_stats, (True,), True),
+        ("get_catalog", sq.get_catalog, (), True),
+        ("get_brand_rankings", stq.get_brand_rankings, (), False),
+        ("get_brand_rankings(live)", stq.get_brand_rankings, (True,), True),
+    ]
+
+
+def find_full_scans(plans):
+    """EXPLAIN 결과에서 큰 테이블의 풀 스캔 행을 찾습니다."""
+    problems = []
+    for query, plan_rows in plans:
+        for plan in plan_rows:
+            table = (plan.get('table') or '').lower()
+            if plan.get('type') == 'ALL' and table in LARGE_TABLES:
+                problems.append((query, plan))
+    return problems
+
+
+def main():
+    db_manager.get_connection = _explaining_get_connection
+    snapshot.is_enabled = lambda: False  # 인메모리 스냅샷을 끄고 SQL 경로의 계획을 검사
+    keyword_index.get_keyword_index()    # 키워드 인덱스 로딩(전체 읽기)은 검사 전에 미리 수행
+    failures = 0
+    for name, func, args, allow_full_scan in build_scenarios():
+        _current_plans.clear()
+        _unwrap(func)(*args)
+        if not _current_plans:
+            print(f"[확인 불가] {name}: 실행된 쿼리가 없습니다.")
+            failures += 1
+            continue
+
+        problems = [] if allow_full_scan else find_full_scans(_current_plans)
+        if problems:
+            failures += 1
+            print(f"[실패] {name}: 풀 스캔 {len(problems)}건")
+            for query, plan in problems:
+                print(f"   table={plan.get('table')} type={plan.get('type')} rows={plan.get('rows')} "
+                      f"Extra={plan.get('Extra')}")
+                print("   " + " ".join(query.split())[:200])
+        else:
+            note = " (전체 집계, 풀 스캔 허용)" if allow_full_scan else ""
+            print(f"[통과] {name}: 쿼리 {len(_current_plans)}개{note}")
+
+    print(f"\n총 {failures}건 실패")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
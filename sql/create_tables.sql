@@ -52,8 +52,10 @@ CREATE TABLE IF NOT EXISTS Recall (
     recall_count INT COMMENT '리콜 대수',
     correction_count INT COMMENT '시정 대수',
     correction_rate FLOAT COMMENT '시정률',
+    content_hash CHAR(40) COMMENT '원본 행 식별 해시 (제작자/차명/사유/생산기간/개시일, 증분 적재용)',
     
-    FOREIGN KEY (model_id) REFERENCES Model(model_id)
+    FOREIGN KEY (model_id) REFERENCES Model(model_id),
+    UNIQUE KEY uk_recall_content_hash (content_hash)
 ) ENGINE=InnoDB COMMENT='리콜 상세 내역 (원본 데이터)';
 
 
@@ -69,8 +71,81 @@ CREATE TABLE IF NOT EXISTS Recall_Keyword_Junction (
     FOREIGN KEY (keyword_id) REFERENCES Keyword(keyword_id)
 ) ENGINE=InnoDB COMMENT='리콜과 키워드 N:M 연결 테이블';
 
-ALTER TABLE Keyword
-ADD COLUMN keyword_desc TEXT COMMENT '키워드 상세 설명' AFTER keyword_text;
+-- ---------------------------------------------------
+-- 6. Recall_Summary (요약 통계) 테이블  (★ 신규)
+--    load_data_from_excel.py 가 적재 후 갱신하는 1행짜리 요약 테이블 (sql/migrations/V006 과 동일)
+-- ---------------------------------------------------
+CREATE TABLE IF NOT EXISTS Recall_Summary (
+    summary_id TINYINT PRIMARY KEY COMMENT '요약ID (항상 1)',
+    total_recalls INT NOT NULL DEFAULT 0 COMMENT '총 리콜 건수',
+    total_brands INT NOT NULL DEFAULT 0 COMMENT '총 브랜드 수',
+    total_models INT NOT NULL DEFAULT 0 COMMENT '총 차종 수',
+    top_brand_name VARCHAR(100) COMMENT '최다 리콜 브랜드명',
+    top_brand_count INT NOT NULL DEFAULT 0 COMMENT '최다 리콜 브랜드의 리콜 건수',
+    min_recall_date DATE COMMENT '데이터 기준 기간(시작)',
+    max_recall_date DATE COMMENT '데이터 기준 기간(끝)',
+    data_version INT NOT NULL DEFAULT 1 COMMENT '데이터 버전 (갱신 시마다 +1)',
+    refreshed_at DATETIME COMMENT '마지막 갱신 시각'
+) ENGINE=InnoDB COMMENT='요약 대시보드용 통계 (로더가 갱신)';
+
+-- ---------------------------------------------------
+-- 7. Recall_Cube (브랜드/차종/연도/키워드 집계) 테이블  (★ 신규)
+--    load_data_from_excel.py 가 적재 후 다시 만드는 집계 테이블 (sql/migrations/V003 과 동일)
+--    keyword_id = 0 은 키워드와 무관한 '전체 리콜' 행, recall_year = 0 은 리콜개시일 없음
+-- ---------------------------------------------------
+CREATE TABLE IF NOT EXISTS Recall_Cube (
+    brand_id INT NOT NULL COMMENT '브랜드ID',
+    model_id INT NOT NULL COMMENT '차종ID',
+    recall_year SMALLINT NOT NULL COMMENT '리콜 연도 (개시일 기준, 없으면 0)',
+    keyword_id INT NOT NULL COMMENT '키워드ID (0 = 전체 리콜)',
+    recall_count INT NOT NULL DEFAULT 0 COMMENT '리콜 건수',
+    recall_units BIGINT NOT NULL DEFAULT 0 COMMENT '리콜 대수 합계',
+    correction_units BIGINT NOT NULL DEFAULT 0 COMMENT '시정 대수 합계',
+    rate_sum DOUBLE NOT NULL DEFAULT 0 COMMENT '시정률 합계 (평균 = rate_sum / rate_count)',
+    rate_count INT NOT NULL DEFAULT 0 COMMENT '시정률이 있는 리콜 건수',
+
+    PRIMARY KEY (brand_id, model_id, recall_year, keyword_id),
+    KEY idx_cube_keyword_model (keyword_id, model_id)
+) ENGINE=InnoDB COMMENT='리포트용 집계 큐브 (로더가 갱신)';
+
+-- ---------------------------------------------------
+-- 8. Model_Term_Freq (차종별 리콜 사유 단어 빈도) 테이블  (★ 신규)
+--    load_data_from_excel.py 가 적재 후 다시 만드는 집계 테이블 (sql/migrations/V004 와 동일)
+--    모델 프로필 워드 클라우드용 (backend/korean_terms.py 로 어미/조사 제거, 불용어 제외)
+-- ---------------------------------------------------
+CREATE TABLE IF NOT EXISTS Model_Term_Freq (
+    model_id INT NOT NULL COMMENT '차종ID',
+    term VARCHAR(50) NOT NULL COMMENT '단어',
+    term_count INT NOT NULL COMMENT '해당 차종 리콜 사유에서의 등장 횟수',
+
+    PRIMARY KEY (model_id, term),
+    KEY idx_term_freq_model_count (model_id, term_count)
+) ENGINE=InnoDB COMMENT='차종별 리콜 사유 단어 빈도 (로더가 갱신)';
+
+-- ---------------------------------------------------
+-- 9. Load_Checkpoint (적재 체크포인트) 테이블  (★ 신규)
+--    load_data_from_excel.py --mode resumable 이 commit_every 행마다 갱신 (sql/migrations/V005 와 동일)
+--    중간에 실패해도 다음 실행이 last_row 부터 이어서 적재
+-- ---------------------------------------------------
+CREATE TABLE IF NOT EXISTS Load_Checkpoint (
+    source_key CHAR(40) NOT NULL COMMENT '원본 파일 해시 + 태그의 SHA-1',
+    source_name VARCHAR(255) NOT NULL COMMENT '원본 파일 이름',
+    last_row INT NOT NULL DEFAULT 0 COMMENT '커밋된 원본 행 수 (다음 적재 시작 위치)',
+    last_content_hash CHAR(40) COMMENT '마지막으로 커밋된 청크의 마지막 행 content_hash (재개 시 원본 확인용)',
+    rows_loaded INT NOT NULL DEFAULT 0 COMMENT '지금까지 INSERT/UPDATE 한 Recall 행 수',
+    status VARCHAR(10) NOT NULL DEFAULT 'running' COMMENT 'running: 적재 중(재개 가능) / done: 완료',
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '마지막 커밋 시각',
+
+    PRIMARY KEY (source_key)
+) ENGINE=InnoDB COMMENT='재개 가능한 적재의 원본별 체크포인트 (로더가 갱신)';
+
+-- [기존 DB 업그레이드] keyword_desc 컬럼이 없는 예전 Keyword 테이블만 아래 문장을 실행
+--   (새로 설치할 때는 3번 CREATE TABLE 에 이미 있으므로 실행하면 중복 컬럼 오류)
+-- ALTER TABLE Keyword
+-- ADD COLUMN keyword_desc TEXT COMMENT '키워드 상세 설명' AFTER keyword_text;
+
+-- [기존 DB 업그레이드] content_hash 컬럼이 없는 Recall 테이블은 sql/migrations/V007 로 추가 (python sql/migrate.py)
+--   (V007 은 컬럼/키가 이미 있으면 건너뛰므로 이 스크립트로 새로 설치한 뒤 migrate.py 를 실행해도 됩니다.)
 
 -- DROP Table brand;
 -- DROP Table keyword;
@@ -5,9 +5,23 @@ import pandas as pd
 import numpy as np
 import re
 import os
+import sys
+import hashlib
+import codecs
+import time
+import argparse
 import mysql.connector
 from mysql.connector import Error
 
+# [신규] 프로젝트 루트를 import 경로에 추가 (backend 패키지의 공용 모듈 사용)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+from backend import materialized
+from backend import recall_cleaning
+from backend import staging
+from backend.keyword_tagger import KeywordTagger
+
 # --- [필수] 설정 ---
 
 # 1. DB 접속 정보
@@ -33,6 +47,14 @@ SHEET_NAMES = [
     '리콜현황', 
     '그외 차량 리콜 현황'
 ]
+
+# 5. [신규] 한국교통안전공단 원본 CSV (--csv 옵션으로 Excel 없이 바로 스트리밍 적재)
+CSV_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', '한국교통안전공단_자동차 리콜대수 및 시정률_20221231.csv')
+CSV_ENCODINGS = ['cp949', 'utf-8']
+DEFAULT_CHUNK_SIZE = 2000
+
+# 6. [신규] 적재하지 못한 행과 사유를 남기는 사이드카 CSV 폴더 (원본 파일마다 <원본 이름>.rejected.csv)
+REJECTS_DIR = os.path.join(PROJECT_ROOT, 'data', 'rejects')
 # ----------------------------------------
 
 # --- 키워드 목록 (설명 포함) ---
@@ -92,148 +114,522 @@ def load_and_clean_data(file_path, sheets):
 
     df_raw = pd.concat(df_list, ignore_index=True)
     
-    # [전처리] (이하 동일)
-    df_raw.columns = df_raw.columns.str.strip()
-    date_cols = ['생산기간(부터)', '생산기간(까지)', '리콜개시일']
-    for col in date_cols:
-        df_raw[col] = pd.to_datetime(df_raw[col].astype(str).str.replace(r'[^\d]', '', regex=True),
-                                   format='%Y%m%d', errors='coerce')
-    
-    if '시정율(퍼센트)' in df_raw.columns:
-        df_raw.rename(columns={'시정율(퍼센트)': '시정률(퍼센트)'}, inplace=True)
-    
-    # '시정률(퍼센트)' 컬럼이 없는 경우를 대비 (원본 파일에 '시정율'만 있을 수 있음)
-    elif '시정율' in df_raw.columns:
-         df_raw.rename(columns={'시정율': '시정률(퍼센트)'}, inplace=True)
-         
-    # 두 컬럼 다 없으면 새로 생성
-    if '시정률(퍼센트)' not in df_raw.columns:
-        print("[정보] '시정률(퍼센트)' 컬럼이 없어 새로 생성합니다.")
-        df_raw['시정률(퍼센트)'] = 0.0 # 기본값 0
-
-    df_raw['리콜대수'] = pd.to_numeric(df_raw['리콜대수'], errors='coerce').fillna(0).astype(int)
-    df_raw['시정대수'] = pd.to_numeric(df_raw['시정대수'], errors='coerce').fillna(0).astype(int)
-    df_raw['시정률(퍼센트)'] = pd.to_numeric(df_raw['시정률(퍼센트)'], errors='coerce').fillna(0).astype(float)
-
-    df_cleaned = df_raw.where(pd.notnull(df_raw), None)
-    df_cleaned = df_cleaned.dropna(subset=['리콜사유'])
-    df_cleaned['제작자'] = df_cleaned['제작자'].str.replace(r"\(.*?\)", "", regex=True).str.strip()
+    # [전처리] (이하 동일) → [수정] CSV 스트리밍 적재와 같은 규칙을 쓰도록 backend/recall_cleaning.py 로 이동
+    df_cleaned = recall_cleaning.normalize_recall_columns(df_raw)
+    # [수정] CSV 스트리밍 적재(clean_raw_chunk)와 같은 제작자 이름 규칙 → 같은 리콜은 같은 content_hash
+    df_cleaned = recall_cleaning.normalize_db_names(df_cleaned)
     
     print(f"총 {len(df_cleaned)}건의 리콜 데이터를 전처리했습니다.")
     return df_cleaned
 
 
+# --- [신규] 1-1. 원본 CSV 청크 단위 로드 ---
+def detect_csv_encoding(file_path, encodings=CSV_ENCODINGS, block_size=1 << 20):
+    """파일을 block_size 씩 읽으며 끝까지 디코딩되는 첫 인코딩을 반환합니다. (파일 전체를 메모리에 올리지 않음)"""
+    for encoding in encodings:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(block_size), b''):
+                    decoder.decode(block)
+                decoder.decode(b'', final=True)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"CSV 인코딩을 판별할 수 없습니다 (시도: {', '.join(encodings)}): {file_path}")
+
+
+def read_csv_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE, skip_rows=0, max_rows=None):
+    """
+    원본 CSV 를 chunk_size 행씩 읽어, 승용차 필터링 + 제작자/차명 정제 + 형식 통일을 마친 DataFrame 을 하나씩 돌려줍니다.
+    (data/python process_data.py 와 같은 규칙: backend/recall_cleaning.py)
+    [수정] skip_rows: 앞의 원본 레코드(헤더 제외)를 건너뜁니다. DataFrame 의 index 는 원본 레코드 번호(헤더 제외, 0부터)입니다.
+    [수정] 줄 단위 skiprows 대신 파싱한 레코드 수로 건너뜁니다. (따옴표 안 줄바꿈이 있는 사유도 레코드 번호가 어긋나지 않음)
+    max_rows: (선택) 앞에서부터 이 레코드 수까지만 읽습니다.
+    """
+    encoding = detect_csv_encoding(file_path)
+    print(f" - {os.path.basename(file_path)} 스트리밍 로드 (encoding={encoding}, chunk_size={chunk_size}, skip_rows={skip_rows})")
+    for raw_chunk in pd.read_csv(file_path, encoding=encoding, dtype=str, chunksize=chunk_size, nrows=max_rows):
+        if raw_chunk.index[-1] < skip_rows:
+            continue
+        raw_chunk = raw_chunk[raw_chunk.index >= skip_rows]
+        yield len(raw_chunk), recall_cleaning.clean_raw_chunk(raw_chunk)
+
+
 # --- 2. DB에 데이터 저장 ---
-def insert_data_to_db(df):
-    conn = None
-    cursor = None
-    
-    keywords_only = [k[0] for k in KEYWORDS_DATA]
-    
-    try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        print(f"\n[연결 성공] MySQL DB '{DB_CONFIG['database']}'에 연결되었습니다.")
+SQL_RECALL_INSERT = """
+INSERT INTO Recall (model_id, reason, prod_from, prod_to, recall_date, recall_count, correction_count, correction_rate, content_hash)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+SQL_RECALL_UPDATE = """
+UPDATE Recall SET recall_count=%s, correction_count=%s, correction_rate=%s
+WHERE content_hash=%s
+"""
+SQL_JUNCTION_INSERT = """
+INSERT INTO Recall_Keyword_Junction (recall_id, keyword_id)
+VALUES (%s, %s)
+ON DUPLICATE KEY UPDATE recall_id=recall_id
+"""
+RECALL_COLUMNS = ['리콜사유', '생산기간(부터)', '생산기간(까지)', '리콜개시일', '리콜대수', '시정대수', '시정률(퍼센트)']
+# 같은 리콜인지 판단하는 기준 (content_hash 계산에 사용) / 재적재 시 바뀔 수 있는 수치 컬럼
+HASH_COLUMNS = ['제작자', '차명', '리콜사유', '생산기간(부터)', '생산기간(까지)', '리콜개시일']
+MEASURE_COLUMNS = ['리콜대수', '시정대수', '시정률(퍼센트)']
+DEFAULT_BATCH_SIZE = 1000
+# [신규] 사이드카 CSV 에 남길 원본 값 컬럼
+REJECT_COLUMNS = ['제작자', '차명'] + RECALL_COLUMNS
 
-        # [Step 1] Brand 테이블 채우기
-        all_brands = df['제작자'].unique()
-        sql_brand = "INSERT INTO Brand (brand_name) VALUES (%s) ON DUPLICATE KEY UPDATE brand_name=brand_name"
-        cursor.executemany(sql_brand, [(brand,) for brand in all_brands if brand])
-        print(f" -> 'Brand' 테이블에 {cursor.rowcount}건 처리 완료.")
 
+def _to_db_value(value):
+    """NaN/NaT 는 None 으로, Timestamp 는 date 로 바꿔 mysql.connector 가 처리할 수 있게 합니다."""
+    if value is None:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return None if pd.isna(value) else value.date()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def make_content_hash(values):
+    """(제작자, 차명, 리콜사유, 생산기간(부터), 생산기간(까지), 리콜개시일) → SHA-1 16진 문자열"""
+    parts = []
+    for value in values:
+        if value is None:
+            parts.append('')
+        elif hasattr(value, 'isoformat'):
+            parts.append(value.isoformat())
+        else:
+            parts.append(str(value).strip())
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def compute_content_hashes(df):
+    """DataFrame 각 행의 content_hash 목록을 반환합니다."""
+    columns = [[_to_db_value(v) for v in df[col].tolist()] for col in HASH_COLUMNS]
+    return [make_content_hash(values) for values in zip(*columns)]
+
+
+def row_content_hash(df, position):
+    """df 의 position 번째 행(위치 기준)의 content_hash"""
+    row = df.iloc[position]
+    return make_content_hash([_to_db_value(row[col]) for col in HASH_COLUMNS])
+
+
+class RejectedRows:
+    """
+    [신규] 적재하지 못한 행을 (원본 행 번호, 사유, 원본 값)으로 모아 두었다가 사이드카 CSV 에 덧붙입니다.
+    원본 행 번호는 적재하는 DataFrame 의 index 입니다. (CSV: 헤더 제외 원본 행, Excel: 정제 후 행 위치)
+    커밋할 때 flush(), 롤백할 때 discard() 를 호출합니다.
+    """
+
+    def __init__(self, source_path):
+        stem = os.path.splitext(os.path.basename(source_path))[0].replace(' ', '_')
+        self.path = os.path.join(REJECTS_DIR, f"{stem}.rejected.csv")
+        self.pending = []
+        self.total = 0
+
+    def add(self, source_row, reason, row):
+        record = {'source_row': source_row, 'reject_reason': reason}
+        record.update({col: _to_db_value(row.get(col)) for col in REJECT_COLUMNS})
+        self.pending.append(record)
+
+    def add_frame(self, df, reason):
+        for source_row, row in zip(df.index, df.to_dict('records')):
+            self.add(source_row, reason, row)
+
+    def reset(self):
+        """이전 실행의 사이드카 파일을 지웁니다. (처음부터 적재할 때)"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def flush(self):
+        if not self.pending:
+            return
+        os.makedirs(REJECTS_DIR, exist_ok=True)
+        pd.DataFrame(self.pending, columns=['source_row', 'reject_reason'] + REJECT_COLUMNS).to_csv(
+            self.path, mode='a', index=False, header=not os.path.exists(self.path), encoding='utf-8-sig'
+        )
+        self.total += len(self.pending)
+        self.pending = []
+
+    def discard(self):
+        self.pending = []
+
+    def report(self):
+        if self.total:
+            print(f" -> [거부] 적재하지 못한 행 {self.total}건과 사유를 기록했습니다: "
+                  f"{os.path.relpath(self.path, PROJECT_ROOT)}")
+
+
+def prepare_recall_rows(df, brand_map, model_map, rejects=None):
+    """
+    Recall INSERT 용 튜플 목록과 (같은 순서의) 리콜 사유 목록을 만듭니다.
+    브랜드/차종이 매핑되지 않는 행(rejects 에 기록)과, content_hash 가 같은 중복 행(마지막 행만 유지)은 제외합니다.
+    """
+    brand_ids = df['제작자'].map(brand_map)
+    model_ids = pd.Series(
+        [model_map.get((b_id, name)) for b_id, name in zip(brand_ids, df['차명'])],
+        index=df.index, dtype=object
+    )
+    if rejects is not None and model_ids.isna().any():
+        rejects.add_frame(df[model_ids.isna()], "브랜드/차종 매핑 없음 (제작자 또는 차명 누락)")
+    target_df = df[model_ids.notna()].copy()
+    target_df['model_id'] = model_ids[model_ids.notna()].astype(int)
+    target_df['content_hash'] = compute_content_hashes(target_df)
+
+    duplicated = target_df['content_hash'].duplicated(keep='last')
+    if duplicated.any():
+        print(f"   [정보] 내용이 같은 중복 행 {int(duplicated.sum())}건은 한 번만 적재합니다.")
+        target_df = target_df[~duplicated]
+
+    columns = [[_to_db_value(v) for v in target_df[col].tolist()] for col in RECALL_COLUMNS]
+    recall_rows = list(zip(target_df['model_id'].tolist(), *columns, target_df['content_hash'].tolist()))
+    return recall_rows, target_df['리콜사유'].tolist()
+
+
+def insert_recalls_row_by_row(cursor, df, brand_map, model_map, keyword_map, rejects=None):
+    """
+    (기존 방식) 한 행씩 Recall 을 INSERT 하고 키워드 연결도 한 건씩 INSERT 합니다.
+    [수정] 건너뛴 행은 사유와 함께 rejects 에 기록합니다.
+    """
+    tagger = KeywordTagger(keyword_map)
+    recall_count = 0
+    junction_count = 0
+
+    def reject(source_row, reason, row):
+        if rejects is not None:
+            rejects.add(source_row, reason, row)
+
+    for source_row, row in df.iterrows():
+        try:
+            brand_id = brand_map.get(row['제작자'])
+            model_id = model_map.get((brand_id, row['차명']))
+
+            if not model_id:
+                reject(source_row, "브랜드/차종 매핑 없음 (제작자 또는 차명 누락)", row)
+                continue 
+
+            content_hash = make_content_hash([_to_db_value(row[col]) for col in HASH_COLUMNS])
+            recall_values = (model_id,) + tuple(_to_db_value(row[col]) for col in RECALL_COLUMNS) + (content_hash,)
+            cursor.execute(SQL_RECALL_INSERT, recall_values)
+
+            new_recall_id = cursor.lastrowid
+            if new_recall_id == 0: 
+                reject(source_row, "INSERT 후 recall_id 없음", row)
+                continue 
+
+            recall_count += 1
+
+            for keyword_id in tagger.find(row['리콜사유']):
+                cursor.execute(SQL_JUNCTION_INSERT, (new_recall_id, keyword_id))
+                junction_count += 1
+
+        except Exception as e:
+            reject(source_row, f"DB 오류: {e}", row)
+            continue 
+
+    return recall_count, junction_count
+
+
+def bulk_insert_recall_rows(cursor, recall_rows, reasons, keyword_map, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    [신규] batch_size 행씩 묶어 Recall 을 다중 행 INSERT(executemany) 하고,
+    배치의 recall_id 를 한 번에 계산해 Junction 행도 배치당 한 번에 INSERT 합니다.
+    (AUTO_INCREMENT 값이 배치 안에서 연속이라는 전제 → 적재 중에는 이 로더만 Recall 에 써야 합니다.)
+    """
+    if not recall_rows:
+        return 0, 0
+
+    cursor.execute("SELECT @@innodb_autoinc_lock_mode")
+    lock_mode = cursor.fetchone()[0]
+    if int(lock_mode) == 2:
+        print("   [주의] innodb_autoinc_lock_mode=2: 적재 중 다른 세션이 Recall 에 INSERT 하면 안 됩니다.")
+
+    # 전체 사유의 키워드를 한 번에 태깅 → (row, keyword_id), row 는 recall_rows 의 위치
+    tags_df = KeywordTagger(keyword_map).tag(reasons)
+    tag_rows = tags_df['row'].to_numpy()
+    tag_ids = tags_df['keyword_id'].tolist()
+
+    recall_count = 0
+    junction_count = 0
+    for start in range(0, len(recall_rows), batch_size):
+        batch = recall_rows[start:start + batch_size]
+
+        # 배치 전체를 다중 행 INSERT 한 번으로 적재
+        cursor.executemany(SQL_RECALL_INSERT, batch)
+        first_id = cursor.lastrowid
+        if not first_id:
+            raise Error(msg="Recall 배치 INSERT 후 lastrowid 를 얻지 못했습니다.")
+
+        cursor.execute(
+            "SELECT COUNT(*) FROM Recall WHERE recall_id BETWEEN %s AND %s",
+            (first_id, first_id + len(batch) - 1)
+        )
+        if cursor.fetchone()[0] != len(batch):
+            raise Error(msg=f"Recall 배치의 recall_id 가 연속적이지 않습니다 (시작 ID {first_id}).")
+
+        # 배치의 recall_id 는 first_id 부터 연속 → Junction 행을 모아서 한 번에 INSERT
+        lo, hi = np.searchsorted(tag_rows, [start, start + len(batch)])
+        junction_rows = [
+            (first_id + int(row) - start, keyword_id)
+            for row, keyword_id in zip(tag_rows[lo:hi], tag_ids[lo:hi])
+        ]
+        if junction_rows:
+            cursor.executemany(SQL_JUNCTION_INSERT, junction_rows)
+
+        recall_count += len(batch)
+        junction_count += len(junction_rows)
+        print(f"   - {recall_count}/{len(recall_rows)}건 처리")
+
+    return recall_count, junction_count
+
+
+def insert_recalls_bulk(cursor, df, brand_map, model_map, keyword_map, batch_size=DEFAULT_BATCH_SIZE, rejects=None):
+    """전체 데이터를 배치 단위로 적재합니다. (빈 DB 에 처음 적재할 때)"""
+    recall_rows, reasons = prepare_recall_rows(df, brand_map, model_map, rejects)
+    return bulk_insert_recall_rows(cursor, recall_rows, reasons, keyword_map, batch_size)
+
+
+def backfill_content_hashes(cursor):
+    """
+    content_hash 도입 전에 적재된 Recall 행에 해시를 채웁니다.
+    (같은 내용이 여러 번 적재된 행은 가장 먼저 적재된 행에만 해시를 채우고 나머지는 NULL 로 둡니다.)
+    """
+    cursor.execute("""
+    SELECT r.recall_id, b.brand_name, m.model_name, r.reason, r.prod_from, r.prod_to, r.recall_date
+    FROM Recall r
+    JOIN Model m ON r.model_id = m.model_id
+    JOIN Brand b ON m.brand_id = b.brand_id
+    WHERE r.content_hash IS NULL
+    ORDER BY r.recall_id
+    """)
+    legacy_rows = cursor.fetchall()
+    if not legacy_rows:
+        return
+
+    cursor.execute("SELECT content_hash FROM Recall WHERE content_hash IS NOT NULL")
+    taken = {row[0] for row in cursor.fetchall()}
+    updates = []
+    duplicate_count = 0
+    for recall_id, *key_values in legacy_rows:
+        content_hash = make_content_hash(key_values)
+        if content_hash in taken:
+            duplicate_count += 1
+            continue
+        taken.add(content_hash)
+        updates.append((content_hash, recall_id))
+
+    if updates:
+        cursor.executemany("UPDATE Recall SET content_hash=%s WHERE recall_id=%s", updates)
+    print(f" -> 기존 Recall {len(updates)}건에 content_hash 를 채웠습니다.")
+    if duplicate_count:
+        print(f"   [경고] 이전 재적재로 중복된 Recall {duplicate_count}건은 content_hash 가 NULL 로 남았습니다.")
+
+
+def fetch_existing_measures(cursor, hashes, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    hashes 중 Recall 에 이미 있는 리콜의 (content_hash, recall_count, correction_count, correction_rate) 목록
+    (Recall 전체가 아니라 넘겨받은 해시만 batch_size 개씩 IN 조회 → uk_recall_content_hash 인덱스 사용)
+    """
+    rows = []
+    for start in range(0, len(hashes), batch_size):
+        batch = hashes[start:start + batch_size]
+        placeholders = ', '.join(['%s'] * len(batch))
+        cursor.execute(f"""
+        SELECT content_hash, recall_count, correction_count, correction_rate
+        FROM Recall WHERE content_hash IN ({placeholders})
+        """, batch)
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+def upsert_recalls_incremental(cursor, df, brand_map, model_map, keyword_map, batch_size=DEFAULT_BATCH_SIZE,
+                               rejects=None):
+    """
+    [신규] 증분 적재: content_hash 로 DB 와 비교해
+    새 리콜은 INSERT, 수치(리콜대수/시정대수/시정률)가 바뀐 리콜은 UPDATE, 나머지는 건너뜁니다.
+    [수정] DB 조회는 df 의 해시만 하므로 청크마다 불러도 Recall 전체를 읽지 않습니다.
+    (content_hash 가 없는 기존 행은 호출부가 적재 시작 전에 backfill_content_hashes 로 한 번 채웁니다.)
+    """
+    recall_rows, reasons = prepare_recall_rows(df, brand_map, model_map, rejects)
+    source_df = pd.DataFrame({
+        'content_hash': [row[-1] for row in recall_rows],
+        'recall_count': [row[5] for row in recall_rows],
+        'correction_count': [row[6] for row in recall_rows],
+        'correction_rate': [row[7] for row in recall_rows],
+    })
+
+    existing_df = pd.DataFrame(
+        fetch_existing_measures(cursor, source_df['content_hash'].tolist(), batch_size),
+        columns=['content_hash', 'db_recall_count', 'db_correction_count', 'db_correction_rate']
+    )
+    merged = source_df.merge(existing_df, on='content_hash', how='left', indicator=True)
+
+    is_new = (merged['_merge'] == 'left_only').to_numpy()
+    unchanged = (
+        (merged['recall_count'] == merged['db_recall_count'])
+        & (merged['correction_count'] == merged['db_correction_count'])
+        & np.isclose(merged['correction_rate'].astype(float), merged['db_correction_rate'].astype(float),
+                     atol=0.005, equal_nan=True)
+    ).to_numpy()
+    is_changed = ~is_new & ~unchanged
+
+    new_positions = np.flatnonzero(is_new)
+    inserted_count, junction_count = bulk_insert_recall_rows(
+        cursor, [recall_rows[i] for i in new_positions], [reasons[i] for i in new_positions],
+        keyword_map, batch_size
+    )
+
+    update_rows = [
+        (recall_rows[i][5], recall_rows[i][6], recall_rows[i][7], recall_rows[i][-1])
+        for i in np.flatnonzero(is_changed)
+    ]
+    for start in range(0, len(update_rows), batch_size):
+        cursor.executemany(SQL_RECALL_UPDATE, update_rows[start:start + batch_size])
+
+    unchanged_count = len(recall_rows) - inserted_count - len(update_rows)
+    print(f" -> [증분 적재] 신규 {inserted_count}건 / 변경 {len(update_rows)}건 / 변경 없음 {unchanged_count}건")
+    return inserted_count, junction_count
+
+
+def upsert_brands_and_models(cursor, df, brand_map=None, model_map=None):
+    """
+    df 의 브랜드/차종 중 brand_map / model_map 에 아직 없는 것만 INSERT 하고 갱신된 (brand_map, model_map) 을 반환합니다.
+    (맵을 넘기지 않으면 처음부터 조회, 청크 적재에서는 이전 청크의 맵을 이어서 사용)
+    """
+    brand_map = {} if brand_map is None else brand_map
+    model_map = {} if model_map is None else model_map
+
+    # (결측 이름은 NaN 으로 남아 있을 수 있어 pd.notna 로 거름 → 해당 행은 prepare_recall_rows 에서 거부로 기록)
+    new_brands = [brand for brand in df['제작자'].unique() if pd.notna(brand) and brand and brand not in brand_map]
+    if new_brands or not brand_map:
+        sql_brand = "INSERT INTO Brand (brand_name) VALUES (%s) ON DUPLICATE KEY UPDATE brand_name=brand_name"
+        if new_brands:
+            cursor.executemany(sql_brand, [(brand,) for brand in new_brands])
+            print(f" -> 'Brand' 테이블에 {cursor.rowcount}건 처리 완료.")
         cursor.execute("SELECT brand_id, brand_name FROM Brand")
         brand_map = {name: id for (id, name) in cursor.fetchall()}
 
-        # [Step 2] Model 테이블 채우기
-        models_data = df[['제작자', '차명']].drop_duplicates()
-        model_tuples = []
-        for _, row in models_data.iterrows():
-            brand_id = brand_map.get(row['제작자'])
-            if brand_id and row['차명']:
-                model_tuples.append((brand_id, row['차명']))
-        
+    model_tuples = []
+    for brand, model in df[['제작자', '차명']].drop_duplicates().itertuples(index=False):
+        brand_id = brand_map.get(brand)
+        if brand_id and pd.notna(model) and model and (brand_id, model) not in model_map:
+            model_tuples.append((brand_id, model))
+    if model_tuples or not model_map:
         sql_model = "INSERT INTO Model (brand_id, model_name) VALUES (%s, %s) ON DUPLICATE KEY UPDATE brand_id=brand_id"
-        cursor.executemany(sql_model, model_tuples)
-        print(f" -> 'Model' 테이블에 {cursor.rowcount}건 처리 완료.")
-        
+        if model_tuples:
+            cursor.executemany(sql_model, model_tuples)
+            print(f" -> 'Model' 테이블에 {cursor.rowcount}건 처리 완료.")
         cursor.execute("SELECT model_id, brand_id, model_name FROM Model")
         model_map = {(b_id, name): m_id for (m_id, b_id, name) in cursor.fetchall()}
 
+    return brand_map, model_map
+
+
+def upsert_keywords(cursor):
+    """KEYWORDS_DATA 를 Keyword 테이블에 반영하고 {keyword_text: keyword_id} 를 반환합니다."""
+    print(" -> 'Keyword' 테이블 업데이트 중...")
+    sql_keyword = """
+    INSERT INTO Keyword (keyword_text, keyword_desc) 
+    VALUES (%s, %s)
+    ON DUPLICATE KEY UPDATE keyword_desc=VALUES(keyword_desc)
+    """
+    cursor.executemany(sql_keyword, KEYWORDS_DATA)
+    print(f" -> 'Keyword' 테이블에 {cursor.rowcount}건 처리 완료.")
+
+    cursor.execute("SELECT keyword_id, keyword_text FROM Keyword")
+    return {text: id for (id, text) in cursor.fetchall()}
+
+
+def refresh_materialized(cursor):
+    """
+    적재 후 요약 테이블 갱신 (get_summary_stats 가 읽는 Recall_Summary,
+    브랜드 랭킹/차량 비교가 읽는 Recall_Cube, 워드 클라우드가 읽는 Model_Term_Freq)
+    """
+    materialized.refresh_cube(cursor)
+    materialized.refresh_term_freq(cursor)
+    materialized.refresh_summary(cursor)
+
+
+SQL_RECALL_HAS_CONTENT_HASH = """
+SELECT COUNT(*) FROM information_schema.COLUMNS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Recall' AND COLUMN_NAME = 'content_hash'
+"""
+SQL_RECALL_HAS_ROWS = "SELECT EXISTS (SELECT 1 FROM Recall)"
+
+
+def check_recall_schema(cursor):
+    """Recall.content_hash 컬럼이 없으면(마이그레이션 전 DB) 적재를 시작하기 전에 중단합니다."""
+    cursor.execute(SQL_RECALL_HAS_CONTENT_HASH)
+    if not cursor.fetchone()[0]:
+        raise Error(msg="Recall.content_hash 컬럼이 없습니다. 먼저 'python sql/migrate.py' 로 마이그레이션을 적용하세요.")
+
+
+def resolve_load_mode(cursor, mode):
+    """
+    [신규] bulk 모드는 빈 Recall 테이블 전용입니다. 이미 데이터가 있으면 같은 리콜의 content_hash 가
+    UNIQUE 키에 걸려 전체 적재가 롤백되므로, 시작 전에 incremental 모드로 바꿉니다.
+    """
+    check_recall_schema(cursor)
+    if mode != 'bulk':
+        return mode
+    cursor.execute(SQL_RECALL_HAS_ROWS)
+    if cursor.fetchone()[0]:
+        print("[정보] Recall 테이블에 이미 데이터가 있어 bulk 대신 incremental 모드로 적재합니다. "
+              "(bulk 는 빈 DB 에 처음 적재할 때만 사용)")
+        return 'incremental'
+    return mode
+
+
+def insert_data_to_db(df, mode='bulk', batch_size=DEFAULT_BATCH_SIZE, rejects=None):
+    conn = None
+    cursor = None
+    df = df.reset_index(drop=True) # 원본 행 번호 = 정제 후 행 위치 (rejects 기록용)
+    
+    try:
+        conn = mysql.connector.connect(**DB_CONFIG)
+        cursor = conn.cursor()
+        print(f"\n[연결 성공] MySQL DB '{DB_CONFIG['database']}'에 연결되었습니다.")
+        mode = resolve_load_mode(cursor, mode)
+        if mode == 'incremental':
+            backfill_content_hashes(cursor)
+
+        # [Step 1~2] Brand / Model 테이블 채우기
+        brand_map, model_map = upsert_brands_and_models(cursor, df)
+
         # [Step 3] Keyword 테이블 채우기 (설명 포함)
-        print(" -> 'Keyword' 테이블 업데이트 중...")
-        sql_keyword = """
-        INSERT INTO Keyword (keyword_text, keyword_desc) 
-        VALUES (%s, %s)
-        ON DUPLICATE KEY UPDATE keyword_desc=VALUES(keyword_desc)
-        """
-        cursor.executemany(sql_keyword, KEYWORDS_DATA)
-        print(f" -> 'Keyword' 테이블에 {cursor.rowcount}건 처리 완료.")
-
-        cursor.execute("SELECT keyword_id, keyword_text FROM Keyword")
-        keyword_map = {text: id for (id, text) in cursor.fetchall()}
+        keyword_map = upsert_keywords(cursor)
 
         # [Step 4] Recall 및 Junction 테이블 채우기
-        print(" -> 'Recall' 및 'Junction' 테이블 데이터 삽입 중 (가장 오래 걸림)...")
-        recall_count = 0
-        junction_count = 0
-
-        for _, row in df.iterrows():
-            try:
-                brand_id = brand_map.get(row['제작자'])
-                model_id = model_map.get((brand_id, row['차명']))
-                
-                if not model_id:
-                    continue 
-
-                sql_recall = """
-                INSERT INTO Recall (model_id, reason, prod_from, prod_to, recall_date, recall_count, correction_count, correction_rate)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE reason=VALUES(reason), recall_count=VALUES(recall_count)
-                """
-                recall_values = (
-                    model_id,
-                    row['리콜사유'],
-                    row['생산기간(부터)'],
-                    row['생산기간(까지)'],
-                    row['리콜개시일'],
-                    row['리콜대수'],
-                    row['시정대수'],
-                    row['시정률(퍼센트)']
-                )
-                cursor.execute(sql_recall, recall_values)
-                
-                new_recall_id = cursor.lastrowid
-                if new_recall_id == 0: 
-                    continue 
-
-                recall_count += 1
-                
-                reason_text = row['리콜사유']
-                found_keywords = []
-                for keyword_text in keywords_only:
-                    if keyword_text in reason_text:
-                        found_keywords.append(keyword_text)
-                
-                if found_keywords:
-                    for keyword_text in found_keywords:
-                        keyword_id = keyword_map.get(keyword_text)
-                        if keyword_id:
-                            sql_junction = """
-                            INSERT INTO Recall_Keyword_Junction (recall_id, keyword_id)
-                            VALUES (%s, %s)
-                            ON DUPLICATE KEY UPDATE recall_id=recall_id
-                            """
-                            cursor.execute(sql_junction, (new_recall_id, keyword_id))
-                            junction_count += 1
-                        
-            except Exception as e:
-                continue 
+        print(f" -> 'Recall' 및 'Junction' 테이블 데이터 삽입 중 (mode={mode})...")
+        start_time = time.perf_counter()
+        if mode == 'row':
+            recall_count, junction_count = insert_recalls_row_by_row(
+                cursor, df, brand_map, model_map, keyword_map, rejects=rejects
+            )
+        elif mode == 'incremental':
+            recall_count, junction_count = upsert_recalls_incremental(
+                cursor, df, brand_map, model_map, keyword_map, batch_size=batch_size, rejects=rejects
+            )
+        else:
+            recall_count, junction_count = insert_recalls_bulk(
+                cursor, df, brand_map, model_map, keyword_map, batch_size=batch_size, rejects=rejects
+            )
+        elapsed = time.perf_counter() - start_time
 
         print(f" -> 'Recall' 테이블에 {recall_count}건 신규 삽입 완료.")
         print(f" -> 'Recall_Keyword_Junction' 테이블에 {junction_count}건 연결 완료.")
+        rows_per_sec = recall_count / elapsed if elapsed > 0 else 0
+        print(f" -> [성능] {elapsed:.2f}초 소요, {rows_per_sec:,.0f} rows/sec (mode={mode})")
         
-        # [Step 5] 최종 커밋
+        # [Step 5] 요약 테이블 갱신
+        refresh_materialized(cursor)
+
+        # [Step 6] 최종 커밋
         conn.commit()
+        if rejects is not None:
+            rejects.flush()
+            rejects.report()
         print("\n[완료] 모든 데이터가 성공적으로 DB에 저장되었습니다.")
 
     except Error as e:
@@ -241,6 +637,271 @@ def insert_data_to_db(df):
         if conn:
             print("작업을 롤백합니다.")
             conn.rollback()
+        if rejects is not None:
+            rejects.discard()
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+            print("MySQL DB 연결이 종료되었습니다.")
+
+def insert_chunk_bulk(cursor, df, brand_map, model_map, keyword_map, seen_hashes, batch_size=DEFAULT_BATCH_SIZE,
+                      rejects=None):
+    """
+    [신규] 스트리밍 bulk 적재의 청크 하나를 적재합니다.
+    앞선 청크에서 이미 적재한 content_hash 는 INSERT 대신 수치만 UPDATE 합니다. (파일 전체 기준 '마지막 행 유지'와 동일)
+    """
+    recall_rows, reasons = prepare_recall_rows(df, brand_map, model_map, rejects)
+    is_repeat = [row[-1] in seen_hashes for row in recall_rows]
+    update_rows = [(row[5], row[6], row[7], row[-1]) for row, repeat in zip(recall_rows, is_repeat) if repeat]
+    if update_rows:
+        cursor.executemany(SQL_RECALL_UPDATE, update_rows)
+
+    new_rows = [row for row, repeat in zip(recall_rows, is_repeat) if not repeat]
+    new_reasons = [reason for reason, repeat in zip(reasons, is_repeat) if not repeat]
+    seen_hashes.update(row[-1] for row in new_rows)
+    return bulk_insert_recall_rows(cursor, new_rows, new_reasons, keyword_map, batch_size)
+
+
+def stream_csv_to_db(file_path, mode='bulk', chunk_size=DEFAULT_CHUNK_SIZE, batch_size=DEFAULT_BATCH_SIZE, rejects=None):
+    """
+    [신규] 한국교통안전공단 원본 CSV 를 chunk_size 행씩 읽어 정제한 뒤 청크마다 바로 DB 에 적재합니다.
+    (data/python process_data.py → Excel → pd.read_excel 을 거치지 않음, 메모리 사용량은 파일 크기와 무관)
+    모든 청크는 하나의 트랜잭션으로 적재되고, 요약 테이블 갱신 후 마지막에 한 번 커밋합니다.
+    """
+    if not os.path.exists(file_path):
+        print(f"[오류] CSV 파일을 찾을 수 없습니다: {file_path}")
+        return
+
+    conn = None
+    cursor = None
+    try:
+        conn = mysql.connector.connect(**DB_CONFIG)
+        cursor = conn.cursor()
+        print(f"\n[연결 성공] MySQL DB '{DB_CONFIG['database']}'에 연결되었습니다.")
+        mode = resolve_load_mode(cursor, mode)
+        if mode == 'incremental':
+            backfill_content_hashes(cursor) # 청크마다가 아니라 적재 시작 전에 한 번
+
+        keyword_map = upsert_keywords(cursor)
+        brand_map, model_map = None, None
+        seen_hashes = set()
+
+        print(f" -> 'Recall' 및 'Junction' 테이블 스트리밍 적재 중 (mode={mode})...")
+        start_time = time.perf_counter()
+        raw_total = clean_total = recall_total = junction_total = 0
+        for chunk_no, (raw_count, df) in enumerate(read_csv_chunks(file_path, chunk_size), start=1):
+            raw_total += raw_count
+            clean_total += len(df)
+            if df.empty:
+                continue
+            brand_map, model_map = upsert_brands_and_models(cursor, df, brand_map, model_map)
+            if mode == 'row':
+                recall_count, junction_count = insert_recalls_row_by_row(
+                    cursor, df, brand_map, model_map, keyword_map, rejects=rejects
+                )
+            elif mode == 'incremental':
+                recall_count, junction_count = upsert_recalls_incremental(
+                    cursor, df, brand_map, model_map, keyword_map, batch_size=batch_size, rejects=rejects
+                )
+            else:
+                recall_count, junction_count = insert_chunk_bulk(
+                    cursor, df, brand_map, model_map, keyword_map, seen_hashes, batch_size=batch_size, rejects=rejects
+                )
+            recall_total += recall_count
+            junction_total += junction_count
+            print(f"   [청크 {chunk_no}] 원본 {raw_count}건 → 승용차 {len(df)}건, 신규 Recall {recall_count}건 "
+                  f"(누적 {recall_total}건, {time.perf_counter() - start_time:.2f}초)")
+        elapsed = time.perf_counter() - start_time
+
+        print(f" -> 원본 {raw_total}건 중 승용차 {clean_total}건 정제")
+        print(f" -> 'Recall' 테이블에 {recall_total}건 신규 삽입 완료.")
+        print(f" -> 'Recall_Keyword_Junction' 테이블에 {junction_total}건 연결 완료.")
+        rows_per_sec = raw_total / elapsed if elapsed > 0 else 0
+        print(f" -> [성능] {elapsed:.2f}초 소요, 원본 {rows_per_sec:,.0f} rows/sec (mode={mode}, chunk_size={chunk_size})")
+
+        refresh_materialized(cursor)
+        conn.commit()
+        if rejects is not None:
+            rejects.flush()
+            rejects.report()
+        print("\n[완료] 모든 데이터가 성공적으로 DB에 저장되었습니다.")
+
+    except (Error, ValueError) as e:
+        print(f"\n[치명적 오류] DB 작업 실패: {e}")
+        if conn:
+            print("작업을 롤백합니다.")
+            conn.rollback()
+        if rejects is not None:
+            rejects.discard()
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+            print("MySQL DB 연결이 종료되었습니다.")
+
+# --- [신규] 2-1. 재개 가능한 적재 (--mode resumable) ---
+# commit_every 행마다 Recall/Junction 적재와 Load_Checkpoint 갱신을 같은 트랜잭션으로 커밋합니다.
+# 중간에 실패하면 그 청크만 롤백되고, 다음 실행은 Load_Checkpoint.last_row 부터 이어서 적재합니다.
+# (Recall 은 content_hash 로 INSERT/UPDATE 를 나누므로 같은 청크를 다시 적재해도 중복되지 않습니다.)
+DEFAULT_COMMIT_EVERY = 2000
+
+SQL_CHECKPOINT_SELECT = """
+SELECT last_row, last_content_hash, rows_loaded, status
+FROM Load_Checkpoint WHERE source_key = %s
+"""
+SQL_CHECKPOINT_UPSERT = """
+INSERT INTO Load_Checkpoint (source_key, source_name, last_row, last_content_hash, rows_loaded, status)
+VALUES (%s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE last_row=VALUES(last_row), last_content_hash=VALUES(last_content_hash),
+    rows_loaded=VALUES(rows_loaded), status=VALUES(status)
+"""
+
+
+def checkpoint_source_key(source_path, tag=''):
+    """원본 파일 내용 + tag(시트/형식) → Load_Checkpoint.source_key (원본이 바뀌면 다른 키)"""
+    return hashlib.sha1(f"{staging.file_hash(source_path)}|{tag}".encode('utf-8')).hexdigest()
+
+
+def fetch_existing_hashes(cursor, hashes, batch_size=DEFAULT_BATCH_SIZE):
+    """hashes 중 Recall 에 이미 있는 content_hash 집합"""
+    return {row[0] for row in fetch_existing_measures(cursor, hashes, batch_size)}
+
+
+def upsert_chunk(cursor, df, brand_map, model_map, keyword_map, rejects, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    청크 하나를 content_hash 기준으로 적재합니다. (DB 에 있는 리콜은 수치만 UPDATE, 없는 리콜은 배치 INSERT)
+    (upsert_recalls_incremental 과 달리 수치를 비교하지 않고 이미 있는 리콜은 모두 UPDATE)
+    반환: (INSERT 건수, UPDATE 건수, Junction 건수)
+    """
+    recall_rows, reasons = prepare_recall_rows(df, brand_map, model_map, rejects)
+    existing = fetch_existing_hashes(cursor, [row[-1] for row in recall_rows], batch_size)
+
+    update_rows = [(row[5], row[6], row[7], row[-1]) for row in recall_rows if row[-1] in existing]
+    if update_rows:
+        cursor.executemany(SQL_RECALL_UPDATE, update_rows)
+
+    new_positions = [i for i, row in enumerate(recall_rows) if row[-1] not in existing]
+    inserted_count, junction_count = bulk_insert_recall_rows(
+        cursor, [recall_rows[i] for i in new_positions], [reasons[i] for i in new_positions],
+        keyword_map, batch_size
+    )
+    return inserted_count, len(update_rows), junction_count
+
+
+def iter_frame_chunks(df, start_row, commit_every):
+    """정제된 DataFrame 을 start_row 부터 commit_every 행씩 (다음 시작 위치, 청크) 로 돌려줍니다."""
+    for start in range(start_row, len(df), commit_every):
+        chunk = df.iloc[start:start + commit_every]
+        yield start + len(chunk), chunk
+
+
+def iter_csv_chunks(file_path, start_row, commit_every):
+    """원본 CSV 를 start_row 행 뒤부터 commit_every 행씩 읽어 (다음 시작 위치, 정제된 청크) 로 돌려줍니다."""
+    end_row = start_row
+    for raw_count, df in read_csv_chunks(file_path, commit_every, skip_rows=start_row):
+        end_row += raw_count
+        yield end_row, df
+
+
+def last_csv_row_hash(file_path, position, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    [신규] 원본 CSV 를 position 번째 레코드(헤더 제외, 0부터)까지 정제했을 때 마지막으로 남는 행의 content_hash.
+    (승용차가 아니라 걸러진 레코드는 건너뜀 → load_resumable 이 체크포인트에 남기는 last_content_hash 와 같은 값, 없으면 None)
+    """
+    last_hash = None
+    for _, df in read_csv_chunks(file_path, chunk_size, max_rows=position + 1):
+        if not df.empty:
+            last_hash = row_content_hash(df, -1)
+    return last_hash
+
+
+def load_resumable(source_path, tag, iter_chunks, commit_every=DEFAULT_COMMIT_EVERY,
+                   batch_size=DEFAULT_BATCH_SIZE, restart=False, verify_row_hash=None):
+    """
+    iter_chunks(start_row, commit_every) 가 돌려주는 (다음 시작 위치, 청크) 를 하나씩 적재하고 청크마다 커밋합니다.
+    verify_row_hash(position): 재개 전에 체크포인트의 last_content_hash 와 비교할, position 번째 원본 행까지 적재한 마지막 행의 해시
+    (없으면 확인 생략, CSV 는 last_csv_row_hash)
+    restart=True 이면 체크포인트와 사이드카 파일을 무시하고 처음부터 적재합니다.
+    """
+    if not os.path.exists(source_path):
+        print(f"[오류] 원본 파일을 찾을 수 없습니다: {source_path}")
+        return
+
+    source_name = os.path.basename(source_path)
+    rejects = RejectedRows(source_path)
+    conn = None
+    cursor = None
+    committed_row = 0
+    try:
+        conn = mysql.connector.connect(**DB_CONFIG)
+        cursor = conn.cursor()
+        print(f"\n[연결 성공] MySQL DB '{DB_CONFIG['database']}'에 연결되었습니다.")
+
+        check_recall_schema(cursor)
+        source_key = checkpoint_source_key(source_path, tag)
+        last_hash, rows_loaded = None, 0
+        checkpoint = None
+        if not restart:
+            cursor.execute(SQL_CHECKPOINT_SELECT, (source_key,))
+            checkpoint = cursor.fetchone()
+
+        if checkpoint:
+            committed_row, last_hash, rows_loaded, status = checkpoint
+            if status == 'done':
+                print(f"[정보] '{source_name}' 은(는) 이미 적재를 마쳤습니다. (처음부터 다시 적재하려면 --restart)")
+                return
+            if verify_row_hash and committed_row and verify_row_hash(committed_row - 1) != last_hash:
+                print(f"[오류] 체크포인트({committed_row}행)의 마지막 행이 현재 원본과 다릅니다. "
+                      "정제 규칙이 바뀌었다면 --restart 로 처음부터 적재하세요.")
+                return
+            print(f" -> 체크포인트에서 이어서 적재합니다: {committed_row}행부터 (지금까지 Recall {rows_loaded}건)")
+        else:
+            rejects.reset()
+
+        backfill_content_hashes(cursor)
+        keyword_map = upsert_keywords(cursor)
+        brand_map, model_map = None, None
+        cursor.execute(SQL_CHECKPOINT_UPSERT, (source_key, source_name, committed_row, last_hash, rows_loaded, 'running'))
+        conn.commit()
+
+        print(f" -> 'Recall' 및 'Junction' 테이블 적재 중 (mode=resumable, commit_every={commit_every})...")
+        start_time = time.perf_counter()
+        inserted_total = updated_total = junction_total = 0
+        for end_row, df in iter_chunks(committed_row, commit_every):
+            if not df.empty:
+                brand_map, model_map = upsert_brands_and_models(cursor, df, brand_map, model_map)
+                inserted, updated, junction_count = upsert_chunk(
+                    cursor, df, brand_map, model_map, keyword_map, rejects, batch_size
+                )
+                inserted_total += inserted
+                updated_total += updated
+                junction_total += junction_count
+                rows_loaded += inserted + updated
+                last_hash = row_content_hash(df, -1)
+            cursor.execute(SQL_CHECKPOINT_UPSERT, (source_key, source_name, end_row, last_hash, rows_loaded, 'running'))
+            rejects.flush() # 커밋 직전에 기록 (커밋 실패 후 재실행하면 같은 행이 한 번 더 기록될 수 있음)
+            conn.commit()
+            committed_row = end_row
+            print(f"   [커밋] {end_row}행까지 (신규 {inserted_total}건 / 갱신 {updated_total}건, "
+                  f"{time.perf_counter() - start_time:.2f}초)")
+
+        refresh_materialized(cursor)
+        cursor.execute(SQL_CHECKPOINT_UPSERT, (source_key, source_name, committed_row, last_hash, rows_loaded, 'done'))
+        conn.commit()
+
+        print(f" -> 'Recall' 테이블에 {inserted_total}건 신규 삽입, {updated_total}건 갱신 완료.")
+        print(f" -> 'Recall_Keyword_Junction' 테이블에 {junction_total}건 연결 완료.")
+        rejects.report()
+        print("\n[완료] 모든 데이터가 성공적으로 DB에 저장되었습니다.")
+
+    except (Error, ValueError) as e:
+        print(f"\n[치명적 오류] DB 작업 실패: {e}")
+        if conn:
+            print("마지막 청크를 롤백합니다.")
+            conn.rollback()
+        rejects.discard()
+        print(f"다시 실행하면 체크포인트({committed_row}행)부터 이어서 적재합니다.")
     finally:
         if conn and conn.is_connected():
             cursor.close()
@@ -248,7 +909,56 @@ def insert_data_to_db(df):
             print("MySQL DB 연결이 종료되었습니다.")
 
 # --- 3. 스크립트 실행 ---
+def parse_args():
+    parser = argparse.ArgumentParser(description="리콜 Excel(또는 원본 CSV) 데이터를 MySQL DB에 적재합니다.")
+    parser.add_argument('--mode', choices=['bulk', 'row', 'incremental', 'resumable'], default='bulk',
+                        help="bulk: 배치 단위 다중 행 INSERT (기본값, Recall 에 데이터가 있으면 incremental 로 전환), row: 기존 한 행씩 INSERT, "
+                             "incremental: content_hash 로 비교해 바뀐 행만 INSERT/UPDATE, "
+                             "resumable: --commit-every 행마다 커밋하고 실패 시 체크포인트부터 이어서 적재")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"bulk/incremental 모드에서 한 번에 INSERT 할 행 수 (기본값: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--rebuild-staging', action='store_true',
+                        help="정제 결과 스테이징 파일(data/staging/*.parquet)을 무시하고 Excel 을 다시 읽어 정제")
+    parser.add_argument('--csv', nargs='?', const=CSV_FILE_PATH, default=None, metavar='PATH',
+                        help="Excel 대신 한국교통안전공단 원본 CSV 를 청크 단위로 스트리밍 적재 "
+                             f"(경로 생략 시 {os.path.relpath(CSV_FILE_PATH, PROJECT_ROOT)})")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"--csv 적재 시 한 번에 읽어 정제할 행 수 (기본값: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--commit-every', type=int, default=DEFAULT_COMMIT_EVERY,
+                        help=f"resumable 모드에서 커밋/체크포인트 간격 (원본 행 수, 기본값: {DEFAULT_COMMIT_EVERY})")
+    parser.add_argument('--restart', action='store_true',
+                        help="resumable 모드에서 체크포인트를 무시하고 처음부터 적재")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    df_main = load_and_clean_data(EXCEL_FILE_PATH, SHEET_NAMES)
-    if df_main is not None:
-        insert_data_to_db(df_main)
\ No newline at end of file
+    args = parse_args()
+    if args.csv and args.mode == 'resumable':
+        load_resumable(
+            args.csv, "csv", lambda start_row, size: iter_csv_chunks(args.csv, start_row, size),
+            commit_every=args.commit_every, batch_size=args.batch_size, restart=args.restart,
+            verify_row_hash=lambda position: last_csv_row_hash(args.csv, position, args.chunk_size)
+        )
+    elif args.csv:
+        csv_rejects = RejectedRows(args.csv)
+        csv_rejects.reset()
+        stream_csv_to_db(args.csv, mode=args.mode, chunk_size=args.chunk_size, batch_size=args.batch_size,
+                         rejects=csv_rejects)
+    else:
+        # [수정] 원본 Excel 이 그대로면 지난번 정제 결과(Parquet 스테이징 파일)를 바로 사용
+        excel_tag = "sheets=" + ",".join(SHEET_NAMES)
+        df_main = staging.load_or_build(
+            EXCEL_FILE_PATH, lambda: load_and_clean_data(EXCEL_FILE_PATH, SHEET_NAMES),
+            tag=excel_tag, rebuild=args.rebuild_staging
+        )
+        if df_main is not None and args.mode == 'resumable':
+            df_main = df_main.reset_index(drop=True)
+            load_resumable(
+                EXCEL_FILE_PATH, excel_tag, lambda start_row, size: iter_frame_chunks(df_main, start_row, size),
+                commit_every=args.commit_every, batch_size=args.batch_size, restart=args.restart,
+                verify_row_hash=lambda position: row_content_hash(df_main, position) if position < len(df_main) else None
+            )
+        elif df_main is not None:
+            excel_rejects = RejectedRows(EXCEL_FILE_PATH)
+            excel_rejects.reset()
+            insert_data_to_db(df_main, mode=args.mode, batch_size=args.batch_size, rejects=excel_rejects)
\ No newline at end of file
@@ -0,0 +1,90 @@
+# 파일 이름: migrate.py
+# (경로: sql/migrate.py)
+# sql/migrations/ 의 버전별 스키마 변경(V001__설명.sql, V002__...)을 순서대로 한 번씩 적용합니다.
+# 적용 이력은 Schema_Migration 테이블에 기록됩니다.
+#   python sql/migrate.py          # 미적용 마이그레이션 적용
+#   python sql/migrate.py --status # 적용 현황만 출력
+
+import os
+import re
+import argparse
+import mysql.connector
+from mysql.connector import Error
+
+from load_data_from_excel import DB_CONFIG
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE_PATTERN = re.compile(r'^V(\d+)__(.+)\.sql$')
+
+SQL_CREATE_HISTORY = """
+CREATE TABLE IF NOT EXISTS Schema_Migration (
+    version INT PRIMARY KEY COMMENT '마이그레이션 버전',
+    name VARCHAR(200) NOT NULL COMMENT '마이그레이션 파일 이름',
+    applied_at DATETIME NOT NULL COMMENT '적용 시각'
+) ENGINE=InnoDB COMMENT='스키마 마이그레이션 적용 이력'
+"""
+
+
+def list_migrations():
+    """(버전, 파일 이름, 전체 경로) 목록을 버전 순으로 반환합니다."""
+    migrations = []
+    for file_name in os.listdir(MIGRATIONS_DIR):
+        match = MIGRATION_FILE_PATTERN.match(file_name)
+        if match:
+            migrations.append((int(match.group(1)), file_name, os.path.join(MIGRATIONS_DIR, file_name)))
+    return sorted(migrations)
+
+
+def split_statements(sql_text):
+    """주석(--)을 제거하고 ';' 기준으로 SQL 문을 나눕니다."""
+    lines = [line for line in sql_text.splitlines() if not line.strip().startswith('--')]
+    return [stmt.strip() for stmt in '\n'.join(lines).split(';') if stmt.strip()]
+
+
+def run_migrations(status_only=False):
+    conn = None
+    cursor = None
+    try:
+        conn = mysql.connector.connect(**DB_CONFIG)
+        cursor = conn.cursor()
+        cursor.execute(SQL_CREATE_HISTORY)
+        cursor.execute("SELECT version FROM Schema_Migration")
+        applied = {row[0] for row in cursor.fetchall()}
+
+        for version, file_name, path in list_migrations():
+            if version in applied:
+                print(f" - [적용됨] {file_name}")
+                continue
+            if status_only:
+                print(f" - [미적용] {file_name}")
+                continue
+
+            print(f" -> {file_name} 적용 중...")
+            with open(path, encoding='utf-8') as f:
+                statements = split_statements(f.read())
+            # (MySQL 의 DDL 은 자동 커밋되므로, 실패 시 해당 파일의 앞선 문장은 되돌려지지 않습니다.)
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO Schema_Migration (version, name, applied_at) VALUES (%s, %s, NOW())",
+                (version, file_name)
+            )
+            conn.commit()
+            print(f"    {len(statements)}개 문장 적용 완료.")
+
+        print("\n[완료] 마이그레이션 확인이 끝났습니다.")
+    except Error as e:
+        print(f"\n[치명적 오류] 마이그레이션 실패: {e}")
+        if conn:
+            conn.rollback()
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="sql/migrations 의 스키마 변경을 적용합니다.")
+    parser.add_argument('--status', action='store_true', help="적용하지 않고 현황만 출력")
+    args = parser.parse_args()
+    run_migrations(status_only=args.status)
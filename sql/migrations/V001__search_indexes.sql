@@ -0,0 +1,12 @@
+-- ---------------------------------------------------
+-- V001: 상세 검색 / 리포트 쿼리용 보조 인덱스
+-- ---------------------------------------------------
+
+-- 리콜개시일 범위 검색 + 최신순 정렬 (search_recalls, 요약 통계 MIN/MAX)
+CREATE INDEX idx_recall_date ON Recall (recall_date);
+
+-- 차종별 조회 + 최신순 정렬 (search_recalls 차종 필터, get_model_profile_data)
+CREATE INDEX idx_recall_model_date ON Recall (model_id, recall_date);
+
+-- 키워드 → 리콜 역방향 조회 (키워드 필터). 기본키 (recall_id, keyword_id) 는 정방향만 커버
+CREATE INDEX idx_rkj_keyword_recall ON Recall_Keyword_Junction (keyword_id, recall_id);
@@ -0,0 +1,6 @@
+-- ---------------------------------------------------
+-- V002: 리콜 사유(Recall.reason) 자유 텍스트 검색용 FULLTEXT 인덱스
+--   한국어는 띄어쓰기 단위 토큰화가 맞지 않으므로 ngram 파서(기본 ngram_token_size=2, 글자 바이그램)를 사용
+--   (search_queries.search_recalls_page / search_recalls_ranked 의 reason_query)
+-- ---------------------------------------------------
+ALTER TABLE Recall ADD FULLTEXT INDEX ft_recall_reason (reason) WITH PARSER ngram;
@@ -0,0 +1,19 @@
+-- ---------------------------------------------------
+-- V003: 리포트용 브랜드/차종/연도/키워드 집계 큐브 (sql/create_tables.sql 의 7번과 동일)
+--   keyword_id = 0 은 키워드와 무관한 '전체 리콜' 행, recall_year = 0 은 리콜개시일 없음
+--   내용은 load_data_from_excel.py 가 적재 후 materialized.refresh_cube() 로 다시 만듭니다.
+-- ---------------------------------------------------
+CREATE TABLE IF NOT EXISTS Recall_Cube (
+    brand_id INT NOT NULL COMMENT '브랜드ID',
+    model_id INT NOT NULL COMMENT '차종ID',
+    recall_year SMALLINT NOT NULL COMMENT '리콜 연도 (개시일 기준, 없으면 0)',
+    keyword_id INT NOT NULL COMMENT '키워드ID (0 = 전체 리콜)',
+    recall_count INT NOT NULL DEFAULT 0 COMMENT '리콜 건수',
+    recall_units BIGINT NOT NULL DEFAULT 0 COMMENT '리콜 대수 합계',
+    correction_units BIGINT NOT NULL DEFAULT 0 COMMENT '시정 대수 합계',
+    rate_sum DOUBLE NOT NULL DEFAULT 0 COMMENT '시정률 합계 (평균 = rate_sum / rate_count)',
+    rate_count INT NOT NULL DEFAULT 0 COMMENT '시정률이 있는 리콜 건수',
+
+    PRIMARY KEY (brand_id, model_id, recall_year, keyword_id),
+    KEY idx_cube_keyword_model (keyword_id, model_id)
+) ENGINE=InnoDB COMMENT='리포트용 집계 큐브 (로더가 갱신)';
@@ -0,0 +1,14 @@
+-- ---------------------------------------------------
+-- V004: 차종별 리콜 사유 단어 빈도 (sql/create_tables.sql 의 8번과 동일)
+--   단어는 backend/korean_terms.py 로 어미/조사를 떼고 불용어를 뺀 결과입니다.
+--   내용은 load_data_from_excel.py 가 적재 후 materialized.refresh_term_freq() 로 다시 만듭니다.
+--   (모델 프로필 워드 클라우드가 WordCloud.generate_from_frequencies 로 바로 사용)
+-- ---------------------------------------------------
+CREATE TABLE IF NOT EXISTS Model_Term_Freq (
+    model_id INT NOT NULL COMMENT '차종ID',
+    term VARCHAR(50) NOT NULL COMMENT '단어',
+    term_count INT NOT NULL COMMENT '해당 차종 리콜 사유에서의 등장 횟수',
+
+    PRIMARY KEY (model_id, term),
+    KEY idx_term_freq_model_count (model_id, term_count)
+) ENGINE=InnoDB COMMENT='차종별 리콜 사유 단어 빈도 (로더가 갱신)';
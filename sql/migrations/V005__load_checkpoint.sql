@@ -0,0 +1,17 @@
+-- ---------------------------------------------------
+-- V005: 재개 가능한 적재 체크포인트 (sql/create_tables.sql 의 9번과 동일)
+--   load_data_from_excel.py --mode resumable 이 commit_every 행마다 Recall 적재와 같은 트랜잭션으로 갱신합니다.
+--   source_key 는 원본 파일 내용 해시 + 시트/형식 태그의 SHA-1 이라, 원본이 바뀌면 새 체크포인트로 처음부터 적재합니다.
+--   last_row 는 커밋된 원본 행 수 (CSV: 헤더 제외 원본 행, Excel: 정제 후 행), 다음 실행은 이 행부터 이어서 적재합니다.
+-- ---------------------------------------------------
+CREATE TABLE IF NOT EXISTS Load_Checkpoint (
+    source_key CHAR(40) NOT NULL COMMENT '원본 파일 해시 + 태그의 SHA-1',
+    source_name VARCHAR(255) NOT NULL COMMENT '원본 파일 이름',
+    last_row INT NOT NULL DEFAULT 0 COMMENT '커밋된 원본 행 수 (다음 적재 시작 위치)',
+    last_content_hash CHAR(40) COMMENT '마지막으로 커밋된 청크의 마지막 행 content_hash (재개 시 원본 확인용)',
+    rows_loaded INT NOT NULL DEFAULT 0 COMMENT '지금까지 INSERT/UPDATE 한 Recall 행 수',
+    status VARCHAR(10) NOT NULL DEFAULT 'running' COMMENT 'running: 적재 중(재개 가능) / done: 완료',
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '마지막 커밋 시각',
+
+    PRIMARY KEY (source_key)
+) ENGINE=InnoDB COMMENT='재개 가능한 적재의 원본별 체크포인트 (로더가 갱신)';
@@ -0,0 +1,39 @@
+-- ---------------------------------------------------
+-- V006: 요약 대시보드용 1행 통계 테이블 (sql/create_tables.sql 의 6번과 동일)
+--   get_summary_stats() 가 summary_id = 1 행을 기본키로 읽고,
+--   load_data_from_excel.py 가 적재 후 materialized.refresh_summary() 로 갱신합니다.
+--   기존 DB 에서도 바로 읽을 수 있도록 현재 데이터로 계산한 행을 한 번 채워 둡니다. (이미 있으면 그대로 둠)
+-- ---------------------------------------------------
+CREATE TABLE IF NOT EXISTS Recall_Summary (
+    summary_id TINYINT PRIMARY KEY COMMENT '요약ID (항상 1)',
+    total_recalls INT NOT NULL DEFAULT 0 COMMENT '총 리콜 건수',
+    total_brands INT NOT NULL DEFAULT 0 COMMENT '총 브랜드 수',
+    total_models INT NOT NULL DEFAULT 0 COMMENT '총 차종 수',
+    top_brand_name VARCHAR(100) COMMENT '최다 리콜 브랜드명',
+    top_brand_count INT NOT NULL DEFAULT 0 COMMENT '최다 리콜 브랜드의 리콜 건수',
+    min_recall_date DATE COMMENT '데이터 기준 기간(시작)',
+    max_recall_date DATE COMMENT '데이터 기준 기간(끝)',
+    data_version INT NOT NULL DEFAULT 1 COMMENT '데이터 버전 (갱신 시마다 +1)',
+    refreshed_at DATETIME COMMENT '마지막 갱신 시각'
+) ENGINE=InnoDB COMMENT='요약 대시보드용 통계 (로더가 갱신)';
+
+-- (backend/materialized.py 의 SUMMARY_SELECT_QUERY 와 같은 계산)
+INSERT IGNORE INTO Recall_Summary (
+    summary_id, total_recalls, total_brands, total_models, top_brand_name, top_brand_count,
+    min_recall_date, max_recall_date, data_version, refreshed_at
+)
+SELECT 1,
+    (SELECT COUNT(recall_id) FROM Recall),
+    (SELECT COUNT(brand_id) FROM Brand),
+    (SELECT COUNT(model_id) FROM Model),
+    top_brand.brand_name,
+    COALESCE(top_brand.recall_count, 0),
+    (SELECT MIN(recall_date) FROM Recall WHERE recall_date IS NOT NULL),
+    (SELECT MAX(recall_date) FROM Recall WHERE recall_date IS NOT NULL),
+    1, NOW()
+FROM (SELECT 1 AS one) AS dummy
+LEFT JOIN (
+    SELECT b.brand_name, COUNT(r.recall_id) AS recall_count
+    FROM Recall r JOIN Model m ON r.model_id = m.model_id JOIN Brand b ON m.brand_id = b.brand_id
+    GROUP BY b.brand_name ORDER BY recall_count DESC LIMIT 1
+) AS top_brand ON 1 = 1;
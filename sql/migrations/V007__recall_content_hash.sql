@@ -0,0 +1,31 @@
+-- ---------------------------------------------------
+-- V007: Recall 행 식별 해시 (sql/create_tables.sql 의 4번 Recall.content_hash 와 동일)
+--   load_data_from_excel.py 의 모든 적재 경로가 content_hash 를 INSERT 하고,
+--   incremental / resumable 모드는 이 값으로 신규(INSERT)와 변경(UPDATE)을 나눕니다.
+--   기존 행은 NULL 로 추가되고, 다음 incremental 적재 때 backfill_content_hashes() 가 채웁니다.
+--   (UNIQUE 키는 NULL 을 여러 개 허용하므로 중복 적재된 기존 행이 있어도 적용됩니다.)
+--
+--   [수정] 새로 설치한 DB 는 create_tables.sql 이 이미 컬럼/키를 만들었으므로,
+--   information_schema 에 없을 때만 ALTER 합니다. (있으면 DO 0 → 아무것도 하지 않고 적용 이력만 기록)
+-- ---------------------------------------------------
+SET @recall_has_content_hash = (
+    SELECT COUNT(*) FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Recall' AND COLUMN_NAME = 'content_hash'
+);
+SET @v007_statement = IF(@recall_has_content_hash = 0,
+    'ALTER TABLE Recall ADD COLUMN content_hash CHAR(40) COMMENT ''원본 행 식별 해시 (제작자/차명/사유/생산기간/개시일, 증분 적재용)'' AFTER correction_rate',
+    'DO 0');
+PREPARE v007_stmt FROM @v007_statement;
+EXECUTE v007_stmt;
+DEALLOCATE PREPARE v007_stmt;
+
+SET @recall_has_content_hash_key = (
+    SELECT COUNT(*) FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Recall' AND INDEX_NAME = 'uk_recall_content_hash'
+);
+SET @v007_statement = IF(@recall_has_content_hash_key = 0,
+    'ALTER TABLE Recall ADD UNIQUE KEY uk_recall_content_hash (content_hash)',
+    'DO 0');
+PREPARE v007_stmt FROM @v007_statement;
+EXECUTE v007_stmt;
+DEALLOCATE PREPARE v007_stmt;
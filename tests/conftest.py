@@ -0,0 +1,23 @@
+# 파일 이름: tests/conftest.py
+# streamlit 이 설치되지 않은 환경에서도 backend 모듈을 임포트할 수 있도록 최소한의 대역 모듈을 등록합니다.
+# backend 가 쓰는 것은 st.secrets / st.error / st.warning / st.cache_data / st.cache_resource 뿐입니다.
+# (streamlit 이 설치되어 있으면 그대로 사용)
+import sys
+import types
+
+try:
+    import streamlit  # noqa: F401
+except ImportError:
+    def _passthrough_decorator(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    _fake_streamlit = types.ModuleType('streamlit')
+    _fake_streamlit.secrets = {}
+    _fake_streamlit.error = print
+    _fake_streamlit.warning = print
+    _fake_streamlit.info = print
+    _fake_streamlit.cache_data = _passthrough_decorator
+    _fake_streamlit.cache_resource = _passthrough_decorator
+    sys.modules['streamlit'] = _fake_streamlit
@@ -0,0 +1,62 @@
+# 파일 이름: tests/test_korean_terms.py
+# backend/korean_terms.py 토크나이저 테스트 (실행: python -m pytest -q, 저장소 루트에서)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from backend import korean_terms
+
+
+@pytest.mark.parametrize('token, expected', [
+    ('퓨즈가', '퓨즈'),
+    ('퓨즈의', '퓨즈'),
+    ('재시동이', '재시동'),
+    ('정책에', '정책'),
+    ('배선에서', '배선'),
+])
+def test_particles_are_stripped(token, expected):
+    assert korean_terms.normalize_token(token) == expected
+
+
+@pytest.mark.parametrize('token, expected', [
+    ('제어회로', '제어회로'),
+    ('전기회로', '전기회로'),
+    ('전기회로가', '전기회로'),
+    ('가속도', '가속도'),
+    ('가속도가', '가속도'),
+    ('품질조사결과', '품질조사결과'),
+    ('등받이', '등받이'),
+    ('게이트웨이', '게이트웨이'),
+    ('디스플레이', '디스플레이'),
+])
+def test_nouns_ending_like_particles_are_kept(token, expected):
+    assert korean_terms.normalize_token(token) == expected
+
+
+def test_short_stem_does_not_fall_back_to_shorter_particle():
+    # '으로' 를 떼면 어간이 한 글자라 그대로 두고, '로' 만 떼어 '안으' 를 만들지 않음
+    assert korean_terms.normalize_token('안으로') == '안으로'
+    assert korean_terms.normalize_token('것으로') == '것으로'
+
+
+def test_date_fragments_are_not_terms():
+    terms = korean_terms.tokenize('2020년 3월 5일부터 2021년 1월 2일까지 생산된 차량의 제어회로가 손상')
+    assert terms == ['생산', '제어회로', '손상']
+    assert '일부터' not in korean_terms.tokenize('2019년 12월 1일부터')
+    assert '일까지' not in korean_terms.tokenize('2019년 12월 31 일까지')
+
+
+def test_numeric_quantity_fragments_are_not_terms():
+    assert korean_terms.tokenize('총 3대에서 2개의 퓨즈가 끊어짐') == ['퓨즈', '끊어짐']
+
+
+def test_example_from_module_docstring():
+    assert korean_terms.tokenize('퓨즈가 끊어져 재시동이 되지않아') == ['퓨즈', '끊어져', '재시동']
+
+
+def test_count_terms_merges_particle_variants():
+    counts = korean_terms.count_terms(['퓨즈가 끊어짐', '퓨즈의 결함', None])
+    assert counts['퓨즈'] == 2
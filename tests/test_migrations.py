@@ -0,0 +1,126 @@
+# 파일 이름: tests/test_migrations.py
+# 새로 설치(create_tables.sql → python sql/migrate.py)할 때 마이그레이션이 충돌하지 않는지 확인합니다.
+#
+# - 정적 검사: 마이그레이션이 조건 없이 추가하는 컬럼/키/인덱스가 create_tables.sql 의 CREATE TABLE 에 이미 있으면 실패
+# - 실제 설치 검사: 아래 환경 변수로 MySQL 접속 정보를 주면, 임시 DB 에 create_tables.sql 을 적용한 뒤
+#   migrate.py 를 두 번 실행해 모든 버전이 Schema_Migration 에 기록되는지 확인합니다. (없으면 건너뜀)
+#     LEMON_TEST_MYSQL_HOST, LEMON_TEST_MYSQL_USER, LEMON_TEST_MYSQL_PASSWORD
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'sql'))
+
+import pytest
+
+import migrate
+
+CREATE_TABLES_PATH = os.path.join(ROOT, 'sql', 'create_tables.sql')
+FRESH_INSTALL_DATABASE = 'lemon_fresh_install_test'
+
+_CREATE_TABLE_PATTERN = re.compile(r'CREATE TABLE IF NOT EXISTS (\w+)\s*\((.*)\)\s*ENGINE', re.S | re.I)
+_ALTER_PATTERN = re.compile(r'^ALTER TABLE (\w+)\s+(.*)$', re.S | re.I)
+_ALTER_ADD_PATTERN = re.compile(
+    r'ADD\s+(?:COLUMN\s+(\w+)|(?:UNIQUE\s+|FULLTEXT\s+)?(?:KEY|INDEX)\s+(\w+))', re.I
+)
+_CREATE_INDEX_PATTERN = re.compile(r'^CREATE\s+(?:UNIQUE\s+|FULLTEXT\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)', re.I)
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def _create_table_bodies():
+    """create_tables.sql 의 {테이블 이름: CREATE TABLE 본문}"""
+    bodies = {}
+    for statement in migrate.split_statements(_read(CREATE_TABLES_PATH)):
+        match = _CREATE_TABLE_PATTERN.search(statement)
+        if match:
+            bodies[match.group(1).lower()] = match.group(2)
+    return bodies
+
+
+def _unconditional_additions(statement):
+    """조건 없이 실행되는 ALTER TABLE ... ADD / CREATE INDEX 문이 추가하는 (테이블, 이름) 목록"""
+    match = _ALTER_PATTERN.match(statement)
+    if match:
+        return [(match.group(1).lower(), column or key)
+                for column, key in _ALTER_ADD_PATTERN.findall(match.group(2))]
+    match = _CREATE_INDEX_PATTERN.match(statement)
+    if match:
+        return [(match.group(2).lower(), match.group(1))]
+    return []
+
+
+def test_create_tables_has_no_bare_alter():
+    # 새로 설치할 때 create_tables.sql 자체가 중복 컬럼 오류로 멈추지 않아야 함
+    statements = migrate.split_statements(_read(CREATE_TABLES_PATH))
+    assert [s for s in statements if s.upper().startswith('ALTER TABLE')] == []
+
+
+@pytest.mark.parametrize('version, file_name, path', migrate.list_migrations())
+def test_migration_does_not_redefine_create_tables_objects(version, file_name, path):
+    bodies = _create_table_bodies()
+    for statement in migrate.split_statements(_read(path)):
+        for table, name in _unconditional_additions(statement):
+            body = bodies.get(table, '')
+            assert not re.search(rf'\b{name}\b', body), (
+                f"{file_name}: {table}.{name} 은 create_tables.sql 에도 있어 새로 설치한 DB 에서 실패합니다."
+            )
+
+
+def test_v007_is_guarded_by_information_schema():
+    statements = migrate.split_statements(_read(os.path.join(migrate.MIGRATIONS_DIR,
+                                                             'V007__recall_content_hash.sql')))
+    assert not any(s.upper().startswith('ALTER TABLE') for s in statements)
+    text = ' '.join(statements)
+    assert 'information_schema.COLUMNS' in text and 'information_schema.STATISTICS' in text
+
+
+@pytest.fixture
+def fresh_database():
+    mysql_connector = pytest.importorskip('mysql.connector')
+    host = os.environ.get('LEMON_TEST_MYSQL_HOST')
+    if not host:
+        pytest.skip("LEMON_TEST_MYSQL_HOST 가 없어 실제 설치 검사를 건너뜁니다.")
+    config = {'host': host, 'user': os.environ.get('LEMON_TEST_MYSQL_USER', 'root'),
+              'password': os.environ.get('LEMON_TEST_MYSQL_PASSWORD', '')}
+    admin = mysql_connector.connect(**config)
+    cursor = admin.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS {FRESH_INSTALL_DATABASE}")
+    cursor.execute(f"CREATE DATABASE {FRESH_INSTALL_DATABASE} DEFAULT CHARACTER SET utf8mb4")
+    try:
+        yield dict(config, database=FRESH_INSTALL_DATABASE)
+    finally:
+        cursor.execute(f"DROP DATABASE IF EXISTS {FRESH_INSTALL_DATABASE}")
+        cursor.close()
+        admin.close()
+
+
+def test_fresh_install_then_migrate(fresh_database, monkeypatch, capsys):
+    import mysql.connector
+
+    conn = mysql.connector.connect(**fresh_database)
+    cursor = conn.cursor()
+    for statement in migrate.split_statements(_read(CREATE_TABLES_PATH)):
+        cursor.execute(statement)
+    conn.commit()
+
+    monkeypatch.setattr(migrate, 'DB_CONFIG', fresh_database)
+    migrate.run_migrations()
+    assert '[치명적 오류]' not in capsys.readouterr().out
+    migrate.run_migrations()  # 두 번째 실행은 모두 [적용됨]
+    assert '[치명적 오류]' not in capsys.readouterr().out
+
+    cursor.execute("SELECT version FROM Schema_Migration ORDER BY version")
+    assert [row[0] for row in cursor.fetchall()] == [version for version, _, _ in migrate.list_migrations()]
+    cursor.execute("""
+    SELECT COUNT(*) FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Recall' AND INDEX_NAME = 'uk_recall_content_hash'
+    """)
+    assert cursor.fetchone()[0] == 1
+    cursor.close()
+    conn.close()
@@ -0,0 +1,285 @@
+# 파일 이름: tests/test_snapshot_parity.py
+# 인메모리 스냅샷(backend/snapshot.py)과 SQL 경로(backend/search_queries.py, stats_queries.py)의 결과 비교
+# SQL 은 sqlite 메모리 DB 에서 실행합니다. (MySQL 전용 문법은 _SqliteCursor 가 sqlite 문법으로 바꿔서 실행)
+# streamlit 이 없으면 tests/conftest.py 의 대역 모듈을 사용합니다.
+import os
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pytest
+
+from backend import db_manager, materialized, search_queries, snapshot, stats_queries  # noqa: E402
+from backend.snapshot import RecallSnapshot  # noqa: E402
+
+BRAND_ROWS = [(1, '현대'), (2, '기아')]
+MODEL_ROWS = [(10, 1, '소나타'), (11, 1, '아반떼'), (20, 2, 'K5')]
+# 건수가 같은 키워드(배터리/엔진/화재)가 섞이도록 구성
+KEYWORD_ROWS = [(1, '화재', '화재 설명'), (2, '엔진', None), (3, '배터리', '배터리 설명'), (4, '브레이크', None)]
+# 리콜개시일이 같은 행(101/107), 리콜개시일이 없는 행(102/108)이 커서 경계에 걸리도록 구성
+RECALL_ROWS = [
+    (100, 10, date(2021, 3, 1), date(2019, 1, 1), date(2020, 6, 30), '배터리 화재', 10, 5, 50.0),
+    (101, 10, date(2022, 5, 1), None, None, '엔진 화재', 20, 20, 100.0),
+    (102, 10, None, None, None, '엔진 배터리', None, None, None),
+    (103, 11, date(2020, 1, 1), date(2018, 3, 1), None, '브레이크', 5, 1, 20.0),
+    (104, 20, date(2021, 7, 1), None, None, '화재', 7, 7, 100.0),
+    (107, 11, date(2022, 5, 1), None, None, '브레이크 배터리', 3, 2, 66.67),
+    (108, 11, None, None, None, None, 4, None, None),
+]
+# model_id 가 NULL 이거나 없는 차종을 가리키는 행 (SQL 경로에서는 JOIN 으로 빠짐)
+ORPHAN_RECALL_ROWS = [
+    (105, None, date(2021, 1, 1), None, None, '화재', 1, 1, 100.0),
+    (106, 999, date(2021, 1, 1), None, None, '엔진', 1, 1, 100.0),
+]
+JUNCTION_ROWS = [
+    (100, 1), (100, 3), (101, 1), (101, 2), (102, 2), (102, 3), (103, 4), (104, 1),
+    (105, 1), (106, 2), (107, 4), (107, 3),
+]
+
+# MySQL 의 GROUP_CONCAT(... ORDER BY ... SEPARATOR ...) → 정렬된 서브쿼리 + sqlite GROUP_CONCAT
+_MYSQL_GROUP_CONCAT = re.compile(
+    r"SELECT GROUP_CONCAT\(k\.keyword_text ORDER BY k\.keyword_text SEPARATOR ', '\)\s*"
+    r"(FROM Recall_Keyword_Junction AS rkj\s*JOIN Keyword AS k ON rkj\.keyword_id = k\.keyword_id\s*"
+    r"WHERE rkj\.recall_id = r\.recall_id)"
+)
+_SQLITE_GROUP_CONCAT = r"SELECT GROUP_CONCAT(keyword_text, ', ') FROM (SELECT k.keyword_text \1 ORDER BY k.keyword_text)"
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+
+
+class _SqliteCursor:
+    """mysql.connector 커서처럼 %s 자리표시자와 dictionary=True 를 받는 sqlite 커서"""
+
+    def __init__(self, conn, dictionary=False):
+        self._cursor = conn.cursor()
+        self._dictionary = dictionary
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, query, params=()):
+        query = _MYSQL_GROUP_CONCAT.sub(_SQLITE_GROUP_CONCAT, query).replace('%s', '?')
+        self._cursor.execute(query, tuple(params or ()))
+
+    def _to_row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip([column[0] for column in self._cursor.description], row))
+
+    def fetchone(self):
+        return self._to_row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._to_row(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+class _SqliteConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, dictionary=False):
+        return _SqliteCursor(self._conn, dictionary)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+
+@pytest.fixture
+def sqlite_conn():
+    conn = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.create_function('YEAR', 1, lambda value: None if value is None else int(value[:4]))
+    conn.executescript("""
+    CREATE TABLE Brand (brand_id INTEGER PRIMARY KEY, brand_name TEXT);
+    CREATE TABLE Model (model_id INTEGER PRIMARY KEY, brand_id INTEGER, model_name TEXT);
+    CREATE TABLE Keyword (keyword_id INTEGER PRIMARY KEY, keyword_text TEXT, keyword_desc TEXT);
+    CREATE TABLE Recall (recall_id INTEGER PRIMARY KEY, model_id INTEGER, recall_date DATE, prod_from DATE,
+                         prod_to DATE, reason TEXT, recall_count INTEGER, correction_count INTEGER,
+                         correction_rate REAL);
+    CREATE TABLE Recall_Keyword_Junction (recall_id INTEGER, keyword_id INTEGER);
+    CREATE TABLE Recall_Cube (brand_id INTEGER, model_id INTEGER, recall_year INTEGER, keyword_id INTEGER,
+                              recall_count INTEGER, recall_units INTEGER, correction_units INTEGER,
+                              rate_sum REAL, rate_count INTEGER);
+    """)
+    conn.executemany("INSERT INTO Brand VALUES (?, ?)", BRAND_ROWS)
+    conn.executemany("INSERT INTO Model VALUES (?, ?, ?)", MODEL_ROWS)
+    conn.executemany("INSERT INTO Keyword VALUES (?, ?, ?)", KEYWORD_ROWS)
+    conn.executemany("INSERT INTO Recall VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", RECALL_ROWS + ORPHAN_RECALL_ROWS)
+    conn.executemany("INSERT INTO Recall_Keyword_Junction VALUES (?, ?)", JUNCTION_ROWS)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def snap():
+    return RecallSnapshot(BRAND_ROWS, MODEL_ROWS, KEYWORD_ROWS, RECALL_ROWS + ORPHAN_RECALL_ROWS,
+                          JUNCTION_ROWS, data_version=1)
+
+
+@pytest.fixture
+def use_sqlite(sqlite_conn, monkeypatch):
+    """backend 의 조회 함수들이 sqlite DB 를 읽도록 바꿉니다. 반환값: 스냅샷 사용 여부를 바꾸는 함수"""
+    @contextmanager
+    def get_connection():
+        yield _SqliteConnection(sqlite_conn)
+
+    monkeypatch.setattr(db_manager, 'get_connection', get_connection)
+    # 캐시(data_version 조회)를 거치지 않도록 원본 함수로 교체
+    monkeypatch.setattr(search_queries, 'get_catalog', search_queries.get_catalog.__wrapped__)
+
+    def set_snapshot(snap_or_none):
+        monkeypatch.setattr(snapshot, 'get_snapshot', lambda: snap_or_none)
+    set_snapshot(None)
+    return set_snapshot
+
+
+def _sql_and_snapshot(use_sqlite, snap, func, *args, **kwargs):
+    """같은 인자로 SQL 경로와 스냅샷 경로를 각각 호출합니다. (cache.cached 함수는 캐시를 거치지 않음)"""
+    func = getattr(func, '__wrapped__', func)
+    use_sqlite(None)
+    sql_result = func(*args, **kwargs)
+    use_sqlite(snap)
+    snap_result = func(*args, **kwargs)
+    return sql_result, snap_result
+
+
+def test_snapshot_skips_recalls_without_model(snap):
+    assert sorted(snap.recall_id.tolist()) == [100, 101, 102, 103, 104, 107, 108]
+
+
+@pytest.mark.parametrize('brand, model', [('현대', '소나타'), ('현대', '아반떼'), ('기아', 'K5')])
+def test_comparison_keywords_match_sql(sqlite_conn, snap, brand, model):
+    query = search_queries.LIVE_COMPARISON_KEYWORDS_QUERY.replace('%s', '?')
+    sql_df = pd.DataFrame(sqlite_conn.execute(query, (brand, model)).fetchall(),
+                          columns=['keyword_text', 'keyword_desc', 'keyword_count'])
+
+    _, keywords_df = snap.get_recall_comparison(brand, model)
+    pd.testing.assert_frame_equal(keywords_df, sql_df, check_dtype=False)
+
+
+def test_comparison_keyword_ties_are_ordered_by_text(snap):
+    # 소나타: 화재/엔진/배터리 모두 2건 → 키워드 이름순
+    _, keywords_df = snap.get_recall_comparison('현대', '소나타')
+    assert keywords_df['keyword_text'].tolist() == sorted(['화재', '엔진', '배터리'])
+
+
+@pytest.mark.parametrize('live', [False, True])
+@pytest.mark.parametrize('brand, model', [('현대', '소나타'), ('현대', '아반떼'), ('기아', 'K5'), ('기아', '없음')])
+def test_recall_comparison_matches_sql(sqlite_conn, use_sqlite, snap, brand, model, live):
+    if not live:
+        materialized.refresh_cube(_SqliteCursor(sqlite_conn))
+    (sql_stats, sql_keywords), (snap_stats, snap_keywords) = _sql_and_snapshot(
+        use_sqlite, snap, search_queries.get_recall_comparison, brand, model, live
+    )
+    assert snap_stats == sql_stats
+    pd.testing.assert_frame_equal(snap_keywords, sql_keywords)
+
+
+@pytest.mark.filterwarnings('ignore:pandas only supports SQLAlchemy')  # pd.read_sql 에 sqlite 대역 커넥션을 넘김
+@pytest.mark.parametrize('live', [False, True])
+def test_brand_rankings_match_sql(sqlite_conn, use_sqlite, snap, live):
+    if not live:
+        materialized.refresh_cube(_SqliteCursor(sqlite_conn))
+    (sql_count, sql_rate), (snap_count, snap_rate) = _sql_and_snapshot(
+        use_sqlite, snap, stats_queries.get_brand_rankings, live
+    )
+    assert not sql_count.empty and not sql_rate.empty
+    pd.testing.assert_frame_equal(snap_count, sql_count)
+    pd.testing.assert_frame_equal(snap_rate, sql_rate)
+
+
+@pytest.mark.parametrize('filters', [
+    ('전체', '전체', '전체', '전체'),
+    ('현대', '전체', '전체', '전체'),
+    ('현대', '아반떼', '전체', '전체'),
+    ('전체', '전체', '2022', '전체'),
+    ('전체', '전체', '전체', '배터리'),
+])
+@pytest.mark.parametrize('page_size', [1, 2, 3, 50])
+def test_search_recalls_page_matches_sql(use_sqlite, snap, filters, page_size):
+    # 첫 페이지부터 커서를 따라 끝까지 읽으며 페이지마다 결과/다음 커서/전체 건수를 비교
+    cursor_token = None
+    seen_ids = []
+    for page in range(1, 20):
+        with_total = page == 1
+        sql_result, snap_result = _sql_and_snapshot(
+            use_sqlite, snap, search_queries.search_recalls_page, *filters,
+            cursor_token=cursor_token, page_size=page_size, with_total=with_total
+        )
+        sql_df, sql_cursor, sql_total = sql_result
+        snap_df, snap_cursor, snap_total = snap_result
+        pd.testing.assert_frame_equal(snap_df, sql_df)
+        assert snap_cursor == sql_cursor
+        assert snap_total == sql_total
+        if not sql_df.empty:
+            seen_ids.extend(sql_df['리콜ID'].tolist())
+        cursor_token = sql_cursor
+        if cursor_token is None:
+            break
+    assert len(seen_ids) == len(set(seen_ids))
+
+
+def test_search_recalls_page_reaches_null_dates(use_sqlite, snap):
+    # 리콜개시일이 없는 행은 맨 뒤에 오고, 커서가 NULL 날짜를 가리켜도 이어서 읽을 수 있어야 함
+    use_sqlite(snap)
+    df, cursor_token, total = search_queries.search_recalls_page('현대', '전체', '전체', '전체', page_size=5,
+                                                                 with_total=True)
+    assert total == 6
+    assert df['리콜ID'].tolist() == [107, 101, 100, 103, 108]
+    assert search_queries.decode_search_cursor(cursor_token) == (None, 108)
+    df, cursor_token, _ = search_queries.search_recalls_page('현대', '전체', '전체', '전체', cursor_token, page_size=5)
+    assert df['리콜ID'].tolist() == [102]
+    assert df['리콜개시일'].tolist() == [None]
+    assert cursor_token is None
+
+
+@pytest.mark.parametrize('brand, model, year, keyword', [
+    ('현대', '소나타', None, None),
+    ('현대', '아반떼', None, None),
+    ('현대', '소나타', '2021', None),
+    ('현대', '소나타', None, '엔진'),
+    ('현대', '아반떼', '2022', '배터리'),
+    ('현대', '아반떼', '1999', None),
+    ('기아', 'K5', None, None),
+])
+@pytest.mark.parametrize('page, page_size', [(1, 100), (1, 2), (2, 2)])
+def test_model_history_matches_sql(use_sqlite, snap, brand, model, year, keyword, page, page_size):
+    (sql_df, sql_total), (snap_df, snap_total) = _sql_and_snapshot(
+        use_sqlite, snap, search_queries.get_model_history, brand, model, year, keyword, page, page_size
+    )
+    assert snap_total == sql_total
+    assert str(snap_df['리콜개시일'].dtype) == 'datetime64[ns]'
+    pd.testing.assert_frame_equal(snap_df, sql_df)
+
+
+@pytest.mark.parametrize('cube', ['full', 'partial', 'empty'])
+def test_compare_models_falls_back_per_model(sqlite_conn, use_sqlite, snap, cube):
+    # 큐브에 일부 차종만 있어도(적재 중 차종 추가 등) 빠진 차종은 원본 테이블 집계로 채워야 함
+    if cube != 'empty':
+        materialized.refresh_cube(_SqliteCursor(sqlite_conn))
+    if cube == 'partial':
+        sqlite_conn.execute("DELETE FROM Recall_Cube WHERE model_id = 20")
+    models = [('현대', '소나타'), ('기아', 'K5'), ('현대', '아반떼'), ('전체', '전체')]
+    use_sqlite(None)
+    sql_results = search_queries.compare_models.__wrapped__(models)
+    use_sqlite(snap)
+    for (sql_stats, sql_keywords), pair in zip(sql_results, models):
+        snap_stats, snap_keywords = search_queries.get_recall_comparison.__wrapped__(*pair)
+        assert sql_stats == snap_stats
+        pd.testing.assert_frame_equal(sql_keywords, snap_keywords)